@@ -0,0 +1,160 @@
+"""
+Throughput of the appointment reminder job against a local SMTP server.
+
+Seeds appointments on a far future day in the configured database, sends
+their reminders through ``AppointmentReminderJob`` and removes the seeded
+rows afterwards. Run with::
+
+    python -m benchmarks.appointment_reminder_benchmark --appointments 10000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+import ga_api.web.api.mail  # noqa: F401  # initialise before its service (import cycle)
+from benchmarks.local_smtp import CountingHandler, local_smtp_server
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.services.appointment_reminder_job import AppointmentReminderJob
+from ga_api.services.mail_service import MailService
+from ga_api.services.smtp_pool import SMTPConnectionPool
+from ga_api.settings import settings
+
+DAY = date(2099, 1, 1)
+PATIENT_EMAIL = "bench-reminder-%@example.com"
+PROFESSIONAL_EMAIL = "bench-reminder-pro-%@example.com"
+PATIENTS_PER_PROFESSIONAL = 100
+
+
+async def seed(engine: AsyncEngine, appointments: int) -> None:
+    professionals = max(appointments // PATIENTS_PER_PROFESSIONAL, 1)
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO professionals (id, full_name, email, is_enabled) "
+                "SELECT gen_random_uuid(), 'Professional ' || n, "
+                "replace(:email, '%', n::text), true "
+                "FROM generate_series(1, :count) AS n",
+            ),
+            {"count": professionals, "email": PROFESSIONAL_EMAIL},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, is_active, "
+                "is_superuser, is_verified, is_first_access, full_name, cpf, "
+                "frequency, role) "
+                "SELECT gen_random_uuid(), replace(:email, '%', n::text), "
+                "'x', true, false, false, false, 'Patient ' || n, "
+                "'bench-' || n, 'AS_NEEDED', 'PATIENT' "
+                "FROM generate_series(1, :count) AS n",
+            ),
+            {"count": appointments, "email": PATIENT_EMAIL},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO availabilities (id, start_time, end_time, status, "
+                "professional_id, patient_id) "
+                "SELECT gen_random_uuid(), slot, slot + interval '50 minutes', "
+                "'TAKEN', p.id, u.id "
+                "FROM (SELECT id, row_number() OVER () AS n FROM users "
+                "      WHERE email LIKE :patients) AS u "
+                "JOIN (SELECT id, row_number() OVER () - 1 AS n FROM professionals "
+                "      WHERE email LIKE :professional_emails) AS p "
+                "  ON p.n = u.n % :professionals "
+                "CROSS JOIN LATERAL (SELECT (:day)::date + time '08:00' "
+                "  + (u.n / :professionals) * interval '5 minutes' AS slot) AS s",
+            ),
+            {
+                "professionals": professionals,
+                "day": DAY,
+                "patients": PATIENT_EMAIL,
+                "professional_emails": PROFESSIONAL_EMAIL,
+            },
+        )
+
+
+async def cleanup(engine: AsyncEngine) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "DELETE FROM availabilities WHERE patient_id IN "
+                "(SELECT id FROM users WHERE email LIKE :email)",
+            ),
+            {"email": PATIENT_EMAIL},
+        )
+        await connection.execute(
+            text("DELETE FROM users WHERE email LIKE :email"),
+            {"email": PATIENT_EMAIL},
+        )
+        await connection.execute(
+            text("DELETE FROM professionals WHERE email LIKE :email"),
+            {"email": PROFESSIONAL_EMAIL},
+        )
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    load_all_models()
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(meta.create_all)
+
+    settings.reminder_batch_size = args.batch_size
+    handler = CountingHandler(connect_delay=args.connect_delay / 1000)
+    await cleanup(engine)
+    await seed(engine, args.appointments)
+    try:
+        with local_smtp_server(handler) as config:
+            pool = SMTPConnectionPool(
+                config,
+                size=args.pool_size,
+                max_messages=args.max_messages,
+                idle_timeout=60,
+            )
+            job = AppointmentReminderJob(
+                engine,
+                async_sessionmaker(engine, expire_on_commit=False),
+                MailService(pool),
+            )
+
+            started = time.perf_counter()
+            sent = await job.send_reminders(DAY)
+            elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            resent = await job.send_reminders(DAY)
+            rerun = time.perf_counter() - started
+            await pool.close()
+    finally:
+        await cleanup(engine)
+        await engine.dispose()
+
+    print(  # noqa: T201
+        f"first run: {sent} reminders in {elapsed:.2f}s "
+        f"({sent / elapsed:.0f} msg/s, {pool.connections_opened} SMTP connections, "
+        f"{handler.messages} received)",
+    )
+    print(f"rerun:     {resent} reminders in {rerun:.2f}s")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--appointments", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-messages", type=int, default=100)
+    parser.add_argument(
+        "--connect-delay",
+        type=float,
+        default=50.0,
+        help="simulated handshake and login cost per connection, in ms",
+    )
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Rows per second inserting availabilities with save_all and bulk_insert.
+
+``save_all`` adds ORM objects to the session and flushes them;
+``bulk_insert`` sends the same rows as multi-row ``INSERT ... RETURNING``
+statements, with ``ON CONFLICT DO NOTHING`` or through ``COPY``. Every run
+inserts into a transaction that is rolled back afterwards. Run with::
+
+    python -m benchmarks.bulk_insert_benchmark --rows 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.professionals_model import Professional
+from ga_api.settings import settings
+
+START = datetime(2099, 1, 1, tzinfo=timezone.utc)
+
+
+def rows(professional_id: uuid.UUID, count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "professional_id": professional_id,
+            "start_time": START + timedelta(hours=hour),
+            "end_time": START + timedelta(hours=hour, minutes=50),
+        }
+        for hour in range(count)
+    ]
+
+
+async def save_all(session: AsyncSession, values: List[Dict[str, Any]]) -> None:
+    await AvailabilityDAO(session).save_all([Availability(**row) for row in values])
+
+
+async def insert(session: AsyncSession, values: List[Dict[str, Any]]) -> None:
+    await AvailabilityDAO(session).bulk_insert(values)
+
+
+async def insert_ignoring_conflicts(
+    session: AsyncSession,
+    values: List[Dict[str, Any]],
+) -> None:
+    await AvailabilityDAO(session).bulk_insert(values, ignore_conflicts=True)
+
+
+async def copy(session: AsyncSession, values: List[Dict[str, Any]]) -> None:
+    settings.db_bulk_insert_copy_threshold = 1
+    try:
+        await AvailabilityDAO(session).bulk_insert(values)
+    finally:
+        settings.db_bulk_insert_copy_threshold = 0
+
+
+METHODS: Dict[str, Callable[[AsyncSession, List[Dict[str, Any]]], Awaitable[None]]] = {
+    "save_all": save_all,
+    "bulk_insert": insert,
+    "bulk_insert ignoring conflicts": insert_ignoring_conflicts,
+    "bulk_insert with COPY": copy,
+}
+
+
+async def benchmark(sizes: List[int]) -> None:
+    load_all_models()
+    settings.db_bulk_insert_copy_threshold = 0
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(meta.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    for size in sizes:
+        for name, method in METHODS.items():
+            async with session_factory() as session:
+                professional = Professional(
+                    full_name="Dr. Bulk",
+                    email=f"{uuid.uuid4()}@bulk.example.com",
+                )
+                session.add(professional)
+                await session.flush()
+                values = rows(professional.id, size)
+                started = time.perf_counter()
+                await method(session, values)
+                elapsed = time.perf_counter() - started
+                await session.rollback()
+            print(  # noqa: T201
+                f"{size:>8} rows {name:>30}: {size / elapsed:>10.0f} rows/s "
+                f"({elapsed * 1000:.0f} ms)",
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    asyncio.run(benchmark(parser.parse_args().rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Per-call overhead of the hot DAO queries, rebuilt on every call or prebuilt.
+
+"rebuilt" is how the DAOs built their statements before: a new ``select()``
+on every call, whose cache key SQLAlchemy computes again before finding the
+compiled SQL in its cache. "prebuilt" executes the DAOs' module-level
+statements with bound parameters. Each query is timed without the database
+(statement and cache key only) and executed on one connection. Run with::
+
+    python -m benchmarks.dao_statement_benchmark --calls 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy import Executable, and_, exists, not_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ga_api.db.dao.availability_dao import (
+    _DOUBLE_APPOINTMENT,
+    _LONGEST_AVAILABILITY,
+    _not_blocked_statement,
+)
+from ga_api.db.loader import _find_by_ids_statement
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.block_model import Block
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.settings import settings
+
+USER_ID = uuid.uuid4()
+NOW = datetime.now(timezone.utc)
+
+Statement = Tuple[Executable, Dict[str, Any]]
+
+
+def rebuilt_find_by_id() -> Statement:
+    return select(Availability).where(Availability.id == USER_ID), {}
+
+
+def rebuilt_double_appointment() -> Statement:
+    return (
+        select(
+            exists().where(
+                Availability.patient_id == USER_ID,
+                Availability.status == AvailabilityStatus.TAKEN,
+                Availability.start_time < NOW + timedelta(hours=1),
+                Availability.end_time > NOW,
+            ),
+        ),
+        {},
+    )
+
+
+def rebuilt_not_blocked() -> Statement:
+    blocked = (
+        select(1)
+        .where(
+            and_(
+                Block.professional_id == Availability.professional_id,
+                Block.start_time < Availability.end_time,
+                Block.end_time > Availability.start_time,
+            ),
+        )
+        .correlate(Availability)
+    )
+    conditions = [
+        not_(exists(blocked)),
+        Availability.status == AvailabilityStatus.AVAILABLE,
+        Availability.start_time > NOW,
+    ]
+    return select(Availability).where(and_(*conditions)).offset(0).limit(50), {}
+
+
+def prebuilt_find_by_id() -> Statement:
+    return _find_by_ids_statement(Availability), {"ids": [USER_ID]}
+
+
+def prebuilt_double_appointment() -> Statement:
+    return _DOUBLE_APPOINTMENT, {
+        "user_id": USER_ID,
+        "start_time": NOW,
+        "end_time": NOW + timedelta(hours=1),
+        "earliest_start": NOW - _LONGEST_AVAILABILITY,
+    }
+
+
+def prebuilt_not_blocked() -> Statement:
+    return _not_blocked_statement(False, True, True), {
+        "status": AvailabilityStatus.AVAILABLE,
+        "after": NOW,
+        "offset": 0,
+        "limit": 50,
+    }
+
+
+QUERIES: Dict[str, Tuple[Callable[[], Statement], Callable[[], Statement]]] = {
+    "find_by_id": (rebuilt_find_by_id, prebuilt_find_by_id),
+    "check_double_appointment": (
+        rebuilt_double_appointment,
+        prebuilt_double_appointment,
+    ),
+    "find_all_not_blocked": (rebuilt_not_blocked, prebuilt_not_blocked),
+}
+
+
+def time_statements(build: Callable[[], Statement], calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        statement, _params = build()
+        statement._generate_cache_key()  # noqa: SLF001
+    return (time.perf_counter() - started) / calls
+
+
+async def time_executions(
+    session: AsyncSession,
+    build: Callable[[], Statement],
+    calls: int,
+) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        statement, params = build()
+        (await session.execute(statement, params)).all()
+    return (time.perf_counter() - started) / calls
+
+
+async def benchmark(calls: int) -> None:
+    load_all_models()
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(meta.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        for name, (rebuilt, prebuilt) in QUERIES.items():
+            # warm the compiled cache and asyncpg's statement cache
+            await time_executions(session, rebuilt, 10)
+            await time_executions(session, prebuilt, 10)
+            rebuilt_python = time_statements(rebuilt, calls)
+            prebuilt_python = time_statements(prebuilt, calls)
+            rebuilt_total = await time_executions(session, rebuilt, calls)
+            prebuilt_total = await time_executions(session, prebuilt, calls)
+            print(  # noqa: T201
+                f"{name:>25}: statement {rebuilt_python * 1e6:6.1f} -> "
+                f"{prebuilt_python * 1e6:6.1f} us, execution "
+                f"{rebuilt_total * 1e6:7.1f} -> {prebuilt_total * 1e6:7.1f} us",
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    asyncio.run(benchmark(parser.parse_args().calls))
+
+
+if __name__ == "__main__":
+    main()
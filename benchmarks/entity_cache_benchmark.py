@@ -0,0 +1,125 @@
+"""
+Professional lookups per second with and without the entity cache.
+
+Each simulated request opens a session, as ``get_db_session`` does, and
+loads one professional, with its specialities, by id; ids are drawn from a
+pool so that most are asked for again. The professionals are created for
+the run and deleted afterwards. Run with::
+
+    python -m benchmarks.entity_cache_benchmark --requests 5000 --professionals 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.entity_cache import EntityCacheListener, entity_cache
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.models.professionals_model import (
+    Professional,
+    professionals_specialities,
+)
+from ga_api.db.models.speciality_model import Speciality
+from ga_api.settings import settings
+
+
+async def create_professionals(
+    session_factory: async_sessionmaker[AsyncSession],
+    count: int,
+) -> List[uuid.UUID]:
+    run = uuid.uuid4().hex[:8]
+    async with session_factory() as session:
+        specialities = [Speciality(title=f"{run} speciality {n}") for n in range(10)]
+        professionals = [
+            Professional(
+                full_name=f"Dr. {n}",
+                email=f"{run}.{n}@cache.example.com",
+                specialities=random.sample(specialities, 2),
+            )
+            for n in range(count)
+        ]
+        session.add_all(professionals)
+        await session.commit()
+        return [professional.id for professional in professionals]
+
+
+async def delete_professionals(
+    session_factory: async_sessionmaker[AsyncSession],
+    ids: List[uuid.UUID],
+) -> None:
+    async with session_factory() as session:
+        professionals = await ProfessionalDAO(session).find_all_by_ids(ids)
+        speciality_ids = {s.id for p in professionals for s in p.specialities}
+        await session.execute(
+            delete(professionals_specialities).where(
+                professionals_specialities.c.professional_id.in_(ids),
+            ),
+        )
+        await session.execute(delete(Professional).where(Professional.id.in_(ids)))
+        await session.execute(
+            delete(Speciality).where(Speciality.id.in_(speciality_ids)),
+        )
+        await session.commit()
+
+
+async def run_requests(
+    session_factory: async_sessionmaker[AsyncSession],
+    ids: List[uuid.UUID],
+    requests: int,
+) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        async with session_factory() as session:
+            obj_id = random.choice(ids)  # noqa: S311
+            professional = await ProfessionalDAO(session).find_by_id(obj_id)
+            assert professional is not None  # noqa: S101
+            [speciality.title for speciality in professional.specialities]
+    return requests / (time.perf_counter() - started)
+
+
+async def benchmark(requests: int, professionals: int) -> None:
+    load_all_models()
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(meta.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    ids = await create_professionals(session_factory, professionals)
+
+    try:
+        uncached = await run_requests(session_factory, ids, requests)
+        print(f"{'without cache':>14}: {uncached:>8.0f} requests/s")  # noqa: T201
+
+        listener = EntityCacheListener(engine)
+        listener.start()
+        await listener.connected.wait()
+        try:
+            cached = await run_requests(session_factory, ids, requests)
+        finally:
+            await listener.stop()
+        print(  # noqa: T201
+            f"{'with cache':>14}: {cached:>8.0f} requests/s, "
+            f"hit ratio {entity_cache.hit_ratio:.1%}",
+        )
+    finally:
+        await delete_professionals(session_factory, ids)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--professionals", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.requests, args.professionals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+"""
+Deterministic synthetic dataset streamed into Postgres with COPY.
+
+Generates users, specialities, professionals with their specialities,
+availabilities (past ones completed or canceled, future ones available or
+taken) and blocks in chunks, each chunk generated and copied by a process of
+its own. The secondary indexes and foreign keys are dropped for the load and
+rebuilt afterwards. The same ``--seed`` and sizes always give the same rows,
+whatever the number of workers. Meant for an empty database of its own: with
+``--truncate`` the tables are emptied first. Also the dataset of the HTTP
+load benchmark. Run with::
+
+    GA_API_DB_BASE=ga_api_staging python -m benchmarks.generate_dataset --truncate
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterator, List, Sequence, Tuple
+
+import asyncpg
+from fastapi_users.password import PasswordHelper
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.partitioning import ensure_partitions
+from ga_api.settings import settings
+
+# emails of the generated rows, ``%`` standing for their number
+USER_EMAIL = "user-%@staging.example.com"
+PROFESSIONAL_EMAIL = "professional-%@staging.example.com"
+USER_PASSWORD = "staging"  # noqa: S105
+# tables in load order; truncated and rebuilt together
+TABLES = (
+    "users",
+    "specialities",
+    "professionals",
+    "professionals_specialities",
+    "availabilities",
+    "blocks",
+)
+# slots of a day, one hour each from 08:00 UTC
+SLOTS_PER_DAY = 10
+# share of the past and of the future slots in each status
+PAST_STATUSES = (("COMPLETED", 0.85), ("CANCELED", 0.15))
+FUTURE_STATUSES = (("AVAILABLE", 0.75), ("TAKEN", 0.2), ("CANCELED", 0.05))
+FREQUENCIES = ("WEEKLY", "BIWEEKLY", "MONTHLY", "AS_NEEDED")
+
+
+@dataclass
+class DatasetSize:
+    users: int = 100_000
+    specialities: int = 50
+    professionals: int = 5_000
+    availabilities_per_professional: int = 900
+    blocks_per_professional: int = 20
+    # share of the availabilities of a professional before today
+    past_ratio: float = 0.5
+    seed: int = 1
+    # rows of the generated table per chunk
+    chunk_size: int = 100_000
+
+
+def entity_id(seed: int, kind: str, number: int) -> uuid.UUID:
+    """Id of the ``number``-th row of ``kind``, computable by any worker."""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{number}".encode(), digest_size=16)
+    return uuid.UUID(bytes=digest.digest(), version=4)
+
+
+def row_random(size: DatasetSize, table: str, number: int) -> random.Random:
+    """
+    Generator of the rows of the ``number``-th parent row of ``table``.
+
+    Seeded by the position of the row, so neither the chunks nor the workers
+    change the data.
+    """
+    return random.Random(f"{size.seed}:{table}:{number}")  # noqa: S311
+
+
+def first_day(size: DatasetSize, today: datetime) -> datetime:
+    """Day of the first availability, so ``past_ratio`` of them are past."""
+    past_slots = round(size.availabilities_per_professional * size.past_ratio)
+    return today - timedelta(days=-(-past_slots // SLOTS_PER_DAY))
+
+
+def pick(rng: random.Random, shares: Sequence[Tuple[str, float]]) -> str:
+    roll = rng.random()
+    for value, share in shares:
+        roll -= share
+        if roll < 0:
+            return value
+    return shares[-1][0]
+
+
+def generate_users(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+    hashed_password: str,
+    now: datetime,
+) -> Iterator[Tuple[Any, ...]]:
+    for n in range(start, stop):
+        rng = row_random(size, "users", n)
+        created_at = now - timedelta(days=rng.randrange(1, 1000))
+        yield (
+            entity_id(size.seed, "user", n),
+            USER_EMAIL.replace("%", str(n)),
+            hashed_password,
+            True,
+            False,
+            True,
+            f"{n:011d}",
+            date(1950, 1, 1) + timedelta(days=rng.randrange(20_000)),
+            f"+55{rng.randrange(10**10, 10**11)}",
+            f"Patient {n}",
+            None,
+            None,
+            rng.random() < 0.1,
+            rng.choice(FREQUENCIES),
+            "PATIENT",
+            created_at,
+            created_at,
+        )
+
+
+def generate_specialities(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+) -> Iterator[Tuple[Any, ...]]:
+    for n in range(start, stop):
+        yield (entity_id(size.seed, "speciality", n), f"Speciality {n}")
+
+
+def generate_professionals(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+    now: datetime,
+) -> Iterator[Tuple[Any, ...]]:
+    for n in range(start, stop):
+        rng = row_random(size, "professionals", n)
+        created_at = now - timedelta(days=rng.randrange(1, 1000))
+        yield (
+            entity_id(size.seed, "professional", n),
+            f"Professional {n}",
+            f"Synthetic professional {n}",
+            f"+55{n:011d}",
+            PROFESSIONAL_EMAIL.replace("%", str(n)),
+            rng.random() >= 0.05,
+            created_at,
+            created_at,
+            None,
+            None,
+        )
+
+
+def generate_professionals_specialities(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+) -> Iterator[Tuple[Any, ...]]:
+    for n in range(start, stop):
+        rng = row_random(size, "professionals_specialities", n)
+        professional_id = entity_id(size.seed, "professional", n)
+        count = min(rng.randint(1, 3), size.specialities)
+        for speciality in rng.sample(range(size.specialities), count):
+            yield (professional_id, entity_id(size.seed, "speciality", speciality))
+
+
+def generate_availabilities(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+    today: datetime,
+) -> Iterator[Tuple[Any, ...]]:
+    per_professional = size.availabilities_per_professional
+    day = first_day(size, today)
+    for n in range(start, stop):
+        rng = row_random(size, "availabilities", n)
+        professional_id = entity_id(size.seed, "professional", n)
+        for slot in range(per_professional):
+            start_time = day + timedelta(
+                days=slot // SLOTS_PER_DAY,
+                hours=8 + slot % SLOTS_PER_DAY,
+            )
+            past = start_time < today
+            status = pick(rng, PAST_STATUSES if past else FUTURE_STATUSES)
+            patient_id = None
+            if status != "AVAILABLE" and size.users:
+                patient_id = entity_id(size.seed, "user", rng.randrange(size.users))
+            created_at = start_time - timedelta(days=rng.randrange(1, 60))
+            yield (
+                entity_id(size.seed, "availability", n * per_professional + slot),
+                start_time,
+                start_time + timedelta(minutes=50),
+                status,
+                created_at,
+                created_at,
+                professional_id,
+                patient_id,
+                None,
+                None,
+            )
+
+
+def generate_blocks(
+    size: DatasetSize,
+    start: int,
+    stop: int,
+    today: datetime,
+) -> Iterator[Tuple[Any, ...]]:
+    days = -(-size.availabilities_per_professional // SLOTS_PER_DAY)
+    day = first_day(size, today)
+    per_professional = size.blocks_per_professional
+    for n in range(start, stop):
+        rng = row_random(size, "blocks", n)
+        professional_id = entity_id(size.seed, "professional", n)
+        for block in range(per_professional):
+            start_time = day + timedelta(
+                days=rng.randrange(max(days, 1)),
+                hours=8 + rng.randrange(SLOTS_PER_DAY - 1),
+            )
+            yield (
+                entity_id(size.seed, "block", n * per_professional + block),
+                start_time,
+                start_time + timedelta(hours=rng.randint(1, 2)),
+                rng.choice(("Vacation", "Training", "Personal", None)),
+                start_time - timedelta(days=rng.randrange(1, 30)),
+                professional_id,
+                None,
+            )
+
+
+COLUMNS = {
+    "users": [
+        "id",
+        "email",
+        "hashed_password",
+        "is_active",
+        "is_superuser",
+        "is_verified",
+        "cpf",
+        "birth_date",
+        "phone",
+        "full_name",
+        "image_url",
+        "bio",
+        "is_first_access",
+        "frequency",
+        "role",
+        "created_at",
+        "updated_at",
+    ],
+    "specialities": ["id", "title"],
+    "professionals": [
+        "id",
+        "full_name",
+        "bio",
+        "phone",
+        "email",
+        "is_enabled",
+        "created_at",
+        "updated_at",
+        "created_by_admin_id",
+        "updated_by_admin_id",
+    ],
+    "professionals_specialities": ["professional_id", "speciality_id"],
+    "availabilities": [
+        "id",
+        "start_time",
+        "end_time",
+        "status",
+        "created_at",
+        "updated_at",
+        "professional_id",
+        "patient_id",
+        "created_by_admin_id",
+        "updated_by_admin_id",
+    ],
+    "blocks": [
+        "id",
+        "start_time",
+        "end_time",
+        "reason",
+        "created_at",
+        "professional_id",
+        "created_by_admin_id",
+    ],
+}
+
+
+def chunks(size: DatasetSize) -> List[Tuple[str, int, int]]:
+    """``(table, start, stop)`` of every chunk, ranges over the parent rows."""
+    rows_per_parent = {
+        "users": (size.users, 1),
+        "specialities": (size.specialities, 1),
+        "professionals": (size.professionals, 1),
+        "professionals_specialities": (size.professionals, 2),
+        "availabilities": (size.professionals, size.availabilities_per_professional),
+        "blocks": (size.professionals, size.blocks_per_professional),
+    }
+    result = []
+    for table in TABLES:
+        parents, rows = rows_per_parent[table]
+        step = max(size.chunk_size // max(rows, 1), 1)
+        result.extend(
+            (table, start, min(start + step, parents))
+            for start in range(0, parents, step)
+        )
+    return result
+
+
+def dsn() -> str:
+    return str(settings.db_direct_url.with_scheme("postgresql"))
+
+
+async def copy_chunk(
+    size: DatasetSize,
+    table: str,
+    start: int,
+    stop: int,
+    hashed_password: str,
+    today: datetime,
+) -> int:
+    rows: Iterator[Tuple[Any, ...]]
+    if table == "users":
+        rows = generate_users(size, start, stop, hashed_password, today)
+    elif table == "specialities":
+        rows = generate_specialities(size, start, stop)
+    elif table == "professionals":
+        rows = generate_professionals(size, start, stop, today)
+    elif table == "professionals_specialities":
+        rows = generate_professionals_specialities(size, start, stop)
+    elif table == "availabilities":
+        rows = generate_availabilities(size, start, stop, today)
+    else:
+        rows = generate_blocks(size, start, stop, today)
+    records = list(rows)
+    connection = await asyncpg.connect(dsn())
+    try:
+        # nothing else reads the rows until the load is over
+        await connection.execute("SET synchronous_commit = off")
+        await connection.copy_records_to_table(
+            table,
+            records=records,
+            columns=COLUMNS[table],
+        )
+    finally:
+        await connection.close()
+    return len(records)
+
+
+def copy_chunk_process(arguments: Tuple[Any, ...]) -> int:
+    return asyncio.run(copy_chunk(*arguments))
+
+
+@dataclass
+class Rebuild:
+    """Statements recreating what ``drop_indexes`` dropped, in order."""
+
+    keys: List[str]
+    indexes: List[str]
+    foreign_keys: List[str]
+
+
+async def drop_indexes(connection: asyncpg.Connection) -> Rebuild:
+    """
+    Drops the constraints and indexes of ``TABLES``.
+
+    Foreign keys of other tables referencing them are dropped as well, as
+    they depend on the primary keys.
+    """
+    constraints = await connection.fetch(
+        "SELECT conrelid::regclass::text AS table_name, conname, contype::text, "
+        "pg_get_constraintdef(oid) AS definition FROM pg_constraint "
+        "WHERE conparentid = 0 AND ((conrelid = ANY($1::regclass[]) "
+        "   AND contype IN ('p', 'u', 'f')) "
+        "   OR (confrelid = ANY($1::regclass[]) AND contype = 'f'))",
+        list(TABLES),
+    )
+    indexes = await connection.fetch(
+        "SELECT indexrelid::regclass::text AS name, "
+        "pg_get_indexdef(indexrelid) AS definition FROM pg_index "
+        "WHERE indrelid = ANY($1::regclass[]) AND NOT EXISTS ("
+        "  SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)",
+        list(TABLES),
+    )
+    foreign_keys = [row for row in constraints if row["contype"] == "f"]
+    keys = [row for row in constraints if row["contype"] != "f"]
+    async with connection.transaction():
+        for row in foreign_keys + keys:
+            await connection.execute(
+                f'ALTER TABLE {row["table_name"]} DROP CONSTRAINT "{row["conname"]}"',
+            )
+        for row in indexes:
+            await connection.execute(f"DROP INDEX {row['name']}")
+
+    def add_constraint(row: asyncpg.Record) -> str:
+        return (
+            f'ALTER TABLE {row["table_name"]} ADD CONSTRAINT "{row["conname"]}" '
+            f"{row['definition']}"
+        )
+
+    return Rebuild(
+        keys=[add_constraint(row) for row in keys],
+        # indexes of a partitioned table are defined ON ONLY it, which would
+        # leave the partitions without them
+        indexes=[row["definition"].replace(" ON ONLY ", " ON ", 1) for row in indexes],
+        foreign_keys=[add_constraint(row) for row in foreign_keys],
+    )
+
+
+async def rebuild_indexes(rebuild: Rebuild, workers: int) -> None:
+    """Runs the statements of ``rebuild`` on up to ``workers`` connections."""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(statement: str) -> None:
+        async with semaphore:
+            connection = await asyncpg.connect(dsn())
+            try:
+                await connection.execute("SET maintenance_work_mem = '512MB'")
+                await connection.execute(statement)
+            finally:
+                await connection.close()
+
+    # foreign keys need the referenced primary keys
+    await asyncio.gather(*(run(sql) for sql in rebuild.keys + rebuild.indexes))
+    await asyncio.gather(*(run(sql) for sql in rebuild.foreign_keys))
+
+
+async def prepare(size: DatasetSize, today: datetime, truncate: bool) -> Rebuild:
+    load_all_models()
+    connection = await asyncpg.connect(dsn())
+    try:
+        # the monthly partitions of the availabilities to generate
+        first = first_day(size, today)
+        days = -(-size.availabilities_per_professional // SLOTS_PER_DAY)
+        engine = create_async_engine(str(settings.db_url))
+        async with engine.begin() as sa_connection:
+            await sa_connection.run_sync(meta.create_all)
+            await ensure_partitions(
+                sa_connection,
+                first.date(),
+                (first + timedelta(days=days)).date(),
+            )
+        await engine.dispose()
+        if truncate:
+            await connection.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+        for table in TABLES:
+            exists = f"SELECT EXISTS (SELECT FROM {table})"  # noqa: S608
+            if await connection.fetchval(exists):
+                raise SystemExit(f"{table} is not empty: pass --truncate")
+        return await drop_indexes(connection)
+    finally:
+        await connection.close()
+
+
+def generate(size: DatasetSize, workers: int, truncate: bool) -> None:
+    started = time.perf_counter()
+    today = datetime.now(timezone.utc).replace(
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+    rebuild = asyncio.run(prepare(size, today, truncate))
+    hashed_password = PasswordHelper().hash(USER_PASSWORD)
+    rows = 0
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            rows = sum(
+                executor.map(
+                    copy_chunk_process,
+                    [
+                        (size, table, start, stop, hashed_password, today)
+                        for table, start, stop in chunks(size)
+                    ],
+                ),
+            )
+        loaded = time.perf_counter()
+        print(  # noqa: T201
+            f"copied {rows} rows in {loaded - started:.1f}s, rebuilding indexes",
+        )
+    finally:
+        asyncio.run(rebuild_indexes(rebuild, workers))
+    asyncio.run(analyze())
+    print(  # noqa: T201
+        f"generated {asdict(size)} in {time.perf_counter() - started:.1f}s",
+    )
+
+
+async def analyze() -> None:
+    connection = await asyncpg.connect(dsn())
+    try:
+        for table in TABLES:
+            await connection.execute(f"ANALYZE {table}")
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    for name, value in asdict(DatasetSize()).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=type(value),
+            default=value,
+        )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="processes",
+    )
+    parser.add_argument("--truncate", action="store_true", help="empty the tables")
+    args = parser.parse_args()
+    size = DatasetSize(**{name: getattr(args, name) for name in asdict(DatasetSize())})
+    generate(size, args.workers, args.truncate)
+
+
+if __name__ == "__main__":
+    main()
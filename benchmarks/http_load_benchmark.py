@@ -0,0 +1,406 @@
+"""
+End-to-end HTTP load on the seeded dataset, per endpoint.
+
+Starts the application built by ``ga_api.web.application.get_app`` under
+uvicorn (or targets ``--url``), logs the clients in and has them run a
+weighted mix of scenarios for ``--duration`` seconds: browse professionals,
+list availability, book, login and admin writes. Latency percentiles, RPS
+and the SQL time reported in ``Server-Timing`` are written per endpoint as
+JSON; ``--compare`` prints the change against an earlier run. Run with::
+
+    GA_API_DB_BASE=ga_api_bench python -m benchmarks.generate_dataset --truncate
+    GA_API_DB_BASE=ga_api_bench python -m benchmarks.http_load_benchmark \
+        --clients 50 --output run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.generate_dataset import PROFESSIONAL_EMAIL, USER_EMAIL, USER_PASSWORD
+from ga_api.db.bootstrap import bootstrap_database
+from ga_api.settings import settings
+
+ADMIN_EMAIL = "admin@admin.com"
+ADMIN_PASSWORD = "admin"  # noqa: S105
+# share of the scenarios each client runs
+SCENARIO_WEIGHTS = {
+    "browse_professionals": 30,
+    "list_availability": 35,
+    "book": 10,
+    "login": 10,
+    "admin_write": 5,
+}
+SERVER_TIMING_DB = re.compile(r"db;dur=([\d.]+)")
+SERVER_TIMING_COUNT = re.compile(r"db-count;desc=(\d+)")
+# admin writes create slots from here on, one hour apart, never overlapping
+ADMIN_SLOTS_START = datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Sample:
+    latency: float
+    status: int
+    db_time: Optional[float]
+    db_statements: Optional[int]
+
+
+@dataclass
+class Dataset:
+    professional_ids: List[str]
+    patient_emails: List[str]
+
+
+@dataclass
+class Client:
+    number: int
+    http: httpx.AsyncClient
+    dataset: Dataset
+    rng: random.Random
+    samples: Dict[str, List[Sample]]
+    patient_token: str = ""
+    admin_token: str = ""
+    admin_writes: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+
+    async def request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.http.request(method, url, **kwargs)
+        latency = time.perf_counter() - started
+        timing = response.headers.get("server-timing", "")
+        db_time = SERVER_TIMING_DB.search(timing)
+        db_statements = SERVER_TIMING_COUNT.search(timing)
+        self.samples[endpoint].append(
+            Sample(
+                latency,
+                response.status_code,
+                float(db_time[1]) / 1000 if db_time else None,
+                int(db_statements[1]) if db_statements else None,
+            ),
+        )
+        return response
+
+    def auth(self, token: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    async def login(self, email: str, password: str) -> str:
+        response = await self.request(
+            "login",
+            "POST",
+            "/api/auth/jwt/login",
+            data={"username": email, "password": password},
+        )
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+    async def browse_professionals(self) -> None:
+        offset = self.rng.randrange(0, max(len(self.dataset.professional_ids), 1))
+        await self.request(
+            "browse_professionals",
+            "GET",
+            "/api/professionals/",
+            params={"limit": 20, "offset": offset},
+        )
+
+    async def list_availability(self) -> Any:
+        response = await self.request(
+            "list_availability",
+            "GET",
+            "/api/availability/",
+            params={
+                "professional_id": self.rng.choice(self.dataset.professional_ids),
+                "limit": 50,
+            },
+        )
+        return response.json() if response.status_code == 200 else []
+
+    async def book(self) -> None:
+        availabilities = await self.list_availability()
+        if not availabilities:
+            return
+        await self.request(
+            "book",
+            "POST",
+            "/api/schedule/",
+            json={"availability_id": self.rng.choice(availabilities)["id"]},
+            headers=self.auth(self.patient_token),
+        )
+
+    async def login_patient(self) -> None:
+        await self.login(self.rng.choice(self.dataset.patient_emails), USER_PASSWORD)
+
+    async def admin_write(self) -> None:
+        # slots of different clients and writes never overlap
+        start = ADMIN_SLOTS_START + timedelta(
+            hours=self.number * 1_000_000 + self.admin_writes,
+        )
+        self.admin_writes += 1
+        await self.request(
+            "admin_write",
+            "POST",
+            "/api/admin/availability/",
+            json={
+                "professional_id": self.rng.choice(self.dataset.professional_ids),
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(minutes=50)).isoformat(),
+            },
+            headers=self.auth(self.admin_token),
+        )
+
+
+async def load_dataset(sample_size: int) -> Dataset:
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.connect() as connection:
+        professionals = await connection.execute(
+            text(
+                "SELECT id::text FROM professionals "
+                "WHERE email LIKE :email AND is_enabled LIMIT :limit",
+            ),
+            {"email": PROFESSIONAL_EMAIL, "limit": sample_size},
+        )
+        patients = await connection.execute(
+            text("SELECT email FROM users WHERE email LIKE :email LIMIT :limit"),
+            {"email": USER_EMAIL, "limit": sample_size},
+        )
+        dataset = Dataset(list(professionals.scalars()), list(patients.scalars()))
+    await engine.dispose()
+    if not dataset.professional_ids or not dataset.patient_emails:
+        raise SystemExit("No data: run python -m benchmarks.generate_dataset")
+    return dataset
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def start_server(workers: int) -> "tuple[subprocess.Popen[bytes], str]":
+    await bootstrap_database()
+    port = free_port()
+    server = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "ga_api.web.application:get_app",
+            "--factory",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--http",
+            "h11",
+            "--no-access-log",
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, "GA_API_REQUEST_TIMING": "true"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=url) as http:
+        for _ in range(600):
+            try:
+                if (await http.get("/api/health")).status_code == 200:
+                    return server, url
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    server.terminate()
+    raise SystemExit("The server did not start")
+
+
+async def run_client(client: Client, deadline: float) -> None:
+    scenarios: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "browse_professionals": client.browse_professionals,
+        "list_availability": client.list_availability,
+        "book": client.book,
+        "login": client.login_patient,
+        "admin_write": client.admin_write,
+    }
+    names = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+    while time.perf_counter() < deadline:
+        name = client.rng.choices(names, weights)[0]
+        try:
+            await scenarios[name]()
+        except (httpx.HTTPError, ValueError) as e:
+            client.errors[f"{name}: {type(e).__name__}"] += 1
+
+
+def percentile(values: List[float], share: float) -> float:
+    return values[min(int(share * len(values)), len(values) - 1)]
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    latencies = sorted(sample.latency * 1000 for sample in samples)
+    db_times = sorted(
+        sample.db_time * 1000 for sample in samples if sample.db_time is not None
+    )
+    statements = [
+        sample.db_statements for sample in samples if sample.db_statements is not None
+    ]
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / duration, 2),
+        "status": dict(Counter(str(sample.status) for sample in samples)),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2),
+        },
+        "db_ms": (
+            {
+                "p50": round(percentile(db_times, 0.50), 2),
+                "p95": round(percentile(db_times, 0.95), 2),
+                "mean": round(sum(db_times) / len(db_times), 2),
+            }
+            if db_times
+            else None
+        ),
+        "db_statements": (
+            round(sum(statements) / len(statements), 2) if statements else None
+        ),
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    dataset = await load_dataset(args.sample_size)
+    server = None
+    url = args.url
+    if url is None:
+        server, url = await start_server(args.workers)
+
+    samples: Dict[str, List[Sample]] = defaultdict(list)
+    limits = httpx.Limits(max_connections=args.clients)
+    try:
+        async with httpx.AsyncClient(
+            base_url=url,
+            limits=limits,
+            timeout=args.timeout,
+        ) as http:
+            clients = [
+                Client(
+                    number,
+                    http,
+                    dataset,
+                    random.Random(args.seed + number),  # noqa: S311
+                    samples,
+                )
+                for number in range(args.clients)
+            ]
+            admin_token = await clients[0].login(ADMIN_EMAIL, ADMIN_PASSWORD)
+            for client in clients:
+                client.admin_token = admin_token
+                client.patient_token = await client.login(
+                    client.rng.choice(dataset.patient_emails),
+                    USER_PASSWORD,
+                )
+            # the logins above warm the server up and are not measured
+            samples.clear()
+
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(run_client(client, deadline) for client in clients))
+            duration = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    errors: Counter[str] = Counter()
+    for client in clients:
+        errors.update(client.errors)
+    every_sample = [sample for endpoint in samples.values() for sample in endpoint]
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "clients": args.clients,
+            "duration": args.duration,
+            "workers": args.workers if args.url is None else None,
+            "seed": args.seed,
+            "weights": SCENARIO_WEIGHTS,
+        },
+        "total": summarize(every_sample, duration),
+        "endpoints": {
+            endpoint: summarize(endpoint_samples, duration)
+            for endpoint, endpoint_samples in sorted(samples.items())
+        },
+        "client_errors": dict(errors),
+    }
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    def change(new: float, old: Optional[float]) -> str:
+        if not old:
+            return ""
+        return f" ({(new - old) / old * 100:+.0f}%)"
+
+    rows = {**result["endpoints"], "TOTAL": result["total"]}
+    old_rows = {}
+    if baseline is not None:
+        old_rows = {**baseline["endpoints"], "TOTAL": baseline["total"]}
+    for endpoint, summary in rows.items():
+        old = old_rows.get(endpoint)
+        latency = summary["latency_ms"]
+        db_ms = summary["db_ms"] or {}
+        parts = [f"{endpoint:>20}: {summary['rps']:8.1f} rps"]
+        if old:
+            parts[0] += change(summary["rps"], old["rps"])
+        for name in ("p50", "p95", "p99"):
+            part = f"{name} {latency[name]:8.1f} ms"
+            if old:
+                part += change(latency[name], old["latency_ms"][name])
+            parts.append(part)
+        if db_ms:
+            parts.append(f"db {db_ms['mean']:6.1f} ms / {summary['db_statements']} q")
+        print(" | ".join(parts))  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers")
+    parser.add_argument("--url", help="benchmark a running server instead")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sample-size", type=int, default=5000)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="results of an earlier run")
+    args = parser.parse_args()
+
+    result = asyncio.run(benchmark(args))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(result, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Pages per second serializing the listings through response_model or ModelListResponse.
+
+"response_model" is how the listing routes answered before: FastAPI
+validates the returned items against the route's ``response_model``, dumps
+them to JSON-compatible data and ``UJSONResponse`` encodes it; the schedule
+listing validated every item once more in the route. "ModelListResponse"
+validates each item once and writes the bytes in the same call. Pages are
+built from ORM objects in memory, so only serialization is measured; see
+``benchmarks.http_load_benchmark`` for the routes end to end. Run with::
+
+    python -m benchmarks.json_response_benchmark --items 200 --pages 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from fastapi.responses import UJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.responses import Response
+
+from ga_api.db.models import load_all_models
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.speciality_model import Speciality
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.web.api.availability.response.availability_response import (
+    AvailabilityResponse,
+)
+from ga_api.web.api.professionals.response.professional_block_response import (
+    ProfessionalBlockResponse,
+)
+from ga_api.web.json_response import ModelListResponse
+
+START = datetime(2099, 1, 1, tzinfo=timezone.utc)
+# pages are timed in rounds, the fastest of which is reported
+ROUNDS = 5
+
+Serializer = Callable[[List[Any]], Awaitable[Response]]
+
+
+def availabilities(count: int) -> List[Availability]:
+    professional_id = uuid.uuid4()
+    return [
+        Availability(
+            id=uuid.uuid4(),
+            status=AvailabilityStatus.TAKEN,
+            start_time=START + timedelta(hours=hour),
+            end_time=START + timedelta(hours=hour, minutes=50),
+            professional_id=professional_id,
+            patient_id=uuid.uuid4(),
+        )
+        for hour in range(count)
+    ]
+
+
+def professionals(count: int) -> List[Tuple[Professional, bool]]:
+    specialities = [
+        Speciality(id=uuid.uuid4(), title=f"Speciality {n}") for n in range(3)
+    ]
+    return [
+        (
+            Professional(
+                id=uuid.uuid4(),
+                full_name=f"Dr. {n}",
+                bio="Twenty years of practice.",
+                phone=f"+55 11 9{n:08d}",
+                email=f"dr{n}@example.com",
+                is_enabled=True,
+                created_at=START,
+                updated_at=START,
+                specialities=specialities[: n % 3 + 1],
+            ),
+            n % 2 == 0,
+        )
+        for n in range(count)
+    ]
+
+
+def response_model(model: Any) -> Serializer:
+    field = create_model_field("Response", List[model])
+
+    async def serialize(items: List[Any]) -> Response:
+        content = await serialize_response(field=field, response_content=items)
+        return UJSONResponse(content)
+
+    return serialize
+
+
+def validated_in_route(model: Any) -> Serializer:
+    serialize = response_model(model)
+
+    async def validate_and_serialize(items: List[Any]) -> Response:
+        return await serialize([model.model_validate(item) for item in items])
+
+    return validate_and_serialize
+
+
+def model_list_response(model: Any) -> Serializer:
+    async def serialize(items: List[Any]) -> Response:
+        return ModelListResponse(model, items)
+
+    return serialize
+
+
+def block_responses(items: List[Tuple[Professional, bool]]) -> List[Any]:
+    # what ProfessionalService returns for the listing
+    return [
+        ProfessionalBlockResponse(professional=prof, is_blocked=blocked)  # type: ignore
+        for prof, blocked in items
+    ]
+
+
+LISTINGS: Dict[str, Tuple[Callable[[int], List[Any]], Dict[str, Serializer]]] = {
+    "availabilities": (
+        availabilities,
+        {
+            "response_model": response_model(AvailabilityResponse),
+            "ModelListResponse": model_list_response(AvailabilityResponse),
+        },
+    ),
+    "my schedules": (
+        availabilities,
+        {
+            "response_model": validated_in_route(AvailabilityResponse),
+            "ModelListResponse": model_list_response(AvailabilityResponse),
+        },
+    ),
+    "professionals": (
+        lambda count: block_responses(professionals(count)),
+        {
+            "response_model": response_model(ProfessionalBlockResponse),
+            "ModelListResponse": model_list_response(ProfessionalBlockResponse),
+        },
+    ),
+}
+
+
+async def time_pages(serialize: Serializer, page: List[Any], pages: int) -> float:
+    started = time.perf_counter()
+    for _ in range(pages):
+        await serialize(page)
+    return (time.perf_counter() - started) / pages
+
+
+async def benchmark(items: int, pages: int) -> None:
+    load_all_models()
+    for listing, (build, serializers) in LISTINGS.items():
+        page = build(items)
+        bodies = set()
+        for name, serialize in serializers.items():
+            bodies.add((await serialize(page)).body)
+            per_page = min(
+                [
+                    await time_pages(serialize, page, pages // ROUNDS)
+                    for _ in range(ROUNDS)
+                ],
+            )
+            print(  # noqa: T201
+                f"{listing:>15} {name:>18}: {1 / per_page:>8.0f} pages/s "
+                f"({per_page * 1000:.2f} ms per {items} items)",
+            )
+        if len(bodies) != 1:
+            raise RuntimeError(f"{listing}: the serializers disagree")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.items, args.pages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import asyncio
+import socket
+from contextlib import contextmanager
+from typing import Any, Iterator, List
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig
+
+
+class CountingHandler:
+    """
+    aiosmtpd handler that accepts everything and counts what it got.
+
+    ``connect_delay`` is spent answering EHLO, standing in for the TCP, TLS
+    and login round trips a real mail server costs per connection.
+    """
+
+    def __init__(self, connect_delay: float = 0.0) -> None:
+        self.connect_delay = connect_delay
+        self.messages = 0
+        self.connections = 0
+
+    async def handle_EHLO(  # noqa: N802
+        self,
+        server: Any,
+        session: Any,
+        envelope: Any,
+        hostname: str,
+        responses: List[str],
+    ) -> List[str]:
+        self.connections += 1
+        session.host_name = hostname
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        return responses
+
+    async def handle_DATA(  # noqa: N802
+        self,
+        server: Any,
+        session: Any,
+        envelope: Any,
+    ) -> str:
+        self.messages += 1
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_smtp_server(handler: CountingHandler) -> Iterator[ConnectionConfig]:
+    """Runs an aiosmtpd server in a thread and yields a config pointing to it."""
+    port = _free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield ConnectionConfig(
+            MAIL_USERNAME="",
+            MAIL_PASSWORD="",
+            MAIL_FROM="noreply@example.com",
+            MAIL_PORT=port,
+            MAIL_SERVER="127.0.0.1",
+            MAIL_STARTTLS=False,
+            MAIL_SSL_TLS=False,
+            USE_CREDENTIALS=False,
+            VALIDATE_CERTS=False,
+        )
+    finally:
+        controller.stop()
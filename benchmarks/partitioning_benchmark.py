@@ -0,0 +1,218 @@
+"""
+Availability query latency on the partitioned table and on a plain copy.
+
+Copies ``availabilities`` into an unpartitioned table of its own schema,
+next to views of the tables the queries join, and times the DAO queries
+against both by switching the ``search_path``: the patient listing, the
+overlap and double appointment checks, a day of reminders and the lookup by
+id. Generate the dataset first; 50M availabilities take
+``--professionals 5000 --availabilities-per-professional 10000``. Run with::
+
+    GA_API_DB_BASE=ga_api_staging python -m benchmarks.generate_dataset --truncate
+    GA_API_DB_BASE=ga_api_staging python -m benchmarks.partitioning_benchmark
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from ga_api.db.dao.appointment_reminder_dao import AppointmentReminderDAO
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.models import load_all_models
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.settings import settings
+
+PLAIN_SCHEMA = "unpartitioned"
+# tables the availability queries read besides availabilities
+JOINED_TABLES = ("blocks", "users", "professionals", "appointment_reminders")
+
+
+async def create_plain_copy(engine: AsyncEngine, rebuild: bool) -> None:
+    async with engine.begin() as connection:
+        exists = await connection.execute(
+            text("SELECT to_regclass(:table)"),
+            {"table": f"{PLAIN_SCHEMA}.availabilities"},
+        )
+        if exists.scalar() is not None and not rebuild:
+            return
+        started = time.perf_counter()
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {PLAIN_SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {PLAIN_SCHEMA}"))
+        await connection.execute(
+            text(
+                f"CREATE TABLE {PLAIN_SCHEMA}.availabilities "
+                "(LIKE public.availabilities INCLUDING DEFAULTS)",
+            ),
+        )
+        await connection.execute(
+            text(
+                f"INSERT INTO {PLAIN_SCHEMA}.availabilities "  # noqa: S608
+                "SELECT * FROM public.availabilities",
+            ),
+        )
+        # the indexes of the table before it was partitioned
+        await connection.execute(
+            text(f"ALTER TABLE {PLAIN_SCHEMA}.availabilities ADD PRIMARY KEY (id)"),
+        )
+        await connection.execute(
+            text(
+                f"CREATE INDEX ON {PLAIN_SCHEMA}.availabilities (status, start_time)",
+            ),
+        )
+        for table in JOINED_TABLES:
+            await connection.execute(
+                text(
+                    f"CREATE VIEW {PLAIN_SCHEMA}.{table} AS "  # noqa: S608
+                    f"SELECT * FROM public.{table}",
+                ),
+            )
+        print(  # noqa: T201
+            f"copied the availabilities in {time.perf_counter() - started:.1f}s",
+        )
+    async with engine.connect() as connection:
+        await connection.execute(text(f"ANALYZE {PLAIN_SCHEMA}.availabilities"))
+
+
+async def sample(engine: AsyncEngine, size: int) -> Dict[str, List[Any]]:
+    async with engine.connect() as connection:
+        availabilities = await connection.execute(
+            text(
+                "SELECT id, start_time, end_time, professional_id, patient_id "
+                "FROM availabilities TABLESAMPLE SYSTEM (1) LIMIT :limit",
+            ),
+            {"limit": size},
+        )
+        rows = availabilities.all()
+    if not rows:
+        raise SystemExit("No availabilities: run python -m benchmarks.generate_dataset")
+    return {
+        "availabilities": rows,
+        "patients": [row.patient_id for row in rows if row.patient_id] or [None],
+    }
+
+
+async def time_queries(
+    session: AsyncSession,
+    samples: Dict[str, List[Any]],
+    iterations: int,
+    seed: int,
+) -> Dict[str, List[float]]:
+    dao = AvailabilityDAO(session)
+    reminders = AppointmentReminderDAO(session)
+    rng = random.Random(seed)  # noqa: S311
+    now = datetime.now(timezone.utc)
+
+    async def listing(row: Any) -> None:
+        await dao.find_all_not_blocked(
+            limit=50,
+            offset=0,
+            professional_id=row.professional_id,
+            status=AvailabilityStatus.AVAILABLE,
+            after=now,
+        )
+
+    async def overlaps(row: Any) -> None:
+        await dao.overlaps(row.start_time, row.end_time)
+
+    async def double_appointment(row: Any) -> None:
+        await dao.check_double_appointment(
+            rng.choice(samples["patients"]),
+            row.start_time,
+            row.end_time,
+        )
+
+    async def reminders_of_a_day(row: Any) -> None:
+        start = row.start_time.replace(hour=0, minute=0)
+        async for _ in reminders.stream_pending(start, start + timedelta(days=1), 500):
+            pass
+
+    async def find_by_id(row: Any) -> None:
+        await dao.find_by_id(row.id)
+        session.expunge_all()
+
+    queries: Dict[str, Callable[[Any], Awaitable[None]]] = {
+        "listing": listing,
+        "overlaps": overlaps,
+        "double_appointment": double_appointment,
+        "reminders_of_a_day": reminders_of_a_day,
+        "find_by_id": find_by_id,
+    }
+    timings: Dict[str, List[float]] = {}
+    for name, query in queries.items():
+        # warm the caches and the prepared statements
+        for row in samples["availabilities"][:5]:
+            await query(row)
+        durations = []
+        for _ in range(iterations):
+            row = rng.choice(samples["availabilities"])
+            started = time.perf_counter()
+            await query(row)
+            durations.append(time.perf_counter() - started)
+        timings[name] = durations
+    await session.rollback()
+    return timings
+
+
+def percentiles(durations: List[float]) -> str:
+    ordered = sorted(durations)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    return f"p50 {statistics.median(ordered) * 1000:8.2f} ms  p95 {p95 * 1000:8.2f} ms"
+
+
+async def main_async(iterations: int, rebuild: bool, seed: int) -> None:
+    load_all_models()
+    engine = create_async_engine(str(settings.db_url))
+    await create_plain_copy(engine, rebuild)
+    samples = await sample(engine, 1000)
+    async with engine.connect() as connection:
+        count = await connection.execute(text("SELECT count(*) FROM availabilities"))
+        partitions = await connection.execute(
+            text(
+                "SELECT count(*) FROM pg_inherits "
+                "WHERE inhparent = 'availabilities'::regclass",
+            ),
+        )
+        print(  # noqa: T201
+            f"{count.scalar()} availabilities, {partitions.scalar()} partitions",
+        )
+
+    await engine.dispose()
+
+    results: Dict[str, Dict[str, List[float]]] = {}
+    search_paths = {"plain": f"{PLAIN_SCHEMA}, public", "partitioned": "public"}
+    for label, search_path in search_paths.items():
+        engine = create_async_engine(
+            str(settings.db_url),
+            connect_args={"server_settings": {"search_path": search_path}},
+        )
+        async with AsyncSession(engine) as session:
+            results[label] = await time_queries(session, samples, iterations, seed)
+        await engine.dispose()
+
+    for name in results["plain"]:
+        for label, timings in results.items():
+            print(f"{name:>20} {label:>12}: {percentiles(timings[name])}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="copy the availabilities again",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args.iterations, args.rebuild, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Load of several workers sharing a small PgBouncer server-side pool.
+
+Each worker process opens its own engine, as a gunicorn worker does, and
+runs concurrent read transactions with bound parameters through PgBouncer.
+The number of server backends is sampled on Postgres itself. Start the
+pooler with ``docker compose --profile pgbouncer up db pgbouncer`` and run::
+
+    GA_API_DB_PGBOUNCER=true GA_API_DB_PORT=6432 GA_API_DB_DIRECT_PORT=5432 \\
+        python -m benchmarks.pgbouncer_load_benchmark --workers 8
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from multiprocessing.process import BaseProcess
+from typing import List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ga_api.db.models import load_all_models
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.users import User
+from ga_api.db.pool import create_pooled_engine
+from ga_api.settings import settings
+
+BACKENDS_QUERY = text(
+    "SELECT count(*) FROM pg_stat_activity "
+    "WHERE datname = current_database() AND backend_type = 'client backend' "
+    "AND pid <> pg_backend_pid()",
+)
+
+
+async def worker_load(duration: float, concurrency: int) -> Tuple[int, int]:
+    load_all_models()
+    engine = create_pooled_engine(settings.db_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    deadline = time.perf_counter() + duration
+    transactions = 0
+    errors = 0
+
+    async def client(number: int) -> None:
+        nonlocal transactions, errors
+        while time.perf_counter() < deadline:
+            try:
+                async with session_factory() as session, session.begin():
+                    await session.execute(
+                        select(User.id).where(User.email == f"load-{number}@mail.com"),
+                    )
+                    await session.execute(
+                        select(Professional.id)
+                        .order_by(Professional.id)
+                        .limit(number + 1),
+                    )
+                transactions += 1
+            except DBAPIError:
+                errors += 1
+
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    await engine.dispose()
+    return transactions, errors
+
+
+def run_worker(
+    duration: float,
+    concurrency: int,
+    results: "multiprocessing.Queue[Tuple[int, int]]",
+) -> None:
+    results.put(asyncio.run(worker_load(duration, concurrency)))
+
+
+async def sample_backends(workers: List[BaseProcess]) -> int:
+    engine = create_async_engine(str(settings.db_direct_url))
+    peak = 0
+    async with engine.connect() as connection:
+        while any(worker.is_alive() for worker in workers):
+            peak = max(peak, (await connection.execute(BACKENDS_QUERY)).scalar_one())
+            await connection.rollback()
+            await asyncio.sleep(0.1)
+    await engine.dispose()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=10, help="per worker")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results: "multiprocessing.Queue[Tuple[int, int]]" = context.Queue()
+    workers = [
+        context.Process(
+            target=run_worker,
+            args=(args.duration, args.concurrency, results),
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    peak_backends = asyncio.run(sample_backends(workers))
+    totals = [results.get() for _ in workers]
+
+    transactions = sum(done for done, _ in totals)
+    errors = sum(failed for _, failed in totals)
+    client_connections = args.workers * (
+        settings.db_pool_size + settings.db_pool_max_overflow
+    )
+    print(  # noqa: T201
+        f"{args.workers} workers, up to {client_connections} client connections "
+        f"(pgbouncer mode {'on' if settings.db_pgbouncer else 'off'}): "
+        f"{transactions / args.duration:.0f} transactions/s, {errors} errors, "
+        f"peak {peak_backends} server backends",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Pool waits of fast queries while other requests await a slow mail server.
+
+Each "mail" request queries the users table and then awaits a simulated
+SMTP call, either holding its session or inside ``released_connection``.
+Meanwhile "listing" requests run one quick query each. Run with::
+
+    python -m benchmarks.pool_starvation_benchmark --pool-size 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.users import User
+from ga_api.db.pool import InstrumentedPool, PoolWaitStats
+from ga_api.db.session import released_connection
+from ga_api.settings import settings
+
+
+async def mail_request(
+    session_factory: async_sessionmaker[AsyncSession],
+    smtp_delay: float,
+    release: bool,
+) -> None:
+    async with session_factory() as session:
+        await session.execute(select(User).where(User.email == "nobody@mail.com"))
+        if release:
+            async with released_connection(session):
+                await asyncio.sleep(smtp_delay)
+        else:
+            await asyncio.sleep(smtp_delay)
+
+
+async def listing_request(session_factory: async_sessionmaker[AsyncSession]) -> float:
+    started = time.perf_counter()
+    async with session_factory() as session:
+        await session.execute(select(Professional).limit(50))
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace, release: bool) -> None:
+    engine = create_async_engine(
+        str(settings.db_url),
+        poolclass=InstrumentedPool,
+        pool_size=args.pool_size,
+        max_overflow=0,
+        pool_timeout=60,
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    # open the pool's connections up front so only waiting is measured
+    await asyncio.gather(*(listing_request(session_factory) for _ in range(4)))
+    pool = engine.pool
+    assert isinstance(pool, InstrumentedPool)  # noqa: S101
+    pool.wait_stats = PoolWaitStats()
+
+    mails = [
+        asyncio.create_task(mail_request(session_factory, args.smtp_delay, release))
+        for _ in range(args.mail_requests)
+    ]
+    listings = []
+    for _ in range(args.listings):
+        listings.append(asyncio.create_task(listing_request(session_factory)))
+        await asyncio.sleep(args.listing_interval)
+    latencies: List[float] = await asyncio.gather(*listings)
+    await asyncio.gather(*mails)
+
+    stats = pool.wait_stats
+    latencies.sort()
+    print(  # noqa: T201
+        f"{'released' if release else 'held':>8}: listing p50 "
+        f"{statistics.median(latencies) * 1000:7.1f} ms, p95 "
+        f"{latencies[int(len(latencies) * 0.95)] * 1000:7.1f} ms | pool waits: "
+        f"mean {stats.mean_wait * 1000:6.1f} ms, max {stats.max_wait * 1000:6.1f} ms, "
+        f"{stats.slow_checkouts}/{stats.checkouts} slow",
+    )
+    await engine.dispose()
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    load_all_models()
+    engine = create_async_engine(str(settings.db_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(meta.create_all)
+    await engine.dispose()
+
+    await run(args, release=False)
+    await run(args, release=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--mail-requests", type=int, default=20)
+    parser.add_argument("--smtp-delay", type=float, default=0.5, help="seconds")
+    parser.add_argument("--listings", type=int, default=100)
+    parser.add_argument("--listing-interval", type=float, default=0.01, help="seconds")
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
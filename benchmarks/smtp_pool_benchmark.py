@@ -0,0 +1,111 @@
+"""
+Throughput of the pooled SMTP sender against a local aiosmtpd server.
+
+Compares sending with one fresh connection per message (what FastMail does)
+against ``SMTPConnectionPool``. Run with::
+
+    python -m benchmarks.smtp_pool_benchmark --messages 2000 --target 500
+
+The command exits with status 1 when the pool stays below ``--target``
+messages per second.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable
+
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+
+import ga_api.web.api.mail  # noqa: F401  # initialise before its service (import cycle)
+from benchmarks.local_smtp import CountingHandler, local_smtp_server
+from ga_api.services.mail_service import MailService
+from ga_api.services.smtp_pool import SMTPConnectionPool
+
+
+def build_message(index: int) -> MessageSchema:
+    return MessageSchema(
+        subject="Calm Mind | Benchmark",
+        recipients=[f"patient{index}@example.com"],
+        body="<p>benchmark</p>",
+        subtype="html",  # type: ignore
+    )
+
+
+async def run(
+    messages: int,
+    concurrency: int,
+    send: Callable[[MessageSchema], Awaitable[None]],
+) -> float:
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(messages):
+        queue.put_nowait(index)
+
+    async def worker() -> None:
+        while not queue.empty():
+            await send(build_message(queue.get_nowait()))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return messages / (time.perf_counter() - started)
+
+
+async def benchmark(args: argparse.Namespace) -> float:
+    handler = CountingHandler(connect_delay=args.connect_delay / 1000)
+
+    with local_smtp_server(handler) as server_config:
+        config = ConnectionConfig(**{**server_config.model_dump(), "TIMEOUT": 30})
+        fast_mail = FastMail(config)
+        baseline = await run(
+            args.baseline_messages,
+            args.concurrency,
+            fast_mail.send_message,
+        )
+        baseline_connections = handler.connections
+
+        pool = SMTPConnectionPool(
+            config,
+            size=args.pool_size,
+            max_messages=args.max_messages,
+            idle_timeout=60,
+        )
+        service = MailService(pool)
+        pooled = await run(args.messages, args.concurrency, service.send_message)
+        await pool.close()
+
+    print(  # noqa: T201
+        f"connection per message: {baseline:8.1f} msg/s "
+        f"({args.baseline_messages} messages, {baseline_connections} connections)",
+    )
+    print(  # noqa: T201
+        f"pooled ({args.pool_size} conns):    {pooled:8.1f} msg/s "
+        f"({args.messages} messages, {pool.connections_opened} connections)",
+    )
+    return pooled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--baseline-messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--max-messages", type=int, default=100)
+    parser.add_argument(
+        "--connect-delay",
+        type=float,
+        default=50.0,
+        help="simulated handshake and login cost per connection, in ms",
+    )
+    parser.add_argument("--target", type=float, default=0.0, help="msg/s to reach")
+    args = parser.parse_args()
+
+    pooled = asyncio.run(benchmark(args))
+    if pooled < args.target:
+        print(f"below target of {args.target} msg/s")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Render time of the first access email template.
+
+Compares compiling the template for every message against the precompiled
+``TemplateRegistry``, one message at a time and in batches. Run with::
+
+    python -m benchmarks.template_render_benchmark --messages 20000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from jinja2 import Environment, select_autoescape
+
+from ga_api.web.api.mail.templates.template_registry import (
+    TEMPLATES_DIR,
+    TemplateRegistry,
+)
+
+TEMPLATE = "first_access_password.html"
+
+
+def context(index: int) -> dict[str, str]:
+    return {
+        "email": f"patient{index}@example.com",
+        "password": f"pw{index:06}",
+        "calm_mind_url": "https://example.com/",
+    }
+
+
+def measure(messages: int, render: Callable[[int], object]) -> float:
+    started = time.perf_counter()
+    render(messages)
+    return (time.perf_counter() - started) / messages * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    source = (TEMPLATES_DIR / TEMPLATE).read_text()
+    environment = Environment(autoescape=select_autoescape(["html"]))
+
+    started = time.perf_counter()
+    registry = TemplateRegistry(bytecode_cache_dir=None)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    def compile_each_time(messages: int) -> None:
+        for index in range(messages):
+            environment.from_string(source).render(context(index))
+
+    def precompiled(messages: int) -> None:
+        for index in range(messages):
+            registry.render(TEMPLATE, **context(index))
+
+    def batched(messages: int) -> None:
+        for start in range(0, messages, args.batch_size):
+            end = min(start + args.batch_size, messages)
+            registry.render_many(TEMPLATE, (context(i) for i in range(start, end)))
+
+    baseline_messages = max(args.messages // 20, 1)
+    results = [
+        ("compile per message", measure(baseline_messages, compile_each_time)),
+        ("precompiled", measure(args.messages, precompiled)),
+        (f"batches of {args.batch_size}", measure(args.messages, batched)),
+    ]
+
+    print(f"registry load: {load_ms:.1f} ms")  # noqa: T201
+    for label, micros in results:
+        print(  # noqa: T201
+            f"{label:20} {micros:8.1f} us/message {1_000_000 / micros:10.0f} msg/s",
+        )
+    sizes = (len(source), len(registry.render(TEMPLATE, **context(0))))
+    print(f"template size: {sizes[0]} bytes raw, {sizes[1]} rendered")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+#!/bin/sh
+# Lets the db-replica service stream the WAL of this database.
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
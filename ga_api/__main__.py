@@ -1,11 +1,19 @@
+import asyncio
+
 import uvicorn
 
+from ga_api.db.bootstrap import bootstrap_database
 from ga_api.gunicorn_runner import GunicornApplication
+from ga_api.metrics import prepare_multiprocess_dir
 from ga_api.settings import settings
 
 
 def main() -> None:
     """Entrypoint of the application."""
+    if settings.db_bootstrap:
+        # once here rather than in every worker's startup
+        asyncio.run(bootstrap_database())
+
     if settings.reload:
         uvicorn.run(
             "ga_api.web.application:get_app",
@@ -14,19 +22,23 @@ def main() -> None:
             port=settings.port,
             reload=settings.reload,
             log_level=settings.log_level.value.lower(),
+            # the request timing middleware writes the access log instead
+            access_log=not settings.request_timing,
+            forwarded_allow_ips=settings.forwarded_allow_ips,
             factory=True,
         )
     else:
         # We choose gunicorn only if reload
         # option is not used, because reload
         # feature doesn't work with gunicorn workers.
+        prepare_multiprocess_dir()
         GunicornApplication(
             "ga_api.web.application:get_app",
             host=settings.host,
             port=settings.port,
             workers=settings.workers_count,
             factory=True,
-            accesslog="-",
+            accesslog=None if settings.request_timing else "-",
             loglevel=settings.log_level.value.lower(),
             access_log_format='%r "-" %s "-" %Tf',
         ).run()
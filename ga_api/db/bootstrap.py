@@ -0,0 +1,61 @@
+"""
+Creates the database schema and the development root admin.
+
+It runs once per deploy, before any worker starts: ``python -m ga_api``
+does it unless ``GA_API_DB_BOOTSTRAP`` is false, and
+``python -m ga_api.db.bootstrap`` runs it on its own, e.g. as a release step.
+"""
+
+import asyncio
+from logging import warning
+
+from sqlalchemy import text
+
+from ga_api.db.meta import meta
+from ga_api.db.models import load_all_models
+from ga_api.db.partitioning import (
+    PARTITIONED_TABLE,
+    ensure_future_partitions,
+    is_partitioned,
+)
+from ga_api.db.pool import create_pooled_engine
+from ga_api.db.sql_scripts import SqlScripts
+from ga_api.settings import settings
+
+# Advisory lock serializing bootstraps started at the same time
+SCHEMA_BOOTSTRAP_LOCK_KEY = 7_264_004
+
+
+async def bootstrap_database() -> None:
+    """
+    Creates the missing tables, the coming availability partitions and the
+    root admin; safe to run again.
+    """
+    load_all_models()
+    engine = create_pooled_engine(settings.db_url)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": SCHEMA_BOOTSTRAP_LOCK_KEY},
+            )
+            await connection.run_sync(meta.create_all)
+            if await is_partitioned(connection, PARTITIONED_TABLE):
+                await ensure_future_partitions(connection)
+            else:
+                warning(
+                    "%s is not partitioned: run python -m ga_api.db.partitioning",
+                    PARTITIONED_TABLE,
+                )
+            warning("CREATING ROOT ADMIN. !!! MUST BE USED FOR DEVELOPMENT ONLY !!!")
+            await connection.execute(text(SqlScripts.create_root_admin()))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    asyncio.run(bootstrap_database())
+
+
+if __name__ == "__main__":
+    main()
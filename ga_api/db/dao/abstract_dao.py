@@ -1,18 +1,115 @@
 from abc import ABC
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from functools import lru_cache
+from typing import (
+    Any,
+    Generic,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 from uuid import UUID
 
+from asyncpg.exceptions import IntegrityConstraintViolationError
 from fastapi import Depends, HTTPException
-from sqlalchemy import ClauseElement, delete, exists, func, select
+from sqlalchemy import (
+    ClauseElement,
+    ColumnDefault,
+    ColumnElement,
+    Insert,
+    Integer,
+    Select,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ga_api.db.dependencies import get_db_session
+from ga_api.db.entity_cache import track_written_rows
+from ga_api.db.loader import loader_for
+from ga_api.db.session import mark_written
 from ga_api.db.utils import create_generic_integrity_error_message
+from ga_api.settings import settings
 
 T = TypeVar("T")
 
 
+# Statements built once per model and executed with bound parameters: they
+# skip building the construct and computing its cache key on every call.
+@lru_cache(maxsize=None)
+def _exists_statement(model: Any, fields: Tuple[str, ...]) -> Select[Any]:
+    return select(
+        exists().where(
+            *(
+                getattr(model, field) == bindparam(f"filter_{field}")
+                for field in fields
+            ),
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def _bulk_insert_statement(model: Any, ignore_conflicts: bool) -> Insert:
+    statement = postgresql.insert(model.__table__)
+    if ignore_conflicts:
+        statement = statement.on_conflict_do_nothing()
+    # rows come back in the order of the parameters, skipped ones left out
+    return statement.returning(
+        *model.__mapper__.primary_key,
+        sort_by_parameter_order=True,
+    )
+
+
+class BulkInsertResult(NamedTuple):
+    """Outcome of ``AbstractDAO.bulk_insert``."""
+
+    # primary keys of the inserted rows, as tuples
+    inserted: List[Tuple[Any, ...]]
+    # positions in the given rows of the ones skipped because of a conflict
+    conflicts: List[int]
+
+
+def archive_statement(
+    model: Any,
+    history_model: Any,
+    key: Tuple[str, ...],
+    *conditions: ColumnElement[bool],
+) -> Insert:
+    """
+    Statement moving up to ``batch_size`` rows matching ``conditions`` away.
+
+    It deletes the rows with ``RETURNING`` and inserts them into
+    ``history_model``, which has the same columns. Rows locked by another
+    transaction are skipped. ``key`` is the primary key of the table, so
+    the rows are found again through its index.
+    """
+    table = model.__table__
+    names = [column.name for column in table.columns]
+    keys = tuple_(*(table.c[name] for name in key))
+    batch = (
+        select(*(table.c[name] for name in key))
+        .where(*conditions)
+        .limit(bindparam("batch_size", type_=Integer))
+        .with_for_update(skip_locked=True)
+    )
+    moved = delete(table).where(keys.in_(batch)).returning(*table.columns).cte("moved")
+    return insert(history_model.__table__).from_select(
+        names,
+        select(*(moved.c[name] for name in names)),
+    )
+
+
 class AbstractDAO(Generic[T], ABC):
     """
     Abstract DAO for generic CRUD operations on any model.
@@ -57,15 +154,147 @@ class AbstractDAO(Generic[T], ABC):
 
         return obj_list
 
+    async def bulk_insert(
+        self,
+        rows: List[Mapping[str, Any]],
+        ignore_conflicts: bool = False,
+    ) -> BulkInsertResult:
+        """
+        Inserts many rows without loading them into the session.
+
+        Rows are column values, all with the same columns. Python-side
+        defaults, such as generated ids, are filled in first. When that gives
+        the primary key of every row, batches of at least
+        ``db_bulk_insert_copy_threshold`` rows are sent with ``COPY``; others,
+        and tables whose key the database generates, use multi-row
+        ``INSERT ... RETURNING`` statements.
+
+        With ``ignore_conflicts`` rows clashing with a unique constraint are
+        skipped (``ON CONFLICT DO NOTHING``, never ``COPY``) and reported by
+        position, which needs the keys known up front. Otherwise a clash
+        fails the whole batch with HTTP 400.
+        """
+        if not rows:
+            return BulkInsertResult([], [])
+
+        table = self.__model.__table__  # type: ignore[attr-defined]
+        values = self._with_defaults(table, rows)
+        mapper = self.__model.__mapper__  # type: ignore[attr-defined]
+        primary_key = [column.key for column in mapper.primary_key]
+        keys: Optional[List[Tuple[Any, ...]]] = None
+        if all(name in values[0] for name in primary_key):
+            keys = [tuple(row[name] for name in primary_key) for row in values]
+        elif ignore_conflicts:
+            raise ValueError("Skipping conflicts needs the primary keys of the rows")
+
+        threshold = settings.db_bulk_insert_copy_threshold
+        try:
+            if (
+                keys is not None
+                and not ignore_conflicts
+                and threshold
+                and len(values) >= threshold
+            ):
+                await self._copy(table, values, keys)
+                return BulkInsertResult(keys, [])
+
+            result = await self._session.execute(
+                _bulk_insert_statement(self.__model, ignore_conflicts),  # type: ignore
+                values,
+            )
+        except IntegrityError as e:
+            await self._session.rollback()
+            detail = create_generic_integrity_error_message(e)
+            raise HTTPException(status_code=400, detail=detail) from e
+        except IntegrityConstraintViolationError as e:
+            await self._session.rollback()
+            detail = create_generic_integrity_error_message(
+                IntegrityError("COPY", None, e),
+            )
+            raise HTTPException(status_code=400, detail=detail) from e
+
+        inserted = [tuple(row) for row in result.all()]
+        if keys is None or len(inserted) == len(keys):
+            return BulkInsertResult(inserted, [])
+        found = set(inserted)
+        return BulkInsertResult(
+            inserted,
+            [position for position, key in enumerate(keys) if key not in found],
+        )
+
+    @staticmethod
+    def _with_defaults(
+        table: Any,
+        rows: List[Mapping[str, Any]],
+    ) -> List[dict[str, Any]]:
+        defaults = [
+            (column.key, column.default)
+            for column in table.columns
+            if isinstance(column.default, ColumnDefault)
+        ]
+        values = []
+        for row in rows:
+            filled = dict(row)
+            for key, default in defaults:
+                if key not in filled:
+                    filled[key] = (
+                        default.arg(None)  # type: ignore[arg-type]
+                        if default.is_callable
+                        else default.arg
+                    )
+            values.append(filled)
+        return values
+
+    async def _copy(
+        self,
+        table: Any,
+        rows: List[dict[str, Any]],
+        keys: List[Tuple[Any, ...]],
+    ) -> None:
+        # COPY goes through the driver: flush first, so pending ORM writes
+        # the rows may reference are in the table
+        await self._session.flush()
+        connection = await self._session.connection()
+        dialect = connection.dialect
+        columns = list(rows[0])
+        # the values the driver gets from INSERT, e.g. enum names
+        processors = [
+            table.c[name].type.dialect_impl(dialect).bind_processor(dialect)
+            for name in columns
+        ]
+        records = [
+            tuple(
+                processor(row[name]) if processor else row[name]
+                for name, processor in zip(columns, processors)
+            )
+            for row in rows
+        ]
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        if not driver.is_in_transaction():  # type: ignore[union-attr]
+            # the dialect sends BEGIN with its first statement; COPY as the
+            # first one would commit on its own
+            await connection.exec_driver_sql("SELECT 1")
+        await driver.copy_records_to_table(  # type: ignore[union-attr]
+            table.name,
+            records=records,
+            columns=columns,
+            schema_name=table.schema,
+        )
+        # the ORM events never see the rows: record them as its writes
+        session = self._session.sync_session
+        mark_written(session)
+        track_written_rows(session, self.__model, (key[0] for key in keys))
+
     async def find_by_id(self, obj_id: UUID | int) -> Optional[T]:
         """
         Finds an object by its ID.
         Returns None if not found.
+
+        Lookups issued together, e.g. under ``asyncio.gather``, share one
+        query; objects already loaded in the session need none.
         """
-        result = await self._session.execute(
-            select(self.__model).where(self.__model.id == obj_id),  # type: ignore
-        )
-        return result.scalar_one_or_none()
+        return await loader_for(self._session, self.__model).load(obj_id)
 
     async def find_all(self, limit: int = 50, offset: int = 0) -> List[T]:
         """
@@ -80,10 +309,10 @@ class AbstractDAO(Generic[T], ABC):
         if not ids:
             return []
 
-        result = await self._session.execute(
-            select(self.__model).where(self.__model.id.in_(ids)),  # type: ignore
+        found = await loader_for(self._session, self.__model).load_many(
+            dict.fromkeys(ids),
         )
-        return result.scalars().all()  # type: ignore
+        return [obj for obj in found if obj is not None]
 
     async def delete(self, obj: T) -> None:
         """
@@ -123,15 +352,99 @@ class AbstractDAO(Generic[T], ABC):
 
         return obj
 
+    async def update_where(
+        self,
+        filters: Mapping[str, Any],
+        values: Mapping[str, Any],
+        *conditions: ColumnElement[bool],
+    ) -> List[Any]:
+        """
+        Updates every row matching the filters in one statement.
+
+        Nothing is loaded: a single ``UPDATE ... WHERE ... RETURNING`` runs,
+        and objects of those rows already in the session get the new values.
+        - filters: dictionary for equality checks {field=value}; lists,
+          tuples and sets match any of their values
+        - conditions: additional SQLAlchemy expressions
+        Raises HTTP 400 if a database constraint is violated.
+
+        :return: ids of the updated rows.
+        """
+        statement = (
+            update(self.__model)
+            .where(*self._where(filters, conditions))
+            .values(**values)
+            .returning(self.__model.id)  # type: ignore[attr-defined]
+            .execution_options(synchronize_session="fetch")
+        )
+        try:
+            result = await self._session.execute(statement)
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Update would violate a database constraint",
+            ) from e
+        return list(result.scalars().all())
+
+    async def delete_where(
+        self,
+        filters: Mapping[str, Any],
+        *conditions: ColumnElement[bool],
+    ) -> List[Any]:
+        """
+        Deletes every row matching the filters in one statement.
+
+        Takes the filters and conditions of ``update_where``; objects of the
+        deleted rows are removed from the session.
+
+        :return: ids of the deleted rows.
+        """
+        statement = (
+            delete(self.__model)
+            .where(*self._where(filters, conditions))
+            .returning(self.__model.id)  # type: ignore[attr-defined]
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self._session.execute(statement)
+        return list(result.scalars().all())
+
+    def _where(
+        self,
+        filters: Mapping[str, Any],
+        conditions: Tuple[ColumnElement[bool], ...],
+    ) -> List[ColumnElement[bool]]:
+        # an empty filter would touch the whole table
+        if not filters and not conditions:
+            raise ValueError("At least one filter or condition is required")
+        clauses = list(conditions)
+        for field, value in filters.items():
+            column = getattr(self.__model, field)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                clauses.append(column.in_(value))
+            else:
+                clauses.append(column == value)
+        return clauses
+
     async def exists(self, *conditions: ClauseElement, **filters: Any) -> bool:
         """
         Checks if at least one record exists that satisfies the filters.
         - filters: dictionary for equality checks {field=value}
         - conditions: additional SQLAlchemy expressions (comparisons, ranges, etc.)
+
+        Checks made with filters only reuse a prebuilt statement.
         """
         if not filters and not conditions:
             return False
 
+        if not conditions:
+            fields = tuple(sorted(filters))
+            result = await self._session.execute(
+                _exists_statement(self.__model, fields),  # type: ignore
+                {f"filter_{field}": filters[field] for field in fields},
+            )
+            return bool(result.scalar())
+
         where_clauses = [
             getattr(self.__model, field) == value for field, value in filters.items()
         ]
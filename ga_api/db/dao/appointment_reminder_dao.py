@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Row, exists, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.abstract_dao import AbstractDAO
+from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.appointment_reminder_model import AppointmentReminder
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.users import User
+from ga_api.enums.availability_status import AvailabilityStatus
+
+
+class AppointmentReminderDAO(AbstractDAO[AppointmentReminder]):
+    """Class for accessing the sent appointment reminders."""
+
+    def __init__(self, session: AsyncSession = Depends(get_db_session)) -> None:
+        super().__init__(model=AppointmentReminder, session=session)
+
+    async def stream_pending(
+        self,
+        start: datetime,
+        end: datetime,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:  # type: ignore[type-arg]
+        """
+        Streams the taken appointments in [start, end) not reminded yet.
+
+        One query joins the patient and professional data; rows are fetched
+        from a server-side cursor ``batch_size`` at a time, so memory use
+        does not grow with the number of appointments. The cursor lives in
+        the session's transaction until the iteration ends.
+
+        :yields: batches of rows with ``id``, ``start_time``, ``email``,
+            ``patient_name`` and ``professional_name``.
+        """
+        already_sent = exists().where(
+            AppointmentReminder.availability_id == Availability.id,
+        )
+        query = (
+            select(  # type: ignore
+                Availability.id,
+                Availability.start_time,
+                User.email,
+                User.full_name.label("patient_name"),
+                Professional.full_name.label("professional_name"),
+            )
+            .join(User, User.id == Availability.patient_id)  # type: ignore
+            .join(Professional, Professional.id == Availability.professional_id)
+            .where(
+                Availability.status == AvailabilityStatus.TAKEN,
+                Availability.start_time >= start,
+                Availability.start_time < end,
+                ~already_sent,
+            )
+            .order_by(Availability.start_time)
+            .execution_options(yield_per=batch_size)
+        )
+
+        result = await self._session.stream(query)
+        async for batch in result.partitions():
+            yield batch
+
+    async def record_sent(self, appointments: List[Tuple[UUID, datetime]]) -> None:
+        """
+        Marks reminders as sent, ignoring the ones already recorded.
+
+        :param appointments: ``(id, start_time)`` of the availabilities.
+        """
+        if not appointments:
+            return
+
+        await self._session.execute(
+            insert(AppointmentReminder).on_conflict_do_nothing(),
+            [
+                {"availability_id": availability_id, "availability_start_time": start}
+                for availability_id, start in appointments
+            ],
+        )
@@ -1,16 +1,123 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import and_, exists, not_, select
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    column,
+    exists,
+    not_,
+    select,
+    table,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ga_api.db.dao.abstract_dao import AbstractDAO
+from ga_api.db.dao.abstract_dao import AbstractDAO, archive_statement
 from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.availability_history_model import (
+    AVAILABILITY_RECORDS_VIEW,
+    AvailabilityHistory,
+)
 from ga_api.db.models.availability_model import Availability
 from ga_api.db.models.block_model import Block
 from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.utils.time_utils import MAX_TIME_INTERVAL_HOURS
+
+# The hot queries are built once and executed with bound parameters, see
+# ``ga_api.db.dao.abstract_dao``.
+
+# No availability lasts longer than this, so one overlapping an interval
+# starts at most this long before it. Bounding ``start_time`` on both sides
+# lets Postgres skip the partitions of the other months.
+_LONGEST_AVAILABILITY = timedelta(hours=MAX_TIME_INTERVAL_HOURS)
+
+_DOUBLE_APPOINTMENT = select(
+    exists().where(
+        Availability.patient_id == bindparam("user_id"),
+        Availability.status == AvailabilityStatus.TAKEN,
+        Availability.start_time < bindparam("end_time"),
+        Availability.start_time > bindparam("earliest_start"),
+        Availability.end_time > bindparam("start_time"),
+    ),
+)
+
+# an availability is blocked when a block of its professional overlaps it
+_BLOCKED = exists(
+    select(1)
+    .where(
+        and_(
+            Block.professional_id == Availability.professional_id,
+            Block.start_time < Availability.end_time,
+            Block.end_time > Availability.start_time,
+        ),
+    )
+    .correlate(Availability),
+)
+
+# past slots nobody booked and finished or canceled appointments; taken ones
+# stay until they are completed or canceled
+_ARCHIVE = archive_statement(
+    Availability,
+    AvailabilityHistory,
+    ("id", "start_time"),
+    Availability.start_time < bindparam("before"),
+    Availability.status.in_(
+        [
+            AvailabilityStatus.AVAILABLE,
+            AvailabilityStatus.COMPLETED,
+            AvailabilityStatus.CANCELED,
+        ],
+    ),
+)
+
+_RECORDS = table(
+    AVAILABILITY_RECORDS_VIEW,
+    *(column(c.name, c.type) for c in Availability.__table__.columns),
+)
+_PATIENT_RECORDS = select(Availability).from_statement(
+    select(_RECORDS)
+    .where(_RECORDS.c.patient_id == bindparam("patient_id"))
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("offset", type_=Integer)),
+)
+
+
+@lru_cache(maxsize=None)
+def _overlapping_statement(excluding: bool) -> Select[Any]:
+    conditions = [
+        Availability.start_time < bindparam("end_time"),
+        Availability.start_time > bindparam("earliest_start"),
+        Availability.end_time > bindparam("start_time"),
+    ]
+    if excluding:
+        conditions.append(Availability.id != bindparam("exclude_id"))
+    return select(exists().where(*conditions))
+
+
+@lru_cache(maxsize=None)
+def _not_blocked_statement(
+    by_professional: bool,
+    by_status: bool,
+    by_start: bool,
+) -> Select[Any]:
+    conditions = [not_(_BLOCKED)]
+    if by_professional:
+        conditions.append(Availability.professional_id == bindparam("professional_id"))
+    if by_status:
+        conditions.append(Availability.status == bindparam("status"))
+    if by_start:
+        conditions.append(Availability.start_time > bindparam("after"))
+    return (
+        select(Availability)
+        .where(and_(*conditions))
+        .offset(bindparam("offset", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
 
 
 class AvailabilityDAO(AbstractDAO[Availability]):
@@ -23,14 +130,36 @@ class AvailabilityDAO(AbstractDAO[Availability]):
         start_time: datetime,
         end_time: datetime,
     ) -> bool:
-        conditions = [
-            Availability.patient_id == user_id,
-            Availability.status == AvailabilityStatus.TAKEN,
-            Availability.start_time < end_time,
-            Availability.end_time > start_time,
-        ]
+        result = await self._session.execute(
+            _DOUBLE_APPOINTMENT,
+            {
+                "user_id": user_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "earliest_start": start_time - _LONGEST_AVAILABILITY,
+            },
+        )
+        return bool(result.scalar())
 
-        return await self.exists(*conditions)
+    async def overlaps(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_id: Optional[UUID] = None,
+    ) -> bool:
+        """Checks if an availability other than ``exclude_id`` overlaps the interval."""
+        params: dict[str, Any] = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "earliest_start": start_time - _LONGEST_AVAILABILITY,
+        }
+        if exclude_id:
+            params["exclude_id"] = exclude_id
+        result = await self._session.execute(
+            _overlapping_statement(bool(exclude_id)),
+            params,
+        )
+        return bool(result.scalar())
 
     async def find_by_patient_id(
         self,
@@ -38,14 +167,25 @@ class AvailabilityDAO(AbstractDAO[Availability]):
         limit: int = 50,
         offset: int = 0,
     ) -> List[Availability]:
+        """Appointments of the patient, archived ones included."""
         result = await self._session.execute(
-            select(Availability)
-            .where(Availability.patient_id == patient_id)
-            .limit(limit)
-            .offset(offset),
+            _PATIENT_RECORDS,
+            {"patient_id": patient_id, "limit": limit, "offset": offset},
         )
         return list(result.scalars().all())
 
+    async def archive(self, before: datetime, batch_size: int) -> int:
+        """
+        Moves a batch of availabilities started before ``before`` to the history.
+
+        :return: number of availabilities moved.
+        """
+        result = await self._session.execute(
+            _ARCHIVE,
+            {"before": before, "batch_size": batch_size},
+        )
+        return result.rowcount  # type: ignore[attr-defined]
+
     async def find_all_not_blocked(
         self,
         limit: int,
@@ -54,30 +194,18 @@ class AvailabilityDAO(AbstractDAO[Availability]):
         status: Optional[AvailabilityStatus] = None,
         after: Optional[datetime] = None,
     ) -> List[Availability]:
-        subq = (
-            select(1)
-            .where(
-                and_(
-                    Block.professional_id == Availability.professional_id,
-                    Block.start_time < Availability.end_time,
-                    Block.end_time > Availability.start_time,
-                ),
-            )
-            .correlate(Availability)
-        )
-
-        conditions = [not_(exists(subq))]
-
+        params: dict[str, Any] = {"limit": limit, "offset": offset}
         if professional_id:
-            conditions.append(Availability.professional_id == professional_id)
+            params["professional_id"] = professional_id
         if status:
-            conditions.append(Availability.status == status)
+            params["status"] = status
         if after:
-            conditions.append(Availability.start_time > after)
+            params["after"] = after
 
-        query = (
-            select(Availability).where(and_(*conditions)).offset(offset).limit(limit)
+        query = _not_blocked_statement(
+            bool(professional_id),
+            bool(status),
+            bool(after),
         )
-
-        result = await self._session.execute(query)
+        result = await self._session.execute(query, params)
         return result.scalars().all()  # type: ignore
@@ -1,14 +1,23 @@
+from datetime import datetime
 from typing import List
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ga_api.db.dao.abstract_dao import AbstractDAO
+from ga_api.db.dao.abstract_dao import AbstractDAO, archive_statement
 from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.block_history_model import BlockHistory
 from ga_api.db.models.block_model import Block
 
+_ARCHIVE = archive_statement(
+    Block,
+    BlockHistory,
+    ("id",),
+    Block.end_time < bindparam("before"),
+)
+
 
 class BlockDAO(AbstractDAO[Block]):
     def __init__(self, session: AsyncSession = Depends(get_db_session)) -> None:
@@ -22,3 +31,15 @@ class BlockDAO(AbstractDAO[Block]):
             select(Block).where(Block.professional_id == professional_id),
         )
         return result.scalars().all()  # type: ignore
+
+    async def archive(self, before: datetime, batch_size: int) -> int:
+        """
+        Moves a batch of blocks ended before ``before`` to the history.
+
+        :return: number of blocks moved.
+        """
+        result = await self._session.execute(
+            _ARCHIVE,
+            {"before": before, "batch_size": batch_size},
+        )
+        return result.rowcount  # type: ignore[attr-defined]
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List
+
+from fastapi import Depends
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.abstract_dao import AbstractDAO
+from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.email_outbox_model import EmailOutbox
+from ga_api.enums.email_kind import EmailKind
+from ga_api.enums.email_status import EmailStatus
+
+
+class EmailOutboxDAO(AbstractDAO[EmailOutbox]):
+    """Class for accessing the email outbox table."""
+
+    def __init__(self, session: AsyncSession = Depends(get_db_session)) -> None:
+        super().__init__(model=EmailOutbox, session=session)
+
+    async def enqueue(
+        self,
+        kind: EmailKind,
+        recipient: str,
+        payload: dict[str, Any],
+    ) -> EmailOutbox:
+        """
+        Adds an email to the outbox inside the current transaction.
+
+        :param kind: which template the dispatcher should render.
+        :param recipient: destination address.
+        :param payload: template fields.
+        :return: the pending outbox entry.
+        """
+        return await self.save(
+            EmailOutbox(kind=kind, recipient=recipient, payload=payload),
+        )
+
+    async def enqueue_many(
+        self,
+        kind: EmailKind,
+        messages: list[tuple[str, dict[str, Any]]],
+    ) -> None:
+        """
+        Adds many emails of the same kind to the outbox in one statement.
+
+        :param kind: which template the dispatcher should render.
+        :param messages: recipient and template fields of each email.
+        """
+        if not messages:
+            return
+
+        await self._session.execute(
+            insert(EmailOutbox),
+            [
+                {"kind": kind, "recipient": recipient, "payload": payload}
+                for recipient, payload in messages
+            ],
+        )
+
+    async def claim_pending(self, limit: int) -> List[EmailOutbox]:
+        """
+        Locks a batch of emails that are due for delivery.
+
+        Rows already locked by another transaction are skipped, so concurrent
+        dispatchers never send the same email twice.
+
+        :param limit: maximum number of emails to claim.
+        :return: emails locked until the current transaction ends.
+        """
+        query = (
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EmailStatus.PENDING,
+                EmailOutbox.next_attempt_at <= func.now(),
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
+
+    async def mark_sent(self, message: EmailOutbox) -> None:
+        message.status = EmailStatus.SENT
+        message.sent_at = datetime.now(timezone.utc)
+        message.payload = {}
+        await self._session.flush()
+
+    async def mark_failed_attempt(
+        self,
+        message: EmailOutbox,
+        error: str,
+        retry_in: timedelta,
+        max_attempts: int,
+    ) -> None:
+        """
+        Records a failed delivery and schedules the next attempt.
+
+        The email is given up on (FAILED) once it reaches ``max_attempts``.
+        """
+        message.attempts += 1
+        message.last_error = error
+        if message.attempts >= max_attempts:
+            message.status = EmailStatus.FAILED
+            message.payload = {}
+        else:
+            message.next_attempt_at = datetime.now(timezone.utc) + retry_in
+        await self._session.flush()
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from typing import Iterable, NamedTuple, Optional
+
+from fastapi import Depends
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.abstract_dao import AbstractDAO
+from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.rate_limit_hit_model import RateLimitHit
+
+# First key of the two-key transaction advisory locks that serialize hits on
+# the same rate limit key.
+RATE_LIMIT_LOCK_NAMESPACE = 7_264_002
+
+
+class RateLimitRule(NamedTuple):
+    key: str
+    # calls accepted per window
+    limit: int
+    # window length in seconds
+    window: float
+
+
+class RateLimitHitDAO(AbstractDAO[RateLimitHit]):
+    """Class for accessing the rate limit hits table."""
+
+    def __init__(self, session: AsyncSession = Depends(get_db_session)) -> None:
+        super().__init__(model=RateLimitHit, session=session)
+
+    async def hit(
+        self,
+        rules: Iterable[RateLimitRule],
+    ) -> Optional[tuple[RateLimitRule, float]]:
+        """
+        Counts a call against every rule, or against none if one is exceeded.
+
+        Keys are locked until the transaction ends, so concurrent workers
+        never accept more calls than the limit. Must run inside a transaction.
+
+        :param rules: limits the call must respect.
+        :return: the first exceeded rule and the seconds until it accepts
+            calls again, or None if the call was counted.
+        """
+        rules = list(rules)
+        for key in sorted({rule.key for rule in rules}):
+            await self._session.execute(
+                select(
+                    func.pg_advisory_xact_lock(
+                        RATE_LIMIT_LOCK_NAMESPACE,
+                        func.hashtext(key),
+                    ),
+                ),
+            )
+
+        now = (await self._session.execute(select(func.clock_timestamp()))).scalar_one()
+        for rule in rules:
+            window_start = now - timedelta(seconds=rule.window)
+            await self._session.execute(
+                delete(RateLimitHit).where(
+                    RateLimitHit.key == rule.key,
+                    RateLimitHit.hit_at <= window_start,
+                ),
+            )
+            result = await self._session.execute(
+                select(func.count(), func.min(RateLimitHit.hit_at)).where(
+                    RateLimitHit.key == rule.key,
+                ),
+            )
+            count, oldest = result.one()
+            if count >= rule.limit:
+                return rule, (oldest - window_start).total_seconds()
+
+        self._session.add_all(RateLimitHit(key=rule.key, hit_at=now) for rule in rules)
+        await self._session.flush()
+        return None
+
+    async def forget_last(self, key: str) -> None:
+        """Removes the most recent hit of ``key``."""
+        latest = (
+            select(RateLimitHit.id)
+            .where(RateLimitHit.key == key)
+            .order_by(RateLimitHit.hit_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        await self._session.execute(
+            delete(RateLimitHit).where(RateLimitHit.id == latest),
+        )
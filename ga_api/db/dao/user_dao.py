@@ -1,6 +1,11 @@
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
 from fastapi import Depends
-from sqlalchemy import not_, select
+from sqlalchemy import func, not_, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from ga_api.db.dao.abstract_dao import AbstractDAO
 from ga_api.db.dependencies import get_db_session
@@ -21,7 +26,115 @@ class UserDAO(AbstractDAO[User]):
         self,
         skip: int = 0,
         limit: int = 100,
+        search: Optional[str] = None,
+        after: Optional[tuple[str, UUID]] = None,
     ) -> list[User]:
-        query = select(User).where(not_(User.is_superuser)).offset(skip).limit(limit)  # type: ignore
+        """
+        Lists patients ordered by name.
+
+        :param skip: rows to skip, prefer ``after`` for deep pages.
+        :param limit: maximum number of patients.
+        :param search: part of the name, or start of the email or CPF.
+        :param after: (full_name, id) of the last patient of the previous page.
+        """
+        patient: Any = User
+        conditions = [not_(User.is_superuser)]  # type: ignore
+
+        if search:
+            pattern = self._escape_like(search.lower())
+            conditions.append(
+                or_(
+                    func.lower(User.full_name).like(f"%{pattern}%", escape="\\"),
+                    func.lower(User.email).like(f"{pattern}%", escape="\\"),
+                    User.cpf.like(f"{pattern}%", escape="\\"),
+                ),
+            )
+            # Materialized so matches are found through the search indexes.
+            # Otherwise the planner tends to walk the name index in order and
+            # filter, which reads the whole table when there are few matches.
+            matches = select(User).where(*conditions).cte("matches")
+            patient = aliased(User, matches.prefix_with("MATERIALIZED"))
+            conditions = []
+
+        if after:
+            conditions.append(tuple_(patient.full_name, patient.id) > after)
+
+        query = (
+            select(patient)
+            .where(*conditions)
+            .order_by(patient.full_name, patient.id)
+            .offset(skip)
+            .limit(limit)
+        )
         result = await self._session.execute(query)
         return list(result.scalars().all())
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    async def find_taken_emails_and_cpfs(
+        self,
+        emails: Iterable[str],
+        cpfs: Iterable[str],
+    ) -> tuple[set[str], set[str]]:
+        """
+        Looks up which of the given emails and CPFs are already registered.
+
+        Emails are compared case-insensitively, like fastapi-users does.
+
+        :return: lowercased emails and CPFs in use.
+        """
+        lowered = [email.lower() for email in emails]
+        cpfs = list(cpfs)
+        if not lowered and not cpfs:
+            return set(), set()
+
+        email = func.lower(User.email)
+        query = select(email, User.cpf).where(
+            or_(email.in_(lowered), User.cpf.in_(cpfs)),
+        )
+        result = await self._session.execute(query)
+        rows = result.all()
+        return {row[0] for row in rows}, {row[1] for row in rows}
+
+    async def insert_many_ignoring_conflicts(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> set[str]:
+        """
+        Inserts users in a single multi-row statement.
+
+        Rows clashing with an existing email or CPF are skipped instead of
+        failing the whole batch.
+
+        :param rows: column values of each user, including the hashed password.
+        :return: emails of the users actually inserted.
+        """
+        if not rows:
+            return set()
+
+        query = insert(User).on_conflict_do_nothing().returning(User.email)  # type: ignore
+        result = await self._session.execute(query, rows)
+        return set(result.scalars().all())
+
+    async def set_first_access_password(
+        self,
+        email: str,
+        hashed_password: str,
+    ) -> bool:
+        """
+        Replaces the password of a user who has not logged in yet.
+
+        Users that already chose their own password are left untouched.
+
+        :return: whether a user awaiting first access was found.
+        """
+        query = (
+            update(User)
+            .where(User.email == email, User.is_first_access)  # type: ignore
+            .values(hashed_password=hashed_password)
+            .returning(User.id)
+        )
+        result = await self._session.execute(query)
+        return result.first() is not None
@@ -3,18 +3,78 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
+from ga_api.db.replica import PRIMARY_LSN_COOKIE, current_primary_lsn, parse_lsn
+from ga_api.db.session import has_committed_writes, has_pending_writes
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def use_read_replica() -> None:
+    """
+    Marks a read-only route whose sessions may come from the replica.
+
+    Add it to the route's ``dependencies``; it only applies to safe methods
+    and when a replica is configured. ``get_db_session`` looks the marker up
+    on the matched route, so dependencies solved before it, such as the
+    admin check, share the same session.
+    """
+
+
+def _has_replica(request: Request) -> bool:
+    return getattr(request.app.state, "db_replica_session_factory", None) is not None
+
+
+async def _reads_from_replica(request: Request) -> bool:
+    if not _has_replica(request):
+        return False
+    route = request.scope.get("route")
+    dependencies = getattr(getattr(route, "dependant", None), "dependencies", [])
+    if not any(dep.call is use_read_replica for dep in dependencies):
+        return False
+
+    # read-your-writes: the client's last write must be visible on the replica
+    last_write = request.cookies.get(PRIMARY_LSN_COOKIE)
+    if last_write is None:
+        return True
+    try:
+        lsn = parse_lsn(last_write)
+    except ValueError:
+        return True
+    return await request.app.state.db_replica_status.has_replayed(lsn)
+
 
 async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Create and get database session.
 
+    GET, HEAD and OPTIONS requests get a read-only session, on the replica
+    for the routes marked with ``use_read_replica``; it is released without
+    a commit. Other requests commit only when the session wrote something
+    and the handler did not raise. Either way a pooled connection is only
+    checked out by the session's first query.
+
     :param request: current request.
     :yield: database session.
     """
-    session: AsyncSession = request.app.state.db_session_factory()
+    session: AsyncSession
+    if request.method in SAFE_METHODS:
+        if await _reads_from_replica(request):
+            session = request.app.state.db_replica_session_factory()
+        else:
+            session = request.app.state.db_read_session_factory()
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
 
+    session = request.app.state.db_session_factory()
     try:
         yield session
+        if has_pending_writes(session.sync_session):
+            await session.commit()
+        # DAOs may have committed on their own
+        if _has_replica(request) and has_committed_writes(session.sync_session):
+            request.state.db_primary_lsn = await current_primary_lsn(session)
     finally:
-        await session.commit()
         await session.close()
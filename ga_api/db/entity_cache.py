@@ -0,0 +1,430 @@
+"""
+Second-level cache of rarely written rows, shared by the sessions of a worker.
+
+Models marked with ``__entity_cache__ = True`` are kept as immutable
+snapshots of their columns, plus the ids of their eagerly loaded
+relationships, for ``entity_cache_ttl`` seconds and up to
+``entity_cache_max_size`` rows, least recently used first out. The
+``BatchLoader`` behind ``AbstractDAO.find_by_id`` and ``find_all_by_ids``
+rebuilds hits into the session without a query.
+
+A session never caches rows its open transaction wrote. Once it commits,
+the rows it wrote, or the whole model after a set-based ``update()`` or
+``delete()``, are dropped from this worker's cache and published on a
+Postgres channel the ``EntityCacheListener`` of every worker listens to. The
+cache only serves hits while the listener is connected, so a worker that
+could miss a notification does not serve a stale row.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from functools import lru_cache
+from logging import exception
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import (
+    Mapper,
+    ORMExecuteState,
+    Session,
+    UOWTransaction,
+    make_transient_to_detached,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ga_api.db.base import Base
+from ga_api.metrics import record_cache
+from ga_api.settings import settings
+
+# Postgres channel the written rows are published on
+CHANNEL = "ga_api_entity_cache"
+
+# Session.info key of the cached models the open transaction wrote: the ids
+# of the written rows, or None when a statement may have written any
+_WRITTEN = "ga_api_entity_cache_written"
+# Session.info key of the sessions whose reads may not be cached, such as
+# the replica's, which can be behind a published write
+NO_STORE = "ga_api_entity_cache_no_store"
+
+# ids per notification; a commit writing more publishes the whole model,
+# which keeps the payload under the 8000 bytes Postgres accepts
+_MAX_PUBLISHED_IDS = 100
+
+_EAGER = frozenset({"selectin", "joined", "immediate", "subquery"})
+
+
+class _Snapshot(NamedTuple):
+    columns: Tuple[Tuple[str, Any], ...]
+    # key, model and ids of each eagerly loaded relationship
+    related: Tuple[Tuple[str, Any, Tuple[Any, ...]], ...]
+    expires_at: float
+
+
+@lru_cache(maxsize=None)
+def _eager_relationships(mapper: Mapper[Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(
+        (relationship.key, relationship.mapper.class_)
+        for relationship in mapper.relationships
+        if relationship.lazy in _EAGER
+    )
+
+
+def is_cached(model: Any) -> bool:
+    """
+    Tells whether rows of ``model`` are cached.
+
+    The model must be marked, and so must every model it loads eagerly:
+    a snapshot can only be rebuilt from other snapshots.
+    """
+    return _is_cached(model)
+
+
+@lru_cache(maxsize=None)
+def _is_cached(model: Hashable) -> bool:
+    if not getattr(model, "__entity_cache__", False):
+        return False
+    return all(
+        target is model or is_cached(target)
+        for _, target in _eager_relationships(model.__mapper__)  # type: ignore
+    )
+
+
+@lru_cache(maxsize=None)
+def _cached_model(table: str) -> Optional[Any]:
+    for mapper in Base.registry.mappers:
+        model = mapper.class_
+        if getattr(model, "__tablename__", None) == table and is_cached(model):
+            return model
+    return None
+
+
+class EntityCache:
+    """Snapshots of the rows of the cached models, by model and id."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._active = False
+        self._snapshots: OrderedDict[Tuple[Any, Any], _Snapshot] = OrderedDict()
+        self._generation = 0
+        # notifications waiting for the listener to send them, while it runs
+        self.publishing = False
+        self.outgoing: List[str] = []
+        self.has_outgoing = asyncio.Event()
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def activate(self) -> None:
+        """Starts serving hits; the rows cached before are dropped."""
+        self.clear()
+        self._active = True
+
+    def deactivate(self) -> None:
+        """Stops serving hits and drops every row."""
+        self._active = False
+        self.clear()
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def generation(self) -> int:
+        """
+        Changes whenever rows are invalidated.
+
+        Read it before querying: rows read before a write may only be
+        stored while it is unchanged.
+        """
+        return self._generation
+
+    def get(self, session: Session, model: Any, obj_id: Any) -> Optional[Any]:
+        """
+        Rebuilds the cached row as a detached object, or returns None.
+
+        Eagerly loaded relationships are rebuilt from their own snapshots;
+        the row is a miss when one of them is not cached. Rows the session's
+        transaction wrote are never served, nor are rows of a session with
+        objects waiting to be flushed, which only a query would flush.
+        """
+        if (
+            not self.active
+            or not is_cached(model)
+            or _was_written(session, model, obj_id)
+            or session.new
+            or session.deleted
+        ):
+            return None
+        obj = self._rebuild(model, obj_id, {})
+        table = model.__tablename__
+        if obj is None:
+            self.misses += 1
+            record_cache(f"entity_{table}", hit=False)
+        else:
+            self.hits += 1
+            record_cache(f"entity_{table}", hit=True)
+        return obj
+
+    def put(self, session: Session, obj: Any, generation: int) -> None:
+        """
+        Stores ``obj`` and the objects it loads eagerly.
+
+        Skipped when rows were invalidated since ``generation`` was read,
+        or when the session's transaction wrote the row.
+        """
+        if (
+            not self.active
+            or not is_cached(type(obj))
+            or session.info.get(NO_STORE)
+            or generation != self._generation
+        ):
+            return
+        self._store(session, obj, set())
+
+    def invalidate(self, model: Any, ids: Optional[Iterable[Any]] = None) -> None:
+        """Drops the rows of ``model`` with these ids, or all of them."""
+        self._generation += 1
+        if ids is None:
+            for key in [key for key in self._snapshots if key[0] is model]:
+                del self._snapshots[key]
+            return
+        for obj_id in ids:
+            self._snapshots.pop((model, obj_id), None)
+
+    def invalidate_table(self, table: str, ids: Optional[List[str]]) -> None:
+        """Applies a notification of another worker."""
+        model = _cached_model(table)
+        if model is None:
+            return
+        if ids is not None:
+            id_type = model.__table__.c.id.type.python_type
+            self.invalidate(model, [id_type(obj_id) for obj_id in ids])
+        else:
+            self.invalidate(model)
+
+    def publish(self, model: Any, ids: Optional[Set[Any]]) -> None:
+        """Invalidates rows of ``model`` here and in the other workers."""
+        self.invalidate(model, ids)
+        if not self.publishing:
+            return
+        payload = model.__tablename__
+        if ids is not None and len(ids) <= _MAX_PUBLISHED_IDS:
+            payload += ":" + ",".join(str(obj_id) for obj_id in ids)
+        self.outgoing.append(payload)
+        self.has_outgoing.set()
+
+    def _store(self, session: Session, obj: Any, seen: Set[int]) -> None:
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        model = type(obj)
+        if _was_written(session, model, obj.id):
+            return
+
+        state = inspect(obj)
+        mapper = state.mapper
+        values = state.dict
+        if any(column.key not in values for column in mapper.column_attrs):
+            return
+        related = []
+        for key, target in _eager_relationships(mapper):
+            if key not in values:
+                return
+            for other in values[key]:
+                self._store(session, other, seen)
+            related.append((key, target, tuple(other.id for other in values[key])))
+
+        self._snapshots[(model, obj.id)] = _Snapshot(
+            columns=tuple(
+                (column.key, values[column.key]) for column in mapper.column_attrs
+            ),
+            related=tuple(related),
+            expires_at=self._clock() + settings.entity_cache_ttl,
+        )
+        self._snapshots.move_to_end((model, obj.id))
+        while len(self._snapshots) > settings.entity_cache_max_size:
+            self._snapshots.popitem(last=False)
+
+    def _rebuild(self, model: Any, obj_id: Any, built: Dict[Any, Any]) -> Optional[Any]:
+        if (model, obj_id) in built:
+            return built[(model, obj_id)]
+        snapshot = self._snapshots.get((model, obj_id))
+        if snapshot is None:
+            return None
+        if snapshot.expires_at <= self._clock():
+            del self._snapshots[(model, obj_id)]
+            return None
+        self._snapshots.move_to_end((model, obj_id))
+
+        obj = model.__mapper__.class_manager.new_instance()
+        built[(model, obj_id)] = obj
+        for key, value in snapshot.columns:
+            set_committed_value(obj, key, value)
+        for key, target, ids in snapshot.related:
+            related = [self._rebuild(target, other_id, built) for other_id in ids]
+            if any(other is None for other in related):
+                return None
+            set_committed_value(obj, key, related)
+        make_transient_to_detached(obj)
+        return obj
+
+
+entity_cache = EntityCache()
+
+
+def _was_written(session: Session, model: Any, obj_id: Any) -> bool:
+    written = session.info.get(_WRITTEN, {})
+    return model in written and (written[model] is None or obj_id in written[model])
+
+
+def _written(session: Session) -> Dict[Any, Optional[Set[Any]]]:
+    return session.info.setdefault(_WRITTEN, {})  # type: ignore[no-any-return]
+
+
+def track_written_rows(session: Session, model: Any, ids: Iterable[Any]) -> None:
+    """
+    Records rows of ``model`` written outside the ORM, e.g. with ``COPY``,
+    as a flush of them would: they are not served from the cache in this
+    transaction and are invalidated on commit.
+    """
+    written = _written(session)
+    if is_cached(model) and written.get(model, set()) is not None:
+        written.setdefault(model, set()).update(ids)  # type: ignore[union-attr]
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_rows(session: Session, flush_context: UOWTransaction) -> None:
+    written = _written(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        model = type(obj)
+        if is_cached(model) and written.get(model, set()) is not None:
+            written.setdefault(model, set()).add(obj.id)  # type: ignore[union-attr]
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed_writes(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and is_cached(mapper.class_):
+        _written(orm_execute_state.session)[mapper.class_] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_written_rows(session: Session) -> None:
+    for model, ids in session.info.pop(_WRITTEN, {}).items():
+        entity_cache.publish(model, ids)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_written_rows(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WRITTEN, None)
+
+
+class EntityCacheListener:
+    """
+    Keeps this worker's entity cache in step with the other workers.
+
+    Holds a connection that listens on the cache's channel and sends the
+    notifications of the rows this worker wrote. The cache serves hits only
+    while the connection is up; it starts empty on every reconnection, as
+    notifications may have been missed in between.
+    """
+
+    def __init__(self, engine: AsyncEngine, cache: EntityCache = entity_cache) -> None:
+        self._engine = engine
+        self._cache = cache
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.connected = asyncio.Event()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._cache.publishing = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        self._cache.has_outgoing.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        self._cache.publishing = False
+        self._cache.outgoing.clear()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                async with self._engine.connect() as connection:
+                    raw = await connection.get_raw_connection()
+                    await self._listen(raw.driver_connection)
+            except Exception:
+                exception("Entity cache listener failed")
+            finally:
+                self.connected.clear()
+                self._cache.deactivate()
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._stopping.wait(),
+                    timeout=settings.entity_cache_reconnect_interval,
+                )
+
+    async def _listen(self, driver: Any) -> None:
+        pid = driver.get_server_pid()
+
+        def notified(_: Any, sender: int, channel: str, payload: str) -> None:
+            if sender == pid:
+                return
+            table, _, ids = payload.partition(":")
+            self._cache.invalidate_table(table, ids.split(",") if ids else None)
+
+        await driver.add_listener(CHANNEL, notified)
+        self._cache.activate()
+        self.connected.set()
+        try:
+            while not self._stopping.is_set():
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._cache.has_outgoing.wait(),
+                        timeout=settings.entity_cache_reconnect_interval,
+                    )
+                self._cache.has_outgoing.clear()
+                outgoing, self._cache.outgoing = self._cache.outgoing, []
+                if outgoing:
+                    await driver.executemany(
+                        "SELECT pg_notify($1, $2)",
+                        [(CHANNEL, payload) for payload in outgoing],
+                    )
+                else:
+                    # tells a dead connection apart from an idle one
+                    await driver.execute("SELECT 1")
+        finally:
+            with suppress(Exception):
+                await driver.remove_listener(CHANNEL, notified)
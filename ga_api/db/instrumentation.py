@@ -0,0 +1,84 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ga_api.metrics import record_cache
+
+
+class QueryStats:
+    """Statements a request executed and the time it spent in them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.duration += seconds
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> Optional[str]:
+        if not self.statements:
+            return None
+        return self.statements.most_common(1)[0][0]
+
+
+# Stats of the request being served; None outside requests, e.g. in jobs
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats",
+    default=None,
+)
+
+
+def _before_cursor_execute(conn: Connection, *args: Any) -> None:
+    if query_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit in {CACHE_HIT, CACHE_MISS}:
+        record_cache("compiled_sql", cache_hit == CACHE_HIT)
+
+    stats = query_stats.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(context: Any) -> None:
+    if context.connection is None:
+        return
+    started = context.connection.info.get("query_started")
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Adds the statements the engine executes to the current request's stats.
+
+    Lookups of SQLAlchemy's compiled statement cache are counted as well.
+
+    Calling it again for the same engine does nothing.
+    """
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,94 @@
+from contextlib import suppress
+from logging import warning
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Keys of the advisory locks used to elect a single worker for background jobs.
+EMAIL_OUTBOX_LOCK_KEY = 7_264_001
+APPOINTMENT_REMINDER_LOCK_KEY = 7_264_003
+RETENTION_LOCK_KEY = 7_264_006
+
+
+class AdvisoryLockLeader:
+    """
+    Leader election backed by a Postgres session-level advisory lock.
+
+    The lock belongs to the connection that took it, so the connection is kept
+    checked out while this worker is the leader. If the worker dies the
+    connection is closed, Postgres releases the lock and another worker
+    takes over on its next attempt.
+    """
+
+    def __init__(self, engine: AsyncEngine, lock_key: int) -> None:
+        self._engine = engine
+        self._lock_key = lock_key
+        self._connection: Optional[AsyncConnection] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    async def try_acquire(self) -> bool:
+        """
+        Becomes the leader if no other worker holds the lock.
+
+        Calling it while already leading checks that the connection holding
+        the lock is still alive.
+
+        :return: whether this worker is the leader.
+        """
+        if self._connection is not None:
+            if await self._still_alive(self._connection):
+                return True
+            await self._discard_connection()
+
+        connection = await self._engine.connect()
+        try:
+            result = await connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": self._lock_key},
+            )
+            acquired = bool(result.scalar())
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+
+        if not acquired:
+            await connection.close()
+            return False
+
+        self._connection = connection
+        return True
+
+    async def release(self) -> None:
+        """Gives up leadership, if held."""
+        if self._connection is None:
+            return
+        try:
+            await self._connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"),
+                {"key": self._lock_key},
+            )
+            await self._connection.commit()
+        except DBAPIError as e:
+            warning("Failed to release advisory lock %s: %s", self._lock_key, e)
+        await self._discard_connection()
+
+    async def _still_alive(self, connection: AsyncConnection) -> bool:
+        try:
+            await connection.execute(text("SELECT 1"))
+            await connection.commit()
+        except DBAPIError:
+            warning("Lost connection holding advisory lock %s", self._lock_key)
+            return False
+        return True
+
+    async def _discard_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            with suppress(DBAPIError):
+                await connection.close()
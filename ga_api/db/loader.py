@@ -0,0 +1,146 @@
+"""
+Batched lookups by id, scoped to a session.
+
+``AbstractDAO.find_by_id`` goes through the ``BatchLoader`` of its session
+and model: the ids asked for by coroutines running in the same turn of the
+event loop, e.g. under ``asyncio.gather``, are loaded with one
+``WHERE id = ANY(:ids)`` statement. Objects already in the session's
+identity map are returned without a query, so a request looks each row up
+once however many services ask for it. Rows of the models kept in the
+entity cache are looked up there before querying, see
+``ga_api.db.entity_cache``.
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from sqlalchemy import Select, any_, bindparam, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper
+
+from ga_api.db.entity_cache import entity_cache
+
+T = TypeVar("T")
+
+# Session.info key of the session's loaders, by model
+_LOADERS = "ga_api_loaders"
+
+
+@lru_cache(maxsize=None)
+def _find_by_ids_statement(model: Any) -> Select[Any]:
+    ids = bindparam("ids", type_=ARRAY(model.__table__.c.id.type))
+    return select(model).where(model.id == any_(ids))
+
+
+class BatchLoader(Generic[T]):
+    """Loads the objects of one model by id, in batches."""
+
+    def __init__(self, session: AsyncSession, model: Type[T]) -> None:
+        self._session = session
+        self._model = model
+        self._mapper: Mapper[Any] = model.__mapper__  # type: ignore[attr-defined]
+        self._columns = frozenset(self._mapper.column_attrs.keys())
+        self._pending: Dict[Any, asyncio.Future[Optional[T]]] = {}
+
+    async def load(self, obj_id: Any) -> Optional[T]:
+        """Returns the object with this id, or None if there is none."""
+        return (await self.load_many([obj_id]))[0]
+
+    async def load_many(self, ids: Iterable[Any]) -> List[Optional[T]]:
+        """Returns the object of each id, None for the missing ones."""
+        leads = not self._pending
+        futures = [self._future(obj_id) for obj_id in ids]
+        if leads and self._pending:
+            await self._dispatch()
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def _future(self, obj_id: Any) -> "asyncio.Future[Optional[T]]":
+        future: asyncio.Future[Optional[T]]
+        cached = self._in_session(obj_id)
+        if cached is not None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(cached)
+            return future
+
+        if obj_id not in self._pending:
+            self._pending[obj_id] = asyncio.get_running_loop().create_future()
+        return self._pending[obj_id]
+
+    def _in_session(self, obj_id: Any) -> Optional[T]:
+        sync_session = self._session.sync_session
+        key = self._mapper.identity_key_from_primary_key((obj_id,))
+        obj = sync_session.identity_map.get(key)
+        if obj is None:
+            return None
+        state = inspect(obj)
+        # a query refreshes expired columns and flushes pending deletes
+        if state.expired_attributes & self._columns or obj in sync_session.deleted:
+            return None
+        return obj  # type: ignore[no-any-return]
+
+    async def _dispatch(self) -> None:
+        """
+        Loads the pending ids, from the coroutine that asked for the first.
+
+        Running the query in that coroutine rather than in a task of its own
+        keeps the calling DAO method on the stack, for the slow query log.
+        """
+        pending = self._pending
+        try:
+            # lets the coroutines scheduled with this one add their ids
+            await asyncio.sleep(0)
+            self._pending = {}
+            found = await self._from_cache(pending)
+            missing = [obj_id for obj_id in pending if obj_id not in found]
+            if missing:
+                found.update(await self._query(missing))
+        except Exception as e:
+            for future in pending.values():
+                future.set_exception(e)
+            return
+        except BaseException:
+            if self._pending is pending:
+                self._pending = {}
+            for future in pending.values():
+                future.cancel()
+            raise
+
+        for obj_id, future in pending.items():
+            future.set_result(found.get(obj_id))
+
+    async def _from_cache(self, ids: Iterable[Any]) -> Dict[Any, T]:
+        sync_session = self._session.sync_session
+        cached = {}
+        for obj_id in ids:
+            obj = entity_cache.get(sync_session, self._model, obj_id)
+            if obj is not None:
+                cached[obj_id] = obj
+        if not cached:
+            return cached
+        return await self._session.run_sync(  # type: ignore[no-any-return]
+            lambda session: {
+                obj_id: session.merge(obj, load=False) for obj_id, obj in cached.items()
+            },
+        )
+
+    async def _query(self, ids: List[Any]) -> Dict[Any, T]:
+        generation = entity_cache.generation
+        result = await self._session.execute(
+            _find_by_ids_statement(self._model),  # type: ignore[arg-type]
+            {"ids": ids},
+        )
+        found = {}
+        for obj in result.scalars():
+            entity_cache.put(self._session.sync_session, obj, generation)
+            found[obj.id] = obj  # type: ignore[attr-defined]
+        return found
+
+
+def loader_for(session: AsyncSession, model: Type[T]) -> BatchLoader[T]:
+    """Returns the loader of ``model`` belonging to ``session``."""
+    loaders: Dict[Any, BatchLoader[Any]] = session.info.setdefault(_LOADERS, {})
+    if model not in loaders:
+        loaders[model] = BatchLoader(session, model)
+    return loaders[model]
@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, UUID, ForeignKeyConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ga_api.db.base import Base
+
+
+class AppointmentReminder(Base):
+    """Marks an appointment whose reminder email was already sent."""
+
+    __tablename__ = "appointment_reminders"
+    # availabilities are partitioned, so they are referenced by their whole
+    # primary key
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["availability_id", "availability_start_time"],
+            ["availabilities.id", "availabilities.start_time"],
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+        ),
+    )
+
+    availability_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+    )
+    availability_start_time: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+    )
+    sent_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
@@ -0,0 +1,71 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DDL, TIMESTAMP, UUID, Index, event, func
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ga_api.db.base import Base
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.sql_scripts import SqlScripts
+from ga_api.enums.availability_status import AvailabilityStatus
+
+# every availability, the ones still in ``availabilities`` and the archived ones
+AVAILABILITY_RECORDS_VIEW = "availability_records"
+
+
+class AvailabilityHistory(Base):
+    """
+    A past availability moved out of ``availabilities`` by the retention job.
+
+    Same columns as ``Availability`` plus the time it was archived. Rows are
+    only ever inserted, so the table keeps no foreign keys to check on the
+    way in. Patient histories read both tables through the
+    ``availability_records`` view.
+    """
+
+    __tablename__ = "availabilities_history"
+    __table_args__ = (
+        Index(
+            "ix_availabilities_history_patient_id_start_time",
+            "patient_id",
+            "start_time",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    start_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    end_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    status: Mapped[AvailabilityStatus] = mapped_column(
+        SQLAlchemyEnum(AvailabilityStatus),
+    )
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    professional_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
+    patient_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True))
+    created_by_admin_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+    )
+    updated_by_admin_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
+
+
+CREATE_AVAILABILITY_RECORDS_VIEW = SqlScripts.create_union_view(
+    AVAILABILITY_RECORDS_VIEW,
+    [Availability.__tablename__, AvailabilityHistory.__tablename__],
+    [column.name for column in Availability.__table__.columns],
+)
+
+# once both tables exist; replaced whenever the schema is created again
+event.listen(Base.metadata, "after_create", DDL(CREATE_AVAILABILITY_RECORDS_VIEW))
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL(f"DROP VIEW IF EXISTS {AVAILABILITY_RECORDS_VIEW}"),
+)
@@ -2,11 +2,12 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import TIMESTAMP, UUID, ForeignKey, func
+from sqlalchemy import DDL, TIMESTAMP, UUID, ForeignKey, Index, event, func
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ga_api.db.base import Base
+from ga_api.db.sql_scripts import SqlScripts
 from ga_api.enums.availability_status import AvailabilityStatus
 
 if TYPE_CHECKING:
@@ -15,7 +16,27 @@ if TYPE_CHECKING:
 
 
 class Availability(Base):
+    """
+    A slot offered by a professional, taken when a patient books it.
+
+    The table is range-partitioned by ``start_time``, one partition per month
+    (see ``ga_api.db.partitioning``). Its primary key has to include the
+    partition key, so it is ``(id, start_time)``; rows are still identified
+    by ``id`` alone in the ORM. Queries bounded on ``start_time`` only read
+    the partitions of the months they cover.
+    """
+
     __tablename__ = "availabilities"
+    __table_args__ = (
+        Index("ix_availabilities_status_start_time", "status", "start_time"),
+        # slots of a professional, read one partition after the other
+        Index(
+            "ix_availabilities_professional_id_start_time",
+            "professional_id",
+            "start_time",
+        ),
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -23,7 +44,10 @@ class Availability(Base):
         default=uuid.uuid4,
     )
 
-    start_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    start_time: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        primary_key=True,
+    )
     end_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
     status: Mapped[AvailabilityStatus] = mapped_column(
         SQLAlchemyEnum(AvailabilityStatus),
@@ -53,3 +77,13 @@ class Availability(Base):
     )
 
     patient: Mapped[Optional["User"]] = relationship("User", foreign_keys=[patient_id])
+
+    __mapper_args__ = {"primary_key": [id]}  # noqa: RUF012
+
+
+# rows outside of the monthly partitions land here until their month exists
+event.listen(
+    Availability.__table__,
+    "after_create",
+    DDL(SqlScripts.create_default_partition("availabilities")),
+)
@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, UUID, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ga_api.db.base import Base
+
+
+class BlockHistory(Base):
+    """
+    An expired block moved out of ``blocks`` by the retention job.
+
+    Same columns as ``Block`` plus the time it was archived, without foreign
+    keys.
+    """
+
+    __tablename__ = "blocks_history"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    start_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    end_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    reason: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    professional_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
+    created_by_admin_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
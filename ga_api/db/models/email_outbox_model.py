@@ -0,0 +1,52 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import TIMESTAMP, UUID, Index, Integer, String, Text, func
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ga_api.db.base import Base
+from ga_api.enums.email_kind import EmailKind
+from ga_api.enums.email_status import EmailStatus
+
+
+class EmailOutbox(Base):
+    """
+    Email waiting to be delivered by the outbox dispatcher.
+
+    Rows are written in the same transaction as the business change that
+    triggers the email, so a rolled back transaction never sends anything.
+    The payload is cleared once the message is delivered. It never holds
+    secrets such as passwords, those are created when the email is sent.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    kind: Mapped[EmailKind] = mapped_column(SQLAlchemyEnum(EmailKind))
+    recipient: Mapped[str] = mapped_column(String(320))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+    status: Mapped[EmailStatus] = mapped_column(
+        SQLAlchemyEnum(EmailStatus),
+        default=EmailStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
@@ -33,6 +33,8 @@ professionals_specialities = Table(
 
 class Professional(Base):
     __tablename__ = "professionals"
+    # rarely written, read by most requests
+    __entity_cache__ = True
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Identity, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ga_api.db.base import Base
+
+
+class RateLimitHit(Base):
+    """
+    One accepted call counted by a sliding window rate limit.
+
+    Shared by all workers when the Postgres rate limit backend is enabled.
+    Hits older than their window are deleted as new ones arrive.
+    """
+
+    __tablename__ = "rate_limit_hits"
+    __table_args__ = (Index("ix_rate_limit_hits_key_hit_at", "key", "hit_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    key: Mapped[str] = mapped_column(String(400))
+    hit_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 class Speciality(Base):
     __tablename__ = "specialities"
+    # rarely written, read by most requests
+    __entity_cache__ = True
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
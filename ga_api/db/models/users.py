@@ -11,7 +11,7 @@ from fastapi_users.authentication import (
 )
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID, SQLAlchemyUserDatabase
 from fastapi_users.exceptions import UserAlreadyExists
-from sqlalchemy import TIMESTAMP, Boolean, Date, String, func
+from sqlalchemy import DDL, TIMESTAMP, Boolean, Date, Index, String, event, func, text
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -21,6 +21,7 @@ from starlette.requests import Request
 
 from ga_api.db.base import Base
 from ga_api.db.dependencies import get_db_session
+from ga_api.db.sql_scripts import SqlScripts
 from ga_api.db.utils import create_generic_integrity_error_message
 from ga_api.enums.consultation_frequency import ConsultationFrequency
 from ga_api.enums.user_role import UserRole
@@ -30,6 +31,29 @@ from ga_api.settings import settings
 class User(SQLAlchemyBaseUserTableUUID, Base):
 
     __tablename__ = "users"
+    # Partial indexes backing the admin patient listing: keyset pagination
+    # on (full_name, id) and prefix search on email and CPF. Name search
+    # uses a trigram index created after the table (see below).
+    __table_args__ = (
+        Index(
+            "ix_users_patients_full_name_id",
+            "full_name",
+            "id",
+            postgresql_where=text("NOT is_superuser"),
+        ),
+        Index(
+            "ix_users_patients_email_prefix",
+            func.lower(text("email")).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+            postgresql_where=text("NOT is_superuser"),
+        ),
+        Index(
+            "ix_users_patients_cpf_prefix",
+            "cpf",
+            postgresql_ops={"cpf": "text_pattern_ops"},
+            postgresql_where=text("NOT is_superuser"),
+        ),
+    )
     cpf: Mapped[str] = mapped_column(String(14), nullable=False, unique=True)
     birth_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
@@ -66,6 +90,13 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     )
 
 
+event.listen(
+    User.__table__,
+    "after_create",
+    DDL(SqlScripts.create_patient_name_trigram_index()),
+)
+
+
 class UserRead(schemas.BaseUser[uuid.UUID]):
     birth_date: Optional[date] = None
     phone: Optional[str] = None
@@ -0,0 +1,459 @@
+"""
+Monthly range partitions of ``availabilities``.
+
+The table is partitioned by ``start_time``, one partition per calendar month
+in UTC, plus a default partition holding the rows of months without one.
+``ensure_partitions`` creates the partitions of the coming months ahead of
+time; the rows of such a month already in the default partition are moved
+into it before it is attached.
+
+Databases created before the partitioning have a plain ``availabilities``
+table. ``python -m ga_api.db.partitioning`` migrates it while the
+application keeps running: a trigger mirrors the writes to the plain table
+into a partitioned copy, the existing rows are copied in batches, and both
+tables swap names in one short transaction at the end.
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timezone
+from logging import info, warning
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from ga_api.db.models.availability_history_model import (
+    AVAILABILITY_RECORDS_VIEW,
+    CREATE_AVAILABILITY_RECORDS_VIEW,
+)
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.pool import create_pooled_engine
+from ga_api.db.sql_scripts import SqlScripts
+from ga_api.settings import settings
+
+PARTITIONED_TABLE = "availabilities"
+PARTITION_KEY = "start_time"
+# Advisory lock serializing the creation of partitions
+PARTITION_MAINTENANCE_LOCK_KEY = 7_264_005
+# Names used while migrating a plain table
+MIGRATION_TABLE = "availabilities_partitioned"
+UNPARTITIONED_TABLE = "availabilities_unpartitioned"
+MIGRATION_TRIGGER = "availabilities_mirror_to_partitioned"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def partition_name(month: date, table: str = PARTITIONED_TABLE) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def is_partitioned(connection: AsyncConnection, table: str) -> bool:
+    result = await connection.execute(
+        text(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)",
+        ),
+        {"table": table},
+    )
+    return bool(result.scalar())
+
+
+async def _create_partition(
+    connection: AsyncConnection,
+    table: str,
+    month: date,
+) -> None:
+    """
+    Creates the partition of ``month``, moving its rows out of the default.
+
+    The partition is filled as a standalone table and attached afterwards,
+    which only checks the default partition, instead of the long lock a
+    ``PARTITION OF`` creation would take on it while rows are moved.
+    """
+    name = partition_name(month, table)
+    start, end = month, next_month(month)
+    await connection.execute(
+        text(
+            f"CREATE TABLE {name} "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        ),
+    )
+    await connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table}_default "  # noqa: S608
+            f"WHERE {PARTITION_KEY} >= :start AND {PARTITION_KEY} < :end "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved",
+        ),
+        {
+            "start": datetime.combine(start, datetime.min.time(), timezone.utc),
+            "end": datetime.combine(end, datetime.min.time(), timezone.utc),
+        },
+    )
+    # lets the attach skip scanning the new partition
+    await connection.execute(
+        text(
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_range CHECK "
+            f"({PARTITION_KEY} >= {_bound(start)} AND {PARTITION_KEY} < {_bound(end)})",
+        ),
+    )
+    await connection.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})",
+        ),
+    )
+    await connection.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_range"))
+
+
+async def ensure_partitions(
+    connection: AsyncConnection,
+    first: date,
+    last: date,
+    table: str = PARTITIONED_TABLE,
+) -> List[str]:
+    """
+    Creates the missing partitions of the months from ``first`` to ``last``.
+
+    Runs in the transaction of ``connection``, serialized with the other
+    workers by an advisory lock.
+
+    :return: names of the partitions created.
+    """
+    await connection.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"),
+        {"key": PARTITION_MAINTENANCE_LOCK_KEY},
+    )
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)",
+        ),
+        {"table": table},
+    )
+    existing = set(result.scalars())
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month, table)
+        if name not in existing:
+            await _create_partition(connection, table, month)
+            created.append(name)
+        month = next_month(month)
+    if created:
+        info("Created partitions %s", ", ".join(created))
+    return created
+
+
+async def ensure_future_partitions(
+    connection: AsyncConnection,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Creates the partitions of this month and the next
+    ``availability_partition_months_ahead`` ones.
+    """
+    month = month_start(today or datetime.now(timezone.utc).date())
+    last = month
+    for _ in range(settings.availability_partition_months_ahead):
+        last = next_month(last)
+    return await ensure_partitions(connection, month, last)
+
+
+async def _install_mirror(connection: AsyncConnection) -> None:
+    """Copies every write to the plain table into the partitioned one."""
+    await connection.execute(
+        text(SqlScripts.create_mirror_function(MIGRATION_TRIGGER, MIGRATION_TABLE)),
+    )
+    await connection.execute(
+        text(
+            f"CREATE OR REPLACE TRIGGER {MIGRATION_TRIGGER} "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {PARTITIONED_TABLE} "
+            f"FOR EACH ROW EXECUTE FUNCTION {MIGRATION_TRIGGER}()",
+        ),
+    )
+
+
+async def _create_partitioned_copy(connection: AsyncConnection) -> None:
+    """
+    Creates the partitioned table, its indexes and the partitions of the
+    months of the existing rows.
+
+    Constraints and indexes get their final names when the tables swap.
+    """
+    await connection.execute(
+        text(
+            f"CREATE TABLE {MIGRATION_TABLE} "
+            f"(LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({PARTITION_KEY})",
+        ),
+    )
+    await connection.execute(
+        text(
+            f"CREATE TABLE {MIGRATION_TABLE}_default "
+            f"PARTITION OF {MIGRATION_TABLE} DEFAULT",
+        ),
+    )
+    result = await connection.execute(
+        text(
+            f"SELECT min({PARTITION_KEY}), max({PARTITION_KEY}) "  # noqa: S608
+            f"FROM {PARTITIONED_TABLE}",
+        ),
+    )
+    first, last = result.one()
+    today = datetime.now(timezone.utc).date()
+    first = min(first.date(), today) if first else today
+    last = max(last.date(), today) if last else today
+    for _ in range(settings.availability_partition_months_ahead):
+        last = next_month(last)
+    await ensure_partitions(connection, first, last, MIGRATION_TABLE)
+    await connection.execute(
+        text(
+            f"ALTER TABLE {MIGRATION_TABLE} ADD CONSTRAINT "
+            f"{MIGRATION_TABLE}_pkey PRIMARY KEY (id, {PARTITION_KEY})",
+        ),
+    )
+    result = await connection.execute(
+        text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype = 'f'",
+        ),
+        {"table": PARTITIONED_TABLE},
+    )
+    for name, definition in result.all():
+        await connection.execute(
+            text(
+                f"ALTER TABLE {MIGRATION_TABLE} "
+                f"ADD CONSTRAINT {name}_new {definition}",
+            ),
+        )
+    result = await connection.execute(
+        text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexname <> :pkey",
+        ),
+        {"table": PARTITIONED_TABLE, "pkey": f"{PARTITIONED_TABLE}_pkey"},
+    )
+    for name, definition in result.all():
+        renamed = definition.replace(f"INDEX {name} ", f"INDEX {name}_new ", 1)
+        renamed = renamed.replace(
+            f"ON public.{PARTITIONED_TABLE} ",
+            f"ON public.{MIGRATION_TABLE} ",
+            1,
+        )
+        await connection.execute(text(renamed))
+    # indexes the model gained since the plain table was created
+    result = await connection.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+        {"table": PARTITIONED_TABLE},
+    )
+    existing = set(result.scalars())
+    for index in Availability.metadata.tables[PARTITIONED_TABLE].indexes:
+        if index.name not in existing:
+            columns = ", ".join(column.name for column in index.columns)
+            await connection.execute(
+                text(f"CREATE INDEX {index.name} ON {MIGRATION_TABLE} ({columns})"),
+            )
+
+
+async def _copy_batch(
+    connection: AsyncConnection,
+    after: Optional[str],
+    batch_size: int,
+) -> Optional[str]:
+    """
+    Copies the next ``batch_size`` rows by id and returns the last id.
+
+    The rows are locked while copied, so a concurrent update either
+    commits first and is copied, or waits and is mirrored afterwards.
+    Rows the trigger already mirrored are kept.
+    """
+    result = await connection.execute(
+        text(
+            f"WITH batch AS (SELECT * FROM {PARTITIONED_TABLE} "  # noqa: S608
+            "  WHERE (CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid)) "
+            "  ORDER BY id LIMIT :limit FOR SHARE), "
+            f"copied AS (INSERT INTO {MIGRATION_TABLE} SELECT * FROM batch "
+            f"  ON CONFLICT (id, {PARTITION_KEY}) DO NOTHING) "
+            "SELECT max(id::text) FROM batch",
+        ),
+        {"after": after, "limit": batch_size},
+    )
+    return result.scalar()
+
+
+async def _swap(connection: AsyncConnection) -> None:
+    """Puts the partitioned table in place of the plain one."""
+    await connection.execute(
+        text(
+            f"LOCK TABLE {PARTITIONED_TABLE}, appointment_reminders "
+            "IN ACCESS EXCLUSIVE MODE",
+        ),
+    )
+    await connection.execute(
+        text(f"DROP TRIGGER {MIGRATION_TRIGGER} ON {PARTITIONED_TABLE}"),
+    )
+    await connection.execute(text(f"DROP FUNCTION {MIGRATION_TRIGGER}()"))
+
+    # appointment reminders reference the whole primary key from now on
+    await connection.execute(
+        text(
+            "ALTER TABLE appointment_reminders "
+            "ADD COLUMN IF NOT EXISTS availability_start_time timestamptz",
+        ),
+    )
+    await connection.execute(
+        text(
+            "UPDATE appointment_reminders AS r SET availability_start_time = "  # noqa: S608
+            f"a.{PARTITION_KEY} FROM {MIGRATION_TABLE} AS a "
+            "WHERE a.id = r.availability_id",
+        ),
+    )
+    await connection.execute(
+        text(
+            "ALTER TABLE appointment_reminders ALTER COLUMN availability_start_time "
+            "SET NOT NULL",
+        ),
+    )
+    await connection.execute(
+        text(
+            "ALTER TABLE appointment_reminders DROP CONSTRAINT IF EXISTS "
+            "appointment_reminders_availability_id_fkey",
+        ),
+    )
+
+    rename = [
+        f"ALTER TABLE {PARTITIONED_TABLE} RENAME TO {UNPARTITIONED_TABLE}",
+        f"ALTER TABLE {MIGRATION_TABLE} RENAME TO {PARTITIONED_TABLE}",
+        f"ALTER TABLE {MIGRATION_TABLE}_default RENAME TO {PARTITIONED_TABLE}_default",
+    ]
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table) "
+            "AND child.relname <> :default",
+        ),
+        {"table": MIGRATION_TABLE, "default": f"{MIGRATION_TABLE}_default"},
+    )
+    rename += [
+        f"ALTER TABLE {name} RENAME TO "
+        f"{PARTITIONED_TABLE}{name.removeprefix(MIGRATION_TABLE)}"
+        for name in result.scalars()
+    ]
+    result = await connection.execute(
+        text(
+            "SELECT conname, contype::text FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype IN ('p', 'f')",
+        ),
+        {"table": PARTITIONED_TABLE},
+    )
+    for name, kind in result.all():
+        old = f"{UNPARTITIONED_TABLE}_pkey" if kind == "p" else f"{name}_old"
+        rename.append(
+            f"ALTER TABLE {UNPARTITIONED_TABLE} RENAME CONSTRAINT {name} TO {old}",
+        )
+        new = f"{MIGRATION_TABLE}_pkey" if kind == "p" else f"{name}_new"
+        rename.append(
+            f"ALTER TABLE {PARTITIONED_TABLE} RENAME CONSTRAINT {new} TO {name}",
+        )
+    result = await connection.execute(
+        text(
+            "SELECT indexname FROM pg_indexes "
+            "WHERE tablename = :table AND indexname <> :pkey",
+        ),
+        {"table": PARTITIONED_TABLE, "pkey": f"{PARTITIONED_TABLE}_pkey"},
+    )
+    for name in result.scalars():
+        rename.append(f"ALTER INDEX {name} RENAME TO {name}_old")
+        rename.append(f"ALTER INDEX {name}_new RENAME TO {name}")
+    for statement in rename:
+        await connection.execute(text(statement))
+
+    await connection.execute(
+        text(
+            "ALTER TABLE appointment_reminders ADD CONSTRAINT "
+            "appointment_reminders_availability_id_availability_start_time_fkey "
+            "FOREIGN KEY (availability_id, availability_start_time) "
+            f"REFERENCES {PARTITIONED_TABLE} (id, {PARTITION_KEY}) "
+            "ON UPDATE CASCADE ON DELETE CASCADE",
+        ),
+    )
+    # the view followed the plain table through its rename
+    view = await connection.execute(
+        text("SELECT to_regclass(:view)"),
+        {"view": AVAILABILITY_RECORDS_VIEW},
+    )
+    if view.scalar() is not None:
+        await connection.execute(text(CREATE_AVAILABILITY_RECORDS_VIEW))
+
+
+async def migrate_to_partitioned(engine: AsyncEngine, batch_size: int) -> bool:
+    """
+    Replaces a plain ``availabilities`` table with a partitioned one.
+
+    Can be stopped and started again: the copy resumes from scratch, keeping
+    the rows already copied. The plain table is kept as
+    ``availabilities_unpartitioned`` for the operator to drop.
+
+    :return: whether there was a table to migrate.
+    """
+    async with engine.begin() as connection:
+        if await is_partitioned(connection, PARTITIONED_TABLE):
+            return False
+        copy = await connection.execute(
+            text("SELECT to_regclass(:table)"),
+            {"table": MIGRATION_TABLE},
+        )
+        if copy.scalar() is None:
+            await _create_partitioned_copy(connection)
+            await _install_mirror(connection)
+
+    copied = 0
+    after: Optional[str] = None
+    while True:
+        async with engine.begin() as connection:
+            after = await _copy_batch(connection, after, batch_size)
+        if after is None:
+            break
+        copied += batch_size
+        info("Copied about %s availabilities", copied)
+
+    async with engine.begin() as connection:
+        await connection.execute(text("SET LOCAL lock_timeout = '10s'"))
+        await _swap(connection)
+    async with engine.connect() as connection:
+        await connection.execute(text(f"ANALYZE {PARTITIONED_TABLE}"))
+    return True
+
+
+async def main_async(batch_size: int) -> None:
+    engine = create_pooled_engine(settings.db_direct_url)
+    try:
+        if not await migrate_to_partitioned(engine, batch_size):
+            warning("%s is already partitioned", PARTITIONED_TABLE)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition the availabilities table")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from logging import warning
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+from ga_api.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_WAIT
+from ga_api.settings import settings
+
+
+class PoolWaitStats:
+    """Time checkouts of one pool spent getting a connection."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.slow_checkouts = 0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        if seconds >= settings.db_pool_slow_checkout:
+            self.slow_checkouts += 1
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool measuring how long each checkout waits for a connection.
+
+    The time covers waiting for a free slot and opening a new connection.
+    Checkouts slower than ``db_pool_slow_checkout`` are logged, as they mean
+    requests are queuing for the pool. Waits and usage are also exported as
+    metrics, labeled with the engine's ``pool_logging_name``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self.metrics_name = self.logging_name or "default"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_stats.record(waited)
+            DB_POOL_WAIT.labels(self.metrics_name).observe(waited)
+            self._update_usage()
+            if waited >= settings.db_pool_slow_checkout:
+                warning(
+                    "Waited %.3fs for a database connection "
+                    "(%d of %d checked out, %d overflow)",
+                    waited,
+                    self.checkedout(),
+                    self.size(),
+                    max(self.overflow(), 0),
+                )
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._update_usage()
+
+    def _update_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.metrics_name).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.metrics_name).set(max(self.overflow(), 0))
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Opens pool connections up front, so first requests do not pay for it.
+
+    :param connections: connections to open, capped at the pool size.
+    :return: number of connections opened.
+    """
+    size = engine.pool.size() if isinstance(engine.pool, AsyncAdaptedQueuePool) else 1
+    connections = min(connections, size)
+    async with AsyncExitStack() as stack:
+        # held together, so each checkout opens a connection of its own
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+        )
+    return connections
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def pgbouncer_connect_args() -> Dict[str, Any]:
+    """
+    asyncpg arguments for connections made through PgBouncer transaction pooling.
+
+    PgBouncer hands the server connection to another client after each
+    transaction, so the statement caches of asyncpg and of SQLAlchemy are
+    disabled: a cached statement may not exist on the next server connection.
+    Statements are still prepared for each execution, and unique names keep
+    two clients sharing a server connection from colliding.
+    """
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": _unique_statement_name,
+    }
+
+
+def engine_options() -> Dict[str, Any]:
+    """Arguments of ``create_async_engine`` configuring the pool from the settings."""
+    options: Dict[str, Any] = {
+        "echo": settings.db_echo,
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_pool_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.db_pgbouncer:
+        options["connect_args"] = pgbouncer_connect_args()
+    return options
+
+
+def create_pooled_engine(url: Any, **kwargs: Any) -> AsyncEngine:
+    """
+    Creates an engine with the configured pool.
+
+    :param url: database URL.
+    :param kwargs: overrides of ``engine_options``.
+    """
+    return create_async_engine(str(url), **{**engine_options(), **kwargs})
@@ -0,0 +1,104 @@
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ga_api.metrics import record_cache
+from ga_api.settings import settings
+
+# Cookie holding the primary WAL position of the client's last write
+PRIMARY_LSN_COOKIE = "ga_api_primary_lsn"
+
+
+def parse_lsn(value: str) -> int:
+    """
+    Converts a postgres LSN such as ``16/B374D848`` to a comparable integer.
+
+    :raises ValueError: when the value is not an LSN.
+    """
+    high, low = value.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+async def current_primary_lsn(session: AsyncSession) -> str:
+    """Returns the WAL position of the primary, past every committed write."""
+    result = await session.execute(text("SELECT pg_current_wal_lsn()::text"))
+    return result.scalar_one()
+
+
+async def replication_lag(session: AsyncSession) -> int:
+    """
+    Returns how many bytes of WAL the slowest replica has still to replay.
+
+    Run on the primary; 0 without replicas, or when the role may not read
+    the replication statistics.
+    """
+    result = await session.execute(
+        text(
+            "SELECT coalesce(max(pg_wal_lsn_diff(pg_current_wal_lsn(), replay_lsn)), 0)"
+            "::bigint FROM pg_stat_replication",
+        ),
+    )
+    return result.scalar_one()
+
+
+class ReplicaStatus:
+    """
+    Tells whether the replica has replayed a position of the primary WAL.
+
+    The replayed position only moves forward, so once it passes the asked
+    position no query is needed; the replica is asked again otherwise.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+        self._replayed = 0
+
+    async def has_replayed(self, lsn: int) -> bool:
+        if lsn <= self._replayed:
+            record_cache("replica_replay", hit=True)
+            return True
+        record_cache("replica_replay", hit=False)
+
+        async with self._session_factory() as session:
+            result = await session.execute(
+                text("SELECT pg_last_wal_replay_lsn()::text"),
+            )
+            replayed: Optional[str] = result.scalar()
+        if replayed is not None:
+            self._replayed = max(self._replayed, parse_lsn(replayed))
+        return lsn <= self._replayed
+
+
+class ReadYourWritesMiddleware:
+    """
+    Hands the client the primary position of its last write as a cookie.
+
+    ``get_db_session`` stores the position in ``request.state`` after it
+    commits a write; while the cookie lives, that client's reads go to the
+    primary until the replica replays the position.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            lsn = scope.get("state", {}).get("db_primary_lsn")
+            if message["type"] == "http.response.start" and lsn is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_LSN_COOKIE}={lsn}; "
+                    f"Max-Age={int(settings.db_replica_sticky_window)}; "
+                    "Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,78 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+# Session.info keys set once the current transaction has written something,
+# and once the session committed such a transaction
+_HAS_WRITES = "ga_api_has_writes"
+_COMMITTED_WRITES = "ga_api_committed_writes"
+
+
+def has_pending_writes(session: Session) -> bool:
+    """
+    Tells whether committing ``session`` would persist anything.
+
+    True when objects are waiting to be flushed, or when the open
+    transaction already flushed or executed a statement other than a
+    ``select()``; raw ``text()`` SQL counts as a write.
+    """
+    return bool(
+        session.info.get(_HAS_WRITES)
+        or session.new
+        or session.dirty
+        or session.deleted,
+    )
+
+
+def mark_written(session: Session) -> None:
+    """
+    Records a write the ORM did not see, e.g. a ``COPY`` sent through the
+    driver, so committing ``session`` is not skipped.
+    """
+    session.info[_HAS_WRITES] = True
+
+
+def has_committed_writes(session: Session) -> bool:
+    """Tells whether ``session`` has committed a transaction that wrote."""
+    return bool(session.info.get(_COMMITTED_WRITES))
+
+
+@asynccontextmanager
+async def released_connection(session: AsyncSession) -> AsyncIterator[None]:
+    """
+    Gives the session's connection back to the pool while the block runs.
+
+    Wrap awaited external I/O, such as SMTP or HTTP calls, so the request
+    does not pin a pool slot while doing no database work. The open
+    transaction is committed with what was done so far; the next query
+    checks out a connection again. Loaded objects stay usable, as the
+    application's sessions do not expire them on commit.
+    """
+    if session.in_transaction():
+        await session.commit()
+    yield
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_executed_writes(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _track_committed_writes(session: Session) -> None:
+    if session.info.pop(_HAS_WRITES, None):
+        session.info[_COMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES, None)
@@ -0,0 +1,233 @@
+import asyncio
+import random
+import re
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging import exception, warning
+from types import FrameType
+from typing import Any, Deque, List, Optional, Set
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ga_api.settings import settings
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapses whitespace and replaces inline literals with ``?``."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    return _WHITESPACE_RUN.sub(" ", statement).strip()
+
+
+def parameter_shapes(parameters: Any, executemany: bool = False) -> str:
+    """
+    Describes bind parameters by type, without their values.
+
+    :param parameters: parameters as the driver received them.
+    :param executemany: whether ``parameters`` holds one set per row.
+    """
+    if executemany:
+        rows = list(parameters)
+        first = parameter_shapes(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        values = list(parameters.values())
+    else:
+        values = list(parameters or ())
+    return "(" + ", ".join(_shape(value) for value in values) + ")"
+
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _qualname(frame: FrameType) -> str:
+    # co_qualname is Python 3.11+: methods are named after the class of
+    # ``self`` defining them
+    name = frame.f_code.co_name
+    obj = frame.f_locals.get("self")
+    if obj is None:
+        return name
+    for klass in type(obj).__mro__:
+        attribute = klass.__dict__.get(name)
+        function = getattr(attribute, "__func__", attribute)
+        if getattr(function, "__code__", None) is frame.f_code:
+            return f"{klass.__name__}.{name}"
+    return f"{type(obj).__name__}.{name}"
+
+
+def calling_dao() -> str:
+    """
+    Names the DAO method running the current statement.
+
+    Statements run in a greenlet below the awaiting coroutines, so the
+    frames of the parent greenlet are searched as well.
+    """
+    current = greenlet.getcurrent()
+    frame: Optional[FrameType] = sys._getframe(1)  # noqa: SLF001
+    if current.parent is not None and current.parent.gr_frame is not None:
+        frame = current.parent.gr_frame
+    fallback = "unknown"
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("ga_api.db.dao."):
+            return _qualname(frame)
+        if (
+            fallback == "unknown"
+            and module.startswith("ga_api.")
+            and not (module.startswith("ga_api.db."))
+        ):
+            fallback = f"{module}.{_qualname(frame)}"
+        frame = frame.f_back
+    return fallback
+
+
+class SlowQuery:
+    """A statement over the threshold and, once captured, its plan."""
+
+    def __init__(
+        self,
+        sql: str,
+        parameters: str,
+        caller: str,
+        duration: float,
+    ) -> None:
+        self.sql = sql
+        self.parameters = parameters
+        self.caller = caller
+        self.duration = duration
+        self.logged_at = datetime.now(timezone.utc)
+        self.plan: Optional[Any] = None
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than ``db_slow_query_threshold``.
+
+    A ``db_slow_query_explain_rate`` share of the slow ``SELECT`` statements
+    get their plan captured with ``EXPLAIN (FORMAT JSON)`` by a background
+    task, one at a time, on a connection of the engine that ran them. The
+    last ``db_slow_query_plans`` of them are kept for the admin endpoint.
+    """
+
+    def __init__(self) -> None:
+        self.queries: Deque[SlowQuery] = deque(maxlen=settings.db_slow_query_plans)
+        self._explaining: Set["asyncio.Task[None]"] = set()
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Times the statements of ``engine``."""
+
+        def before_cursor_execute(conn: Connection, *args: Any) -> None:
+            conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+        def after_cursor_execute(
+            conn: Connection,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            executemany: bool,
+        ) -> None:
+            started = conn.info.get("slow_query_started")
+            if not started:
+                return
+            duration = time.perf_counter() - started.pop()
+            if not context.execution_options.get("slow_query_log", True):
+                return
+            threshold = settings.db_slow_query_threshold
+            if threshold and duration >= threshold:
+                self.record(engine, statement, parameters, executemany, duration)
+
+        def handle_error(context: Any) -> None:
+            if context.connection is None:
+                return
+            started = context.connection.info.get("slow_query_started")
+            if started:
+                started.pop()
+
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(sync_engine, "handle_error", handle_error)
+
+    def record(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+    ) -> SlowQuery:
+        try:
+            caller = calling_dao()
+        except Exception:
+            # the statement already ran; naming it must not fail it
+            caller = "unknown"
+        query = SlowQuery(
+            normalize_sql(statement),
+            parameter_shapes(parameters, executemany),
+            caller,
+            duration,
+        )
+        warning(
+            "Slow query (%.3fs) in %s: %s %s",
+            duration,
+            query.caller,
+            query.sql,
+            query.parameters,
+        )
+        if self._should_explain(statement, executemany):
+            task = asyncio.get_running_loop().create_task(
+                self._explain(engine, query, statement, parameters),
+            )
+            self._explaining.add(task)
+            task.add_done_callback(self._explaining.discard)
+        return query
+
+    def _should_explain(self, statement: str, executemany: bool) -> bool:
+        if executemany or self._explaining:
+            return False
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return False
+        rate = settings.db_slow_query_explain_rate
+        return rate >= 1 or random.random() < rate  # noqa: S311
+
+    async def _explain(
+        self,
+        engine: AsyncEngine,
+        query: SlowQuery,
+        statement: str,
+        parameters: Any,
+    ) -> None:
+        try:
+            async with engine.connect() as connection:
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}",
+                    parameters,
+                    execution_options={"slow_query_log": False},
+                )
+                query.plan = result.scalar()
+                await connection.rollback()
+        except Exception:
+            exception("Capturing the plan of a slow query failed")
+            return
+        self.queries.append(query)
+
+    async def wait_explained(self) -> None:
+        """Waits for the plans being captured."""
+        await asyncio.gather(*self._explaining, return_exceptions=True)
+
+    def latest(self) -> List[SlowQuery]:
+        """Captured plans, newest first."""
+        return list(reversed(self.queries))
@@ -1,3 +1,6 @@
+from typing import List
+
+
 class SqlScripts:
 
     @staticmethod
@@ -41,3 +44,57 @@ class SqlScripts:
             now()
         ) ON CONFLICT DO NOTHING;
         """
+
+    @staticmethod
+    def create_patient_name_trigram_index() -> str:
+        # pg_trgm ships with the contrib package, which some servers lack;
+        # name search still works there, only without the index.
+        return """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'
+            ) THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_users_patients_full_name_trgm
+                    ON users USING gin (lower(full_name) gin_trgm_ops)
+                    WHERE NOT is_superuser;
+            END IF;
+        END
+        $$;
+        """
+
+    @staticmethod
+    def create_default_partition(table: str) -> str:
+        return f"""
+        CREATE TABLE IF NOT EXISTS {table}_default
+            PARTITION OF {table} DEFAULT;
+        """
+
+    @staticmethod
+    def create_mirror_function(name: str, target: str) -> str:
+        # trigger function copying the row changes of a table into ``target``
+        return f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {target} WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {target} SELECT NEW.*;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+        """  # noqa: S608
+
+    @staticmethod
+    def create_union_view(name: str, tables: List[str], columns: List[str]) -> str:
+        selected = ", ".join(columns)
+        union = "\n            UNION ALL\n            ".join(
+            f"SELECT {selected} FROM {table}" for table in tables  # noqa: S608
+        )
+        return f"""
+        CREATE OR REPLACE VIEW {name} AS
+            {union};
+        """
@@ -0,0 +1,5 @@
+import enum
+
+
+class EmailKind(str, enum.Enum):
+    FIRST_ACCESS = "first_access"
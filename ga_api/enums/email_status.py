@@ -0,0 +1,7 @@
+import enum
+
+
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
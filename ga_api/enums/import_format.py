@@ -0,0 +1,6 @@
+import enum
+
+
+class ImportFormat(str, enum.Enum):
+    CSV = "text/csv"
+    NDJSON = "application/x-ndjson"
@@ -4,6 +4,10 @@ from gunicorn.app.base import BaseApplication
 from gunicorn.util import import_app
 from uvicorn.workers import UvicornWorker as BaseUvicornWorker
 
+from ga_api.metrics import mark_process_dead
+from ga_api.settings import settings
+from ga_api.web.startup_timer import StartupTimer
+
 try:
     import uvloop  # (Found nested import)
 except ImportError:
@@ -24,9 +28,21 @@ class UvicornWorker(BaseUvicornWorker):
         "http": "httptools",
         "lifespan": "on",
         "factory": True,
-        "proxy_headers": False,
+        "proxy_headers": True,
+        # set here, gunicorn's own setting rejects networks
+        "forwarded_allow_ips": settings.forwarded_allow_ips,
     }
 
+    def init_process(self) -> None:
+        # the worker's ready time counts from here, right after the fork
+        StartupTimer.mark_process_start()
+        super().init_process()
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Drops the live gauges of an exited worker from the shared metrics."""
+    mark_process_dead(worker.pid)
+
 
 class GunicornApplication(BaseApplication):
     """
@@ -48,6 +64,7 @@ class GunicornApplication(BaseApplication):
             "bind": f"{host}:{port}",
             "workers": workers,
             "worker_class": "ga_api.gunicorn_runner.UvicornWorker",
+            "child_exit": child_exit,
             **kwargs,
         }
         self.app = app
@@ -0,0 +1,122 @@
+"""
+Prometheus metrics of the application.
+
+Under gunicorn every worker writes its samples to files in a directory
+shared by the workers, and a scrape of any worker aggregates all of them.
+The directory is chosen before ``prometheus_client`` is imported, as the
+library reads it at import time.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from ga_api.settings import settings
+
+if settings.workers_count > 1 and not settings.reload:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(settings.metrics_dir))
+    settings.metrics_dir.mkdir(parents=True, exist_ok=True)
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+
+
+def multiprocess_dir() -> Optional[Path]:
+    """Directory shared by the workers, None when running a single process."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    return Path(directory) if directory else None
+
+
+def prepare_multiprocess_dir() -> None:
+    """Creates the shared directory and drops the files of a previous run."""
+    directory = multiprocess_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.db"):
+        stale.unlink()
+
+
+def mark_process_dead(pid: int) -> None:
+    """Stops counting the live gauges of a worker that exited."""
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(pid)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose, aggregating every worker when there are several."""
+    if multiprocess_dir() is None:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)  # type: ignore
+    return registry
+
+
+# Requests, labeled by route template so ids in paths do not add series
+HTTP_REQUESTS = Counter(
+    "ga_api_http_requests_total",
+    "Requests handled, by route and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "ga_api_http_request_duration_seconds",
+    "Time to handle a request, by route.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "ga_api_http_requests_in_progress",
+    "Requests being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database connection pools
+DB_POOL_CHECKED_OUT = Gauge(
+    "ga_api_db_pool_checked_out",
+    "Connections in use.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "ga_api_db_pool_overflow",
+    "Connections open beyond the pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "ga_api_db_pool_wait_seconds",
+    "Time a checkout waited for a connection.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "ga_api_event_loop_lag_seconds",
+    "Delay of the event loop in running a callback that was due.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# hits and misses of the caches; the ratio is computed by the query
+CACHE_REQUESTS = Counter(
+    "ga_api_cache_requests_total",
+    "Cache lookups, by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+
+SMTP_SEND_DURATION = Histogram(
+    "ga_api_smtp_send_duration_seconds",
+    "Time to send a message over the SMTP pool, by result.",
+    ["result"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import suppress
+from datetime import date, datetime, time, timedelta
+from logging import exception, warning
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from zoneinfo import ZoneInfo
+
+from ga_api.db.dao.appointment_reminder_dao import AppointmentReminderDAO
+from ga_api.db.leader import APPOINTMENT_REMINDER_LOCK_KEY, AdvisoryLockLeader
+from ga_api.services.mail_service import MailService
+from ga_api.settings import settings
+from ga_api.web.api.mail.request.appointment_reminder_request import (
+    AppointmentReminderRequest,
+)
+from ga_api.web.api.mail.templates.template_factory import TemplateFactory
+
+
+class AppointmentReminderJob:
+    """
+    Emails patients about their appointments of the next day.
+
+    Appointments are streamed from one query and handled in batches: the
+    batch is rendered at once, sent concurrently over the pooled SMTP
+    connections and recorded as reminded, so a rerun only sends what is
+    still missing. Only the worker holding the job's advisory lock runs it.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+        mail_service: MailService,
+    ) -> None:
+        self.mail_service = mail_service
+        self.timezone = ZoneInfo(settings.reminder_timezone)
+        self._session_factory = session_factory
+        self._leader = AdvisoryLockLeader(engine, APPOINTMENT_REMINDER_LOCK_KEY)
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._leader.release()
+
+    async def send_reminders(self, day: date) -> int:
+        """
+        Sends the reminders of the appointments starting on ``day``.
+
+        :param day: day of the appointments, in the reminder timezone.
+        :return: number of reminders sent.
+        """
+        start = datetime.combine(day, time.min, tzinfo=self.timezone)
+        end = start + timedelta(days=1)
+        sent = 0
+
+        # The cursor keeps its own transaction open while every batch is
+        # recorded and committed through the second session.
+        async with self._session_factory() as reader, self._session_factory() as writer:
+            batches = AppointmentReminderDAO(reader).stream_pending(
+                start,
+                end,
+                settings.reminder_batch_size,
+            )
+            async for batch in batches:
+                requests = [
+                    AppointmentReminderRequest(
+                        email=row.email,
+                        patient_name=row.patient_name,
+                        professional_name=row.professional_name,
+                        starts_at=row.start_time.astimezone(self.timezone),
+                    )
+                    for row in batch
+                ]
+                messages = TemplateFactory.create_appointment_reminder_templates(
+                    requests,
+                )
+                results = await asyncio.gather(
+                    *(self.mail_service.send_message(message) for message in messages),
+                    return_exceptions=True,
+                )
+
+                delivered = [
+                    (row.id, row.start_time)
+                    for row, result in zip(batch, results)
+                    if not isinstance(result, BaseException)
+                ]
+                await AppointmentReminderDAO(writer).record_sent(delivered)
+                await writer.commit()
+                sent += len(delivered)
+
+                if len(delivered) < len(batch):
+                    failure = next(r for r in results if isinstance(r, BaseException))
+                    warning(
+                        "%d of %d appointment reminders failed: %r",
+                        len(batch) - len(delivered),
+                        len(batch),
+                        failure,
+                    )
+                    if not delivered:
+                        # the mail server is down; the next run retries
+                        break
+
+        return sent
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if await self._leader.try_acquire():
+                    tomorrow = datetime.now(self.timezone).date() + timedelta(days=1)
+                    await self.send_reminders(tomorrow)
+            except Exception:
+                exception("Appointment reminder job failed")
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._stopping.wait(),
+                    timeout=settings.reminder_interval,
+                )
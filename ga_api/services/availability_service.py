@@ -14,6 +14,9 @@ from ga_api.enums.availability_status import AvailabilityStatus
 from ga_api.utils.admin_utils import AdminUtils
 from ga_api.utils.time_utils import TimeUtils
 from ga_api.web.api.availability.request.availability_request import AvailabilityRequest
+from ga_api.web.api.availability.request.cancel_availabilities_request import (
+    CancelAvailabilitiesRequest,
+)
 from ga_api.web.api.availability.request.update_availability_request import (
     UpdateAvailabilityRequest,
 )
@@ -90,21 +93,39 @@ class AvailabilityService:
             request.model_dump(exclude_none=True),
         )
 
+    async def cancel_availabilities(
+        self,
+        request: CancelAvailabilitiesRequest,
+        user: User,
+    ) -> List[UUID]:
+        """
+        Cancels the open and taken slots of a professional in one update.
+
+        :return: ids of the canceled availabilities.
+        """
+        values = AdminUtils.admin_update_values(user)
+        values["status"] = AvailabilityStatus.CANCELED
+        return await self.availability_dao.update_where(
+            {
+                "professional_id": request.professional_id,
+                "status": [AvailabilityStatus.AVAILABLE, AvailabilityStatus.TAKEN],
+            },
+            values,
+            Availability.start_time >= request.start_time,
+            Availability.start_time < request.end_time,
+        )
+
     async def _validate_overlapping_times(
         self,
         start_time: datetime,
         end_time: datetime,
         exclude_id: UUID | None = None,
     ) -> None:
-        conditions = [
-            Availability.start_time < end_time,
-            Availability.end_time > start_time,
-        ]
-
-        if exclude_id:
-            conditions.append(Availability.id != exclude_id)
-
-        overlapping: bool = await self.availability_dao.exists(*conditions)
+        overlapping: bool = await self.availability_dao.overlaps(
+            start_time,
+            end_time,
+            exclude_id,
+        )
 
         if overlapping:
             raise HTTPException(
@@ -0,0 +1,108 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+from logging import exception
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ga_api.db.dao.email_outbox_dao import EmailOutboxDAO
+from ga_api.db.leader import EMAIL_OUTBOX_LOCK_KEY, AdvisoryLockLeader
+from ga_api.services.mail_service import MailService
+from ga_api.settings import settings
+from ga_api.utils.circuit_breaker import CircuitBreaker
+
+
+class EmailOutboxDispatcher:
+    """
+    Delivers the emails queued in the outbox.
+
+    Every worker runs a dispatcher, but only the one holding the outbox
+    advisory lock sends anything. Failed deliveries are retried with
+    exponential backoff, and a circuit breaker pauses delivery while the
+    mail server keeps failing.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+        mail_service: MailService,
+    ) -> None:
+        self.mail_service = mail_service
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.outbox_breaker_threshold,
+            cooldown=settings.outbox_breaker_cooldown,
+        )
+        self._session_factory = session_factory
+        self._leader = AdvisoryLockLeader(engine, EMAIL_OUTBOX_LOCK_KEY)
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._leader.release()
+
+    async def dispatch_batch(self, session: AsyncSession) -> int:
+        """
+        Sends one batch of due emails.
+
+        The caller is responsible for committing the session.
+
+        :param session: session the batch is claimed and updated in.
+        :return: number of emails claimed.
+        """
+        if not self.breaker.allow():
+            return 0
+
+        dao = EmailOutboxDAO(session)
+        messages = await dao.claim_pending(settings.outbox_batch_size)
+
+        for message in messages:
+            if not self.breaker.allow():
+                break
+            try:
+                await self.mail_service.send_outbox_message(message, session)
+            except Exception as e:
+                self.breaker.record_failure()
+                await dao.mark_failed_attempt(
+                    message,
+                    error=repr(e),
+                    retry_in=self._retry_delay(message.attempts),
+                    max_attempts=settings.outbox_max_attempts,
+                )
+            else:
+                self.breaker.record_success()
+                await dao.mark_sent(message)
+
+        return len(messages)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            claimed = 0
+            try:
+                if await self._leader.try_acquire():
+                    async with self._session_factory() as session:
+                        claimed = await self.dispatch_batch(session)
+                        await session.commit()
+            except Exception:
+                exception("Email outbox dispatch failed")
+
+            if claimed < settings.outbox_batch_size:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._stopping.wait(),
+                        timeout=settings.outbox_poll_interval,
+                    )
+
+    @staticmethod
+    def _retry_delay(previous_attempts: int) -> timedelta:
+        seconds = settings.outbox_retry_backoff * 2**previous_attempts
+        return timedelta(seconds=min(seconds, settings.outbox_retry_backoff_max))
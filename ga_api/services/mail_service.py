@@ -1,7 +1,18 @@
+import asyncio
 from secrets import randbelow
+from typing import Optional
 
-from fastapi_mail import FastMail, MessageSchema
+from fastapi_mail import MessageSchema
+from fastapi_mail.msg import MailMsg
+from fastapi_users.password import PasswordHelper, PasswordHelperProtocol
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ga_api.db.dao.user_dao import UserDAO
+from ga_api.db.models.email_outbox_model import EmailOutbox
+from ga_api.enums.email_kind import EmailKind
+from ga_api.services.smtp_pool import SMTPConnectionPool
+from ga_api.settings import settings
+from ga_api.utils.token_utils import TokenUtils
 from ga_api.web.api.mail.configuration.mail_configuration import MailConfiguration
 from ga_api.web.api.mail.request.mail_request import MailRequest
 from ga_api.web.api.mail.templates.template_factory import TemplateFactory
@@ -11,10 +22,37 @@ def generate_random_token() -> str:
     return f"{randbelow(1000000):06}"
 
 
+def create_smtp_pool() -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        MailConfiguration().conf,
+        size=settings.mail_pool_size,
+        max_messages=settings.mail_pool_max_messages,
+        idle_timeout=settings.mail_pool_idle_timeout,
+    )
+
+
 class MailService:
-    def __init__(self) -> None:
-        self.mail_config: MailConfiguration = MailConfiguration()
-        self.fm: FastMail = FastMail(self.mail_config.conf)
+    """
+    Sends emails over the application's SMTP connection pool.
+
+    A single instance lives in the app state, so every request shares the
+    same open connections instead of logging in to the mail server again.
+    """
+
+    def __init__(
+        self,
+        smtp_pool: SMTPConnectionPool,
+        password_helper: Optional[PasswordHelperProtocol] = None,
+    ) -> None:
+        self.smtp_pool = smtp_pool
+        self.password_helper = password_helper or PasswordHelper()
+
+    async def send_message(self, message: MessageSchema) -> None:
+        mail = MailMsg(message)
+        mime_message = await mail._message(  # noqa: SLF001
+            self.smtp_pool.config.MAIL_FROM,
+        )
+        await self.smtp_pool.send(mime_message)
 
     async def send_email_reset_password(self, request: MailRequest) -> None:
         template_message: MessageSchema = (
@@ -23,7 +61,7 @@ class MailService:
                 generate_random_token(),
             )
         )
-        await self.fm.send_message(template_message)
+        await self.send_message(template_message)
 
     async def send_email_first_access(
         self,
@@ -36,4 +74,42 @@ class MailService:
                 password,
             )
         )
-        await self.fm.send_message(template_message)
+        await self.send_message(template_message)
+
+    async def send_outbox_message(
+        self,
+        message: EmailOutbox,
+        session: AsyncSession,
+    ) -> None:
+        """
+        Sends an email queued in the outbox.
+
+        Secrets are never queued. Every attempt creates them anew and writes
+        them in the caller's session, so the last email sent holds the ones
+        that work.
+
+        :param message: email to send.
+        :param session: session the outbox batch is updated in.
+        """
+        request = MailRequest(email=message.recipient)
+
+        if message.kind == EmailKind.FIRST_ACCESS:
+            password = await self._reset_first_access_password(
+                session,
+                message.recipient,
+            )
+            await self.send_email_first_access(request, password)
+            return
+
+        raise ValueError(f"Unsupported email kind: {message.kind}")
+
+    async def _reset_first_access_password(
+        self,
+        session: AsyncSession,
+        email: str,
+    ) -> str:
+        password = TokenUtils.generate_random_password()
+        hashed_password = await asyncio.to_thread(self.password_helper.hash, password)
+        if not await UserDAO(session).set_first_access_password(email, hashed_password):
+            raise ValueError(f"No user awaiting first access: {email}")
+        return password
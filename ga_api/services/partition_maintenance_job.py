@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import suppress
+from logging import exception
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ga_api.db.partitioning import (
+    PARTITIONED_TABLE,
+    ensure_future_partitions,
+    is_partitioned,
+)
+from ga_api.settings import settings
+
+
+class PartitionMaintenanceJob:
+    """
+    Creates the monthly partitions of the availabilities ahead of time.
+
+    Every worker runs it; ``ensure_partitions`` serializes them with an
+    advisory lock and a run finding every partition in place only reads the
+    catalog. Nothing is done while the table is not partitioned yet.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def run_once(self) -> List[str]:
+        """:return: names of the partitions created."""
+        async with self._engine.begin() as connection:
+            if not await is_partitioned(connection, PARTITIONED_TABLE):
+                return []
+            return await ensure_future_partitions(connection)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                exception("Availability partition maintenance failed")
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._stopping.wait(),
+                    timeout=settings.partition_maintenance_interval,
+                )
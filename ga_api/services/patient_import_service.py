@@ -0,0 +1,199 @@
+import asyncio
+import csv
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional
+
+from fastapi_users.password import PasswordHelperProtocol
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.email_outbox_dao import EmailOutboxDAO
+from ga_api.db.dao.user_dao import UserDAO
+from ga_api.db.session import released_connection
+from ga_api.enums.email_kind import EmailKind
+from ga_api.enums.import_format import ImportFormat
+from ga_api.enums.user_role import UserRole
+from ga_api.settings import settings
+from ga_api.utils.token_utils import TokenUtils
+from ga_api.web.api.users.request.user_patient_request import UserPatientRequest
+from ga_api.web.api.users.response.patient_import_response import (
+    PatientImportError,
+    PatientImportResponse,
+)
+
+# Argon2 releases the GIL, so hashing a batch in threads uses several cores
+# while the event loop keeps serving other requests.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.patient_import_hash_workers,
+    thread_name_prefix="password-hash",
+)
+
+
+class PatientImportService:
+    """
+    Registers patients in bulk from a streamed CSV or NDJSON upload.
+
+    Records are validated as they arrive and handled in batches: emails and
+    CPFs of the whole batch are checked with one query, passwords are hashed
+    in a thread pool, users and their first access emails are inserted with
+    one statement each and the batch is committed. Rows that cannot be
+    imported are reported back instead of aborting the import.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_dao: UserDAO,
+        email_outbox_dao: EmailOutboxDAO,
+        password_helper: PasswordHelperProtocol,
+    ) -> None:
+        self.session = session
+        self.user_dao = user_dao
+        self.email_outbox_dao = email_outbox_dao
+        self.password_helper = password_helper
+        self.batch_size = settings.patient_import_batch_size
+
+    async def import_patients(
+        self,
+        lines: AsyncIterator[str],
+        import_format: ImportFormat,
+    ) -> PatientImportResponse:
+        report = PatientImportResponse()
+        seen_emails: set[str] = set()
+        seen_cpfs: set[str] = set()
+        batch: list[tuple[int, UserPatientRequest]] = []
+        header: Optional[list[str]] = None
+        row = 0
+
+        try:
+            async for line in lines:
+                row += 1
+                if not line.strip():
+                    continue
+                if import_format == ImportFormat.CSV and header is None:
+                    header = next(csv.reader([line]))
+                    continue
+
+                try:
+                    record = self._parse_record(line, import_format, header)
+                    patient = UserPatientRequest.model_validate(record)
+                except (ValueError, ValidationError, csv.Error) as e:
+                    report.errors.append(PatientImportError(row=row, detail=str(e)))
+                    continue
+
+                email, cpf = str(patient.email).lower(), patient.cpf
+                if email in seen_emails or cpf in seen_cpfs:
+                    report.errors.append(
+                        PatientImportError(
+                            row=row,
+                            email=email,
+                            detail="Duplicated email or CPF in the file.",
+                        ),
+                    )
+                    continue
+                seen_emails.add(email)
+                seen_cpfs.add(cpf)
+
+                batch.append((row, patient))
+                if len(batch) >= self.batch_size:
+                    await self._import_batch(batch, report)
+                    batch = []
+        except ValueError as e:
+            report.errors.append(PatientImportError(row=row + 1, detail=str(e)))
+
+        await self._import_batch(batch, report)
+        return report
+
+    @staticmethod
+    def _parse_record(
+        line: str,
+        import_format: ImportFormat,
+        header: Optional[list[str]],
+    ) -> dict[str, Any]:
+        if import_format == ImportFormat.NDJSON:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Each line must be a JSON object.")
+            return record
+
+        values = next(csv.reader([line]))
+        if len(values) != len(header or []):
+            raise ValueError("Number of columns does not match the header.")
+        # empty cells fall back to the field defaults
+        return {
+            column.strip(): value
+            for column, value in zip(header or [], values)
+            if value != ""
+        }
+
+    async def _import_batch(
+        self,
+        batch: list[tuple[int, UserPatientRequest]],
+        report: PatientImportResponse,
+    ) -> None:
+        if not batch:
+            return
+
+        taken_emails, taken_cpfs = await self.user_dao.find_taken_emails_and_cpfs(
+            (str(patient.email) for _, patient in batch),
+            (patient.cpf for _, patient in batch),
+        )
+
+        pending: list[tuple[int, UserPatientRequest]] = []
+        for row, patient in batch:
+            if str(patient.email).lower() in taken_emails:
+                detail = "User already exists."
+            elif patient.cpf in taken_cpfs:
+                detail = "CPF already registered."
+            else:
+                pending.append((row, patient))
+                continue
+            report.errors.append(
+                PatientImportError(row=row, email=str(patient.email), detail=detail),
+            )
+
+        # placeholders, the password is replaced when the email is sent
+        passwords = [TokenUtils.generate_random_password() for _ in pending]
+        loop = asyncio.get_running_loop()
+        # hashing a batch takes a while; other requests may use the connection
+        async with released_connection(self.session):
+            hashed_passwords = await asyncio.gather(
+                *(
+                    loop.run_in_executor(_hash_executor, self.password_helper.hash, pwd)
+                    for pwd in passwords
+                ),
+            )
+
+        inserted = await self.user_dao.insert_many_ignoring_conflicts(
+            [
+                {
+                    **patient.model_dump(),
+                    "email": str(patient.email),
+                    "id": uuid.uuid4(),
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "is_superuser": False,
+                    "is_verified": False,
+                    "is_first_access": True,
+                    "role": UserRole.PATIENT,
+                }
+                for (_, patient), hashed_password in zip(pending, hashed_passwords)
+            ],
+        )
+
+        emails: list[tuple[str, dict[str, Any]]] = []
+        for row, patient in pending:
+            email = str(patient.email)
+            if email in inserted:
+                emails.append((email, {}))
+                continue
+            # registered by someone else since the lookup above
+            report.errors.append(
+                PatientImportError(row=row, email=email, detail="User already exists."),
+            )
+
+        await self.email_outbox_dao.enqueue_many(EmailKind.FIRST_ACCESS, emails)
+        await self.session.commit()
+        report.imported += len(emails)
@@ -15,12 +15,18 @@ from ga_api.utils.admin_utils import AdminUtils
 from ga_api.web.api.professionals.request.professional_create_request import (
     ProfessionalCreateRequest,
 )
+from ga_api.web.api.professionals.request.professional_enable_request import (
+    ProfessionalEnableRequest,
+)
 from ga_api.web.api.professionals.request.professional_update_request import (
     ProfessionalUpdateRequest,
 )
 from ga_api.web.api.professionals.response.professional_block_response import (
     ProfessionalBlockResponse,
 )
+from ga_api.web.api.professionals.response.professional_enable_response import (
+    ProfessionalEnableResponse,
+)
 
 
 class ProfessionalService:
@@ -105,6 +111,22 @@ class ProfessionalService:
         AdminUtils.populate_admin_data(professional, admin_user, update_only=True)
         return await self.professional_dao.save(professional)
 
+    async def set_enabled(
+        self,
+        request: ProfessionalEnableRequest,
+        admin_user: User,
+    ) -> ProfessionalEnableResponse:
+        """Enables or disables many professionals with one update."""
+        values = AdminUtils.admin_update_values(admin_user)
+        values["is_enabled"] = request.is_enabled
+        updated = set(
+            await self.professional_dao.update_where({"id": request.ids}, values),
+        )
+        return ProfessionalEnableResponse(
+            updated=len(updated),
+            not_found=[id_ for id_ in dict.fromkeys(request.ids) if id_ not in updated],
+        )
+
     async def get_all_professionals_admin(
         self,
         limit: int,
@@ -0,0 +1,95 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, Optional, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ga_api.db.dao.rate_limit_hit_dao import RateLimitHitDAO, RateLimitRule
+
+
+class RateLimitStore(Protocol):
+    async def hit(
+        self,
+        rules: Iterable[RateLimitRule],
+    ) -> Optional[tuple[RateLimitRule, float]]:
+        """
+        Counts a call against every rule, or against none if one is exceeded.
+
+        :return: the first exceeded rule and the seconds until it accepts
+            calls again, or None if the call was counted.
+        """
+
+    async def forget_last(self, key: str) -> None:
+        """Removes the most recent hit of ``key``."""
+
+
+class MemoryRateLimitStore:
+    """
+    Sliding window log kept in the worker's memory.
+
+    Each key keeps the timestamps of its calls inside the window, so limits
+    are exact but apply per worker process.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_keys = max_keys
+        self._clock = clock
+        self._hits: dict[str, Deque[float]] = {}
+        self._windows: dict[str, float] = {}
+
+    async def hit(
+        self,
+        rules: Iterable[RateLimitRule],
+    ) -> Optional[tuple[RateLimitRule, float]]:
+        now = self._clock()
+        rules = list(rules)
+        for rule in rules:
+            hits = self._expire(rule.key, rule.window, now)
+            if len(hits) >= rule.limit:
+                return rule, hits[0] + rule.window - now
+
+        if len(self._hits) >= self.max_keys:
+            self._sweep(now)
+        for rule in rules:
+            self._hits.setdefault(rule.key, deque()).append(now)
+            self._windows[rule.key] = rule.window
+        return None
+
+    async def forget_last(self, key: str) -> None:
+        hits = self._hits.get(key)
+        if hits:
+            hits.pop()
+
+    def _expire(self, key: str, window: float, now: float) -> Deque[float]:
+        hits = self._hits.get(key, deque())
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        return hits
+
+    def _sweep(self, now: float) -> None:
+        for key, window in list(self._windows.items()):
+            if not self._expire(key, window, now):
+                self._hits.pop(key, None)
+                del self._windows[key]
+
+
+class PostgresRateLimitStore:
+    """Sliding window log in Postgres, shared by every worker."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+
+    async def hit(
+        self,
+        rules: Iterable[RateLimitRule],
+    ) -> Optional[tuple[RateLimitRule, float]]:
+        async with self._session_factory() as session, session.begin():
+            return await RateLimitHitDAO(session).hit(rules)
+
+    async def forget_last(self, key: str) -> None:
+        async with self._session_factory() as session, session.begin():
+            await RateLimitHitDAO(session).forget_last(key)
@@ -0,0 +1,98 @@
+import asyncio
+import math
+from typing import Optional
+
+from starlette import status
+from starlette.exceptions import HTTPException
+
+from ga_api.db.dao.rate_limit_hit_dao import RateLimitRule
+from ga_api.services.mail_service import MailService
+from ga_api.services.rate_limiter import RateLimitStore
+from ga_api.settings import settings
+from ga_api.web.api.mail.request.mail_request import MailRequest
+
+
+class ResetPasswordThrottle:
+    """
+    Guards the unauthenticated password reset email against abuse.
+
+    A request for an email that already got one inside the dedup window is
+    coalesced with it: it waits for the send still in progress, if any, and
+    sends nothing. Other requests are limited per email and per client IP
+    over a sliding window and are refused with 429 before any SMTP work.
+    """
+
+    def __init__(self, mail_service: MailService, store: RateLimitStore) -> None:
+        self.mail_service = mail_service
+        self.store = store
+        self._in_flight: dict[str, asyncio.Future[None]] = {}
+
+    async def send_email_reset_password(
+        self,
+        request: MailRequest,
+        client_ip: Optional[str],
+    ) -> None:
+        email = str(request.email).lower()
+        in_flight = self._in_flight.get(email)
+        if in_flight is not None:
+            await asyncio.wait([in_flight])
+            if not in_flight.cancelled():
+                in_flight.result()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[email] = future
+        try:
+            await self._send(request, email, client_ip)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(None)
+        finally:
+            del self._in_flight[email]
+            if not future.cancelled():
+                # retrieved so an error nobody waited for is not logged again
+                future.exception()
+
+    async def _send(
+        self,
+        request: MailRequest,
+        email: str,
+        client_ip: Optional[str],
+    ) -> None:
+        dedup_key = f"reset-password:dedup:{email}"
+        rejected = await self.store.hit(
+            [
+                RateLimitRule(dedup_key, 1, settings.mail_dedup_window),
+                RateLimitRule(
+                    f"reset-password:email:{email}",
+                    settings.mail_rate_limit_per_email,
+                    settings.mail_rate_limit_window,
+                ),
+                RateLimitRule(
+                    f"reset-password:ip:{client_ip}",
+                    settings.mail_rate_limit_per_ip,
+                    settings.mail_rate_limit_window,
+                ),
+            ],
+        )
+        if rejected is not None:
+            rule, retry_after = rejected
+            if rule.key == dedup_key:
+                return
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many password reset requests.",
+                headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+            )
+
+        try:
+            await self.mail_service.send_email_reset_password(request)
+        except Exception:
+            # let the caller try again right away, the limits still count it
+            await self.store.forget_last(dedup_key)
+            raise
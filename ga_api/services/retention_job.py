@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from logging import exception, info
+from typing import Dict, Optional, Type
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.dao.block_dao import BlockDAO
+from ga_api.db.leader import RETENTION_LOCK_KEY, AdvisoryLockLeader
+from ga_api.db.replica import replication_lag
+from ga_api.settings import settings
+
+
+class RetentionJob:
+    """
+    Moves past availabilities and expired blocks to the history tables.
+
+    Rows are moved ``retention_batch_size`` at a time, each batch in a
+    transaction of its own, with a pause between batches and a wait while a
+    replica lags behind, so neither locks nor WAL pile up. Only the worker
+    holding the job's advisory lock runs it.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self._session_factory = session_factory
+        self._leader = AdvisoryLockLeader(engine, RETENTION_LOCK_KEY)
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self._leader.release()
+
+    async def archive(self, before: datetime) -> Dict[str, int]:
+        """
+        Moves everything older than ``before`` to the history tables.
+
+        :return: number of rows moved, by table.
+        """
+        moved = {"availabilities": 0, "blocks": 0}
+        daos: Dict[str, Type[AvailabilityDAO | BlockDAO]] = {
+            "availabilities": AvailabilityDAO,
+            "blocks": BlockDAO,
+        }
+        for table, dao in daos.items():
+            while not self._stopping.is_set():
+                await self._wait_for_replicas()
+                async with self._session_factory() as session:
+                    count = await dao(session).archive(
+                        before,
+                        settings.retention_batch_size,
+                    )
+                    await session.commit()
+                moved[table] += count
+                if count < settings.retention_batch_size:
+                    break
+                await self._pause(settings.retention_batch_pause)
+        return moved
+
+    async def _wait_for_replicas(self) -> None:
+        while not self._stopping.is_set():
+            async with self._session_factory() as session:
+                lag = await replication_lag(session)
+            if lag <= settings.retention_max_replication_lag:
+                return
+            await self._pause(settings.retention_batch_pause)
+
+    async def _pause(self, seconds: float) -> None:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if await self._leader.try_acquire():
+                    before = datetime.now(timezone.utc) - timedelta(
+                        days=settings.retention_days,
+                    )
+                    moved = await self.archive(before)
+                    if any(moved.values()):
+                        info(
+                            "Archived %s availabilities and %s blocks",
+                            moved["availabilities"],
+                            moved["blocks"],
+                        )
+            except Exception:
+                exception("Retention job failed")
+
+            await self._pause(settings.retention_interval)
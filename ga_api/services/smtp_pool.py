@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from email.message import EmailMessage, Message
+from typing import Deque, Union
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from fastapi_mail.errors import ConnectionErrors
+
+from ga_api.metrics import SMTP_SEND_DURATION
+
+
+class _PooledConnection:
+    def __init__(self, smtp: aiosmtplib.SMTP) -> None:
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Keeps a few authenticated SMTP connections open and reuses them.
+
+    Opening a connection costs a TCP handshake, TLS negotiation and a login,
+    which dominates the time of sending a single message. The pool hands out
+    at most ``size`` connections at once, recycles a connection after
+    ``max_messages`` messages (many servers cap messages per session) and
+    replaces connections that were idle for longer than ``idle_timeout``
+    seconds or were dropped by the server.
+    """
+
+    def __init__(
+        self,
+        config: ConnectionConfig,
+        size: int,
+        max_messages: int,
+        idle_timeout: float,
+    ) -> None:
+        self.config = config
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.connections_opened = 0
+        self._idle: Deque[_PooledConnection] = deque()
+        self._slots = asyncio.Semaphore(size)
+
+    async def send(self, message: Union[EmailMessage, Message]) -> None:
+        """
+        Sends a message over a pooled connection.
+
+        A connection the server closed in the meantime is replaced and the
+        message is sent once more over the fresh one. The time taken,
+        including getting a connection, is exported as a metric.
+
+        :param message: message ready to be sent.
+        """
+        async with self._slots:
+            started = time.perf_counter()
+            result = "error"
+            try:
+                await self._send(message)
+                result = "sent"
+            finally:
+                SMTP_SEND_DURATION.labels(result).observe(
+                    time.perf_counter() - started,
+                )
+
+    async def _send(self, message: Union[EmailMessage, Message]) -> None:
+        connection = await self._acquire()
+        try:
+            try:
+                await connection.smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self._discard(connection)
+                connection = await self._open()
+                await connection.smtp.send_message(message)
+        except Exception:
+            await self._discard(connection)
+            raise
+
+        connection.messages_sent += 1
+        connection.last_used = time.monotonic()
+        if connection.messages_sent >= self.max_messages:
+            await self._discard(connection)
+        else:
+            self._idle.append(connection)
+
+    async def close(self) -> None:
+        """Closes every idle connection."""
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+    async def _acquire(self) -> _PooledConnection:
+        while self._idle:
+            connection = self._idle.pop()
+            idle_for = time.monotonic() - connection.last_used
+            if connection.smtp.is_connected and idle_for < self.idle_timeout:
+                return connection
+            await self._discard(connection)
+        return await self._open()
+
+    async def _open(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            local_hostname=self.config.LOCAL_HOSTNAME,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(
+                    self.config.MAIL_USERNAME,
+                    self.config.MAIL_PASSWORD.get_secret_value(),
+                )
+        except Exception as e:
+            smtp.close()
+            raise ConnectionErrors(
+                f"Could not connect to the email server: {e!r}",
+            ) from e
+
+        self.connections_opened += 1
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    async def _discard(connection: _PooledConnection) -> None:
+        if connection.smtp.is_connected:
+            with suppress(aiosmtplib.SMTPException, OSError):
+                await connection.smtp.quit()
+        connection.smtp.close()
@@ -1,24 +1,26 @@
-from fastapi_mail.errors import ConnectionErrors
+from typing import Optional
+from uuid import UUID
+
 from starlette import status
 from starlette.exceptions import HTTPException
-from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
 
+from ga_api.db.dao.email_outbox_dao import EmailOutboxDAO
 from ga_api.db.dao.user_dao import UserDAO
 from ga_api.db.models.users import User, UserCreate, UserManager
-from ga_api.services.mail_service import MailService
+from ga_api.enums.email_kind import EmailKind
+from ga_api.utils.cursor_utils import CursorUtils
 from ga_api.utils.token_utils import TokenUtils
-from ga_api.web.api.mail.request.mail_request import MailRequest
 from ga_api.web.api.users.request.user_patient_request import UserPatientRequest
 
 
 class UserService:
     def __init__(
         self,
-        mail_service: MailService,
+        email_outbox_dao: EmailOutboxDAO,
         user_manager: UserManager,
         user_dao: UserDAO,
     ) -> None:
-        self.mail_service = mail_service
+        self.email_outbox_dao = email_outbox_dao
         self.user_manager = user_manager
         self.user_dao = user_dao
 
@@ -29,30 +31,60 @@ class UserService:
                 detail="User already exists.",
             )
 
-        random_password = TokenUtils.generate_random_password()
+        # nobody ever sees this one, the password is replaced when the
+        # first access email is sent
         user_create = UserCreate(
             **request.model_dump(),
-            password=random_password,
+            password=TokenUtils.generate_random_password(),
             is_first_access=True,
         )
-        mail_request = MailRequest(email=request.email)
-
-        try:
-            await self.mail_service.send_email_first_access(
-                mail_request,
-                random_password,
-            )
 
-        except ConnectionErrors as e:
-            raise HTTPException(
-                status_code=HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Could not connect to the email server. Try again later.",
-            ) from e
+        # Committed together with the user by UserManager.create, so the
+        # first access email is only sent if the user really exists.
+        await self.email_outbox_dao.enqueue(
+            EmailKind.FIRST_ACCESS,
+            str(request.email),
+            {},
+        )
 
         return await self.user_manager.create(user_create, safe=True)
 
-    async def get_all_patients(self, skip: int, limit: int) -> list[User]:
-        return await self.user_dao.get_all_not_superuser(skip, limit)
+    async def get_all_patients(
+        self,
+        skip: int,
+        limit: int,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[User], Optional[str]]:
+        """
+        Lists a page of patients ordered by name.
+
+        :return: the patients and the cursor of the next page, if there may
+            be one.
+        """
+        after = None
+        if cursor:
+            try:
+                full_name, user_id = CursorUtils.decode(cursor)
+                after = (str(full_name), UUID(str(user_id)))
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor.",
+                ) from e
+
+        patients = await self.user_dao.get_all_not_superuser(
+            skip,
+            limit,
+            search.strip() if search else None,
+            after,
+        )
+
+        next_cursor = None
+        if patients and len(patients) == limit:
+            last = patients[-1]
+            next_cursor = CursorUtils.encode(last.full_name, last.id)
+        return patients, next_cursor
 
     async def get_all_users(self, skip: int, limit: int) -> list[User]:
         return await self.user_dao.find_all(limit, skip)
@@ -2,6 +2,7 @@ import enum
 import os
 from pathlib import Path
 from tempfile import gettempdir
+from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
@@ -20,6 +21,13 @@ class LogLevel(str, enum.Enum):
     FATAL = "FATAL"
 
 
+class RateLimitBackend(str, enum.Enum):
+    """Where rate limit counters are kept."""
+
+    MEMORY = "memory"
+    POSTGRES = "postgres"
+
+
 class Settings(BaseSettings):
     """
     Application settings.
@@ -32,14 +40,84 @@ class Settings(BaseSettings):
     mail_password: str = os.getenv("MAIL_PASSWORD", "")
     mail_server: str = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     mail_port: str = os.getenv("MAIL_PORT", "587")
+    # SMTP connections kept open per worker
+    mail_pool_size: int = 2
+    # messages sent over one connection before it is recycled
+    mail_pool_max_messages: int = 100
+    # seconds an idle connection is trusted before it is reopened
+    mail_pool_idle_timeout: float = 60.0
+
+    # Password reset email throttling; postgres shares the counters between
+    # workers, memory keeps them per worker
+    mail_rate_limit_backend: RateLimitBackend = RateLimitBackend.MEMORY
+    # requests for the same email inside this window send a single message
+    mail_dedup_window: float = 60.0
+    # sliding window (seconds) of the per email and per client IP limits
+    mail_rate_limit_window: float = 900.0
+    mail_rate_limit_per_email: int = 3
+    mail_rate_limit_per_ip: int = 10
+
+    # Background delivery of the email outbox
+    outbox_dispatcher_enabled: bool = True
+    outbox_batch_size: int = 50
+    # seconds between polls when the outbox is empty
+    outbox_poll_interval: float = 2.0
+    outbox_max_attempts: int = 5
+    # retry delay doubles on every failed attempt, up to the max (seconds)
+    outbox_retry_backoff: float = 30.0
+    outbox_retry_backoff_max: float = 3600.0
+    # consecutive SMTP failures before pausing delivery for the cooldown (seconds)
+    outbox_breaker_threshold: int = 5
+    outbox_breaker_cooldown: float = 60.0
+
+    # Reminder emails for the next day's appointments
+    reminder_job_enabled: bool = True
+    reminder_batch_size: int = 500
+    # seconds between runs; appointments already reminded are skipped
+    reminder_interval: float = 3600.0
+    # defines "tomorrow" and the time shown in the email
+    reminder_timezone: str = "America/Sao_Paulo"
+
+    # Monthly partitions of the availabilities, created this many months ahead
+    availability_partition_months_ahead: int = 3
+    # seconds between checks for missing partitions
+    partition_maintenance_interval: float = 21600.0
+
+    # Archival of past availabilities and expired blocks into the history tables
+    retention_job_enabled: bool = True
+    # availabilities started and blocks ended this many days ago are moved
+    retention_days: int = 90
+    # rows moved per transaction
+    retention_batch_size: int = 1000
+    # seconds between two batches, so replicas replay them as they go
+    retention_batch_pause: float = 0.5
+    # batches wait while a replica is further behind the primary (bytes)
+    retention_max_replication_lag: int = 64 * 1024 * 1024
+    # seconds between runs
+    retention_interval: float = 3600.0
+
+    # Bulk patient import: users inserted and committed per batch
+    patient_import_batch_size: int = 500
+    # threads hashing the generated passwords
+    patient_import_hash_workers: int = 4
 
     host: str = "0.0.0.0"  # noqa: S104
     port: int = int(os.getenv("PORT", 8000))  # noqa: PLW1508
+    # Proxies trusted to set X-Forwarded-For, comma separated addresses or
+    # networks; the client address of their requests, e.g. for the per
+    # client IP limits, is the last untrusted one in the header
+    forwarded_allow_ips: str = "127.0.0.1"
 
     # quantity of workers for uvicorn
     workers_count: int = 1
     # Enable uvicorn reloading
     reload: bool = False
+    # Prometheus metrics at /metrics; gunicorn workers share their samples
+    # through files in metrics_dir
+    metrics_enabled: bool = True
+    metrics_dir: Path = TEMP_DIR / "ga_api_metrics"
+    # seconds between two samples of the event loop lag
+    metrics_loop_lag_interval: float = 0.5
 
     # Current environment
     environment: str = "dev"
@@ -53,6 +131,60 @@ class Settings(BaseSettings):
     db_pass: str = "ga_api"
     db_base: str = "admin"
     db_echo: bool = False
+    # Connection pool of each engine, per worker
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    # seconds a request waits for a pooled connection before failing
+    db_pool_timeout: float = 30.0
+    # seconds after which a connection is replaced; -1 keeps connections open
+    db_pool_recycle: int = -1
+    # test connections on checkout, replacing the ones the server closed
+    db_pool_pre_ping: bool = False
+    # db_host and db_port point to PgBouncer in transaction pooling mode, so
+    # no prepared statement is reused outside the transaction that made it
+    db_pgbouncer: bool = False
+    # Postgres itself, bypassing PgBouncer, for the session advisory locks of
+    # the background jobs; defaults to db_host and db_port
+    db_direct_host: Optional[str] = None
+    db_direct_port: Optional[int] = None
+    # seconds a request may wait for a pooled connection before it is logged
+    db_pool_slow_checkout: float = 0.1
+    # connections each worker opens before serving
+    db_pool_warm_connections: int = 2
+    # run the busiest listing queries once before serving
+    warm_caches: bool = True
+    # create the schema when `python -m ga_api` starts; disable when a release
+    # step runs `python -m ga_api.db.bootstrap` instead
+    db_bootstrap: bool = True
+    # bulk inserts of at least this many rows use COPY, unless conflicts are
+    # ignored; 0 always uses INSERT
+    db_bulk_insert_copy_threshold: int = 5000
+    # Streaming replica serving the read-only routes; unset reads from the primary
+    db_replica_host: Optional[str] = None
+    db_replica_port: int = 5432
+    # seconds a client's reads stay on the primary after it writes, unless the
+    # replica replays the write sooner
+    db_replica_sticky_window: float = 10.0
+    # statements slower than this (seconds) are logged; 0 disables the log
+    db_slow_query_threshold: float = 0.5
+    # share of the slow SELECTs whose plan is captured, and plans kept per worker
+    db_slow_query_explain_rate: float = 0.1
+    db_slow_query_plans: int = 50
+    # Server-Timing header and access log line with the SQL totals of each
+    # request; replaces the server's own access log
+    request_timing: bool = True
+    # statements a request may run before it is logged as a possible N+1;
+    # 0 disables the check
+    n_plus_one_threshold: int = 0
+    # Second-level cache of the rows of the models marked with
+    # __entity_cache__, per worker; writes reach the other workers through
+    # LISTEN/NOTIFY on the connection of the background jobs
+    entity_cache_enabled: bool = True
+    # seconds a cached row is served, and rows kept per worker
+    entity_cache_ttl: float = 60.0
+    entity_cache_max_size: int = 10_000
+    # seconds between checks of the listening connection, and before reconnecting
+    entity_cache_reconnect_interval: float = 5.0
 
     @property
     def db_url(self) -> URL:
@@ -70,6 +202,28 @@ class Settings(BaseSettings):
             path=f"/{self.db_base}",
         )
 
+    @property
+    def db_direct_url(self) -> URL:
+        db_url = self.db_url
+        if self.db_direct_host is not None:
+            db_url = db_url.with_host(self.db_direct_host)
+        if self.db_direct_port is not None:
+            db_url = db_url.with_port(self.db_direct_port)
+        return db_url
+
+    @property
+    def db_replica_url(self) -> Optional[URL]:
+        db_url = os.getenv("DATABASE_REPLICA_URL")
+        if db_url:
+            if db_url.startswith("postgres://"):
+                db_url = db_url.replace("postgres://", "postgresql+asyncpg://", 1)
+            return URL(db_url)
+        if self.db_replica_host is None:
+            return None
+        return self.db_url.with_host(self.db_replica_host).with_port(
+            self.db_replica_port,
+        )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="GA_API_",
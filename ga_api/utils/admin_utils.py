@@ -6,6 +6,14 @@ from ga_api.db.models.users import User
 
 class AdminUtils:
 
+    @staticmethod
+    def admin_update_values(admin: User) -> dict[str, Any]:
+        """Values of ``populate_admin_data`` for an update made without loading."""
+        if not admin.is_superuser:
+            raise Exception("This action can only be performed by superusers")
+
+        return {"updated_by_admin_id": admin.id}
+
     @staticmethod
     def populate_admin_data(obj: Any, admin: User, update_only: bool = False) -> None:
         if not admin.is_superuser:
@@ -0,0 +1,61 @@
+import enum
+import time
+from typing import Callable
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` refuses calls for ``cooldown`` seconds. Then one trial call is
+    let through (half-open): a success closes the circuit, a failure opens it
+    again for another cooldown.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self._clock() - self._opened_at >= self.cooldown:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_progress or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_progress = False
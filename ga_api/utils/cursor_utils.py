@@ -0,0 +1,24 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any
+
+
+class CursorUtils:
+    @staticmethod
+    def encode(*values: Any) -> str:
+        """Packs the sort key of the last row of a page into an opaque token."""
+        raw = json.dumps(values, default=str, separators=(",", ":"))
+        return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> list[Any]:
+        """
+        Unpacks a token made by ``encode``.
+
+        :raises ValueError: the token is malformed.
+        """
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError("Invalid cursor.")
+        return values
@@ -0,0 +1,35 @@
+import codecs
+from typing import AsyncIterable, AsyncIterator
+
+
+class StreamUtils:
+    @staticmethod
+    async def iter_lines(
+        chunks: AsyncIterable[bytes],
+        max_line_length: int = 64 * 1024,
+    ) -> AsyncIterator[str]:
+        """
+        Decodes an UTF-8 byte stream and yields it line by line.
+
+        Only the current, unfinished line is kept in memory, so uploads of
+        any size can be processed while they are still being received. A
+        leading byte order mark (common in spreadsheet exports) is dropped.
+
+        :param chunks: byte chunks, e.g. ``Request.stream()``.
+        :param max_line_length: longest line accepted, in characters.
+        :raises ValueError: the stream is not valid UTF-8 or a line is too long.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+            if len(pending) > max_line_length:
+                raise ValueError(f"Line longer than {max_line_length} characters.")
+
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending.rstrip("\r")
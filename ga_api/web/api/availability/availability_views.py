@@ -1,20 +1,28 @@
 from typing import Annotated, Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from fastapi.param_functions import Depends
 
 from ga_api.db.dao.availability_dao import AvailabilityDAO
 from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.dependencies import use_read_replica
 from ga_api.db.models.users import current_active_user
 from ga_api.services.availability_service import AvailabilityService
 from ga_api.web.api.availability.request.availability_request import AvailabilityRequest
+from ga_api.web.api.availability.request.cancel_availabilities_request import (
+    CancelAvailabilitiesRequest,
+)
 from ga_api.web.api.availability.request.update_availability_request import (
     UpdateAvailabilityRequest,
 )
 from ga_api.web.api.availability.response.availability_response import (
     AvailabilityResponse,
 )
+from ga_api.web.api.availability.response.cancel_availabilities_response import (
+    CancelAvailabilitiesResponse,
+)
+from ga_api.web.json_response import ModelListResponse
 
 admin_router = APIRouter()
 router = APIRouter()
@@ -39,6 +47,19 @@ async def register_availability(
     return await availability_service.register_availability(request, user)  # type: ignore
 
 
+@admin_router.post("/cancel", response_model=CancelAvailabilitiesResponse)
+async def cancel_availabilities(
+    request: CancelAvailabilitiesRequest,
+    user: Annotated[Any, Depends(current_active_user)],
+    availability_service: Annotated[
+        AvailabilityService,
+        Depends(get_availability_service),
+    ],
+) -> CancelAvailabilitiesResponse:
+    ids = await availability_service.cancel_availabilities(request, user)
+    return CancelAvailabilitiesResponse(canceled=len(ids), ids=ids)
+
+
 @admin_router.put("/{availability_id}", response_model=AvailabilityResponse)
 async def update_availability(
     availability_id: UUID,
@@ -56,7 +77,11 @@ async def update_availability(
     )
 
 
-@admin_router.get("/")
+@admin_router.get(
+    "/",
+    response_model=List[AvailabilityResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_availability_admin(
     availability_service: Annotated[
         AvailabilityService,
@@ -65,16 +90,20 @@ async def get_availability_admin(
     professional_id: Optional[UUID] = None,
     limit: int = 50,
     offset: int = 0,
-) -> List[AvailabilityResponse]:
-
-    return await availability_service.get_availabilities_admin(  # type: ignore
+) -> Response:
+    availabilities = await availability_service.get_availabilities_admin(
         professional_id,
         limit,
         offset,
     )
+    return ModelListResponse(AvailabilityResponse, availabilities)
 
 
-@router.get("/")
+@router.get(
+    "/",
+    response_model=List[AvailabilityResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_availability_patient(
     availability_service: Annotated[
         AvailabilityService,
@@ -83,10 +112,10 @@ async def get_availability_patient(
     professional_id: Optional[UUID] = None,
     limit: int = 50,
     offset: int = 0,
-) -> List[AvailabilityResponse]:
-
-    return await availability_service.get_availabilities_patient(  # type: ignore
+) -> Response:
+    availabilities = await availability_service.get_availabilities_patient(
         professional_id,
         limit,
         offset,
     )
+    return ModelListResponse(AvailabilityResponse, availabilities)
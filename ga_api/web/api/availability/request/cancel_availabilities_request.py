@@ -0,0 +1,19 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+from ga_api.utils.time_utils import TimeUtils
+
+
+class CancelAvailabilitiesRequest(BaseModel):
+    """Slots of the professional starting in [start_time, end_time)."""
+
+    professional_id: UUID
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def validate_interval(self) -> "CancelAvailabilitiesRequest":
+        TimeUtils.validate_start_and_end_times(self.start_time, self.end_time)
+        return self
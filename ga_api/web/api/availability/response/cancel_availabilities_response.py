@@ -0,0 +1,9 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class CancelAvailabilitiesResponse(BaseModel):
+    canceled: int
+    ids: List[UUID]
@@ -1,11 +1,41 @@
 from fastapi import APIRouter, Depends
+from starlette.requests import Request
 
-from ga_api.services.mail_service import MailService
+from ga_api.services.mail_service import MailService, create_smtp_pool
+from ga_api.services.rate_limiter import MemoryRateLimitStore
+from ga_api.services.reset_password_throttle import ResetPasswordThrottle
 from ga_api.web.api.mail.request.mail_request import MailRequest
 
 
-def get_mail_service() -> MailService:
-    return MailService()
+def get_mail_service(request: Request) -> MailService:
+    """
+    Get the application-wide mail service.
+
+    It is created on startup; the fallback covers apps running without
+    the lifespan, such as the test client.
+    """
+    mail_service = getattr(request.app.state, "mail_service", None)
+    if mail_service is None:
+        mail_service = MailService(create_smtp_pool())
+        request.app.state.mail_service = mail_service
+    return mail_service
+
+
+def get_reset_password_throttle(
+    request: Request,
+    mail_service: MailService = Depends(get_mail_service),
+) -> ResetPasswordThrottle:
+    """
+    Get the application-wide password reset throttle.
+
+    Like the mail service it is created on startup, falling back to the
+    in-memory store when the lifespan did not run.
+    """
+    throttle = getattr(request.app.state, "reset_password_throttle", None)
+    if throttle is None:
+        throttle = ResetPasswordThrottle(mail_service, MemoryRateLimitStore())
+        request.app.state.reset_password_throttle = throttle
+    return throttle
 
 
 router = APIRouter()
@@ -14,7 +44,8 @@ router = APIRouter()
 @router.post("/email", status_code=204)
 async def send_email_reset_password(
     request: MailRequest,
-    service: MailService = Depends(get_mail_service),
+    http_request: Request,
+    throttle: ResetPasswordThrottle = Depends(get_reset_password_throttle),
 ) -> None:
-
-    return await service.send_email_reset_password(request)
+    client_ip = http_request.client.host if http_request.client else None
+    return await throttle.send_email_reset_password(request, client_ip)
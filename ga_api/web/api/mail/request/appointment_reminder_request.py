@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from pydantic import BaseModel, EmailStr
+
+
+class AppointmentReminderRequest(BaseModel):
+    email: EmailStr
+    patient_name: str
+    professional_name: str
+    # start of the appointment in the clinic's timezone
+    starts_at: datetime
@@ -1,12 +1,21 @@
 # ruff: noqa
 
+from typing import Iterable
+
 from fastapi_mail import MessageSchema
 
+from ga_api.web.api.mail.request.appointment_reminder_request import (
+    AppointmentReminderRequest,
+)
 from ga_api.web.api.mail.request.mail_request import MailRequest
+from ga_api.web.api.mail.templates.template_registry import template_registry
 
 # TODO: alterar na versão final
 CALM_MIND_URL = "https://viewer-alpha-68223955.figma.site/"
 
+FIRST_ACCESS_SUBJECT = "Calm Mind | Primeiro Acesso"
+APPOINTMENT_REMINDER_SUBJECT = "Calm Mind | Lembrete de Sessão"
+
 
 class TemplateFactory:
 
@@ -18,7 +27,7 @@ class TemplateFactory:
         return MessageSchema(
             subject="Calm Mind | Recuperação de Senha",
             recipients=[request.email],
-            body=f"Olá! O código para recuperar a senha é {token}",
+            body=template_registry.render("reset_password.txt", token=token),
             subtype="plain",  # type: ignore
         )
 
@@ -26,45 +35,67 @@ class TemplateFactory:
     def create_first_access_password_template(
         request: MailRequest, password: str
     ) -> MessageSchema:
-        html = f"""
-        <html>
-        <body style="margin:0;padding:0;background:#f0ece6;font-family:Arial,sans-serif;color:#2d2d2d;font-size:14px;">
-            <div style="max-width:520px;margin:30px auto;background:#fff;border-radius:10px;box-shadow:0 2px 10px rgba(0,0,0,0.08);overflow:hidden;">
-                <div style="background:#4a90e2;padding:20px;text-align:center;color:#fff;">
-                    <h2 style="margin:0;font-weight:600;">Calm Mind</h2>
-                </div>
-                <div style="padding:25px;">
-                    <p style="margin:0 0 10px;">Olá, <strong>{request.email}</strong>! 😊</p>
-                    <p style="margin:0 0 15px;">Bem-vindo(a) à plataforma <strong>Calm Mind</strong>!</p>
-                    <p style="margin:0 0 15px;">Para realizar seu <strong>primeiro acesso</strong>, utilize a senha gerada abaixo:</p>
-
-                    <div style="background:#f3f3f5;border:1px solid #0000001a;padding:12px;border-radius:8px;text-align:center;font-size:18px;letter-spacing:1px;font-weight:bold;color:#2d2d2d;margin:10px 0 20px;">
-                        {password}
-                    </div>
-
-                    <p style="margin:0 0 25px;">Por segurança, <strong>não compartilhe</strong> esta senha com ninguém.</p>
-
-                    <div style="text-align:center;">
-                        <a href="{CALM_MIND_URL}"
-                           style="background:#4a90e2;color:#fff;padding:12px 24px;border-radius:8px;text-decoration:none;font-weight:500;display:inline-block;">
-                            Acessar Plataforma
-                        </a>
-                    </div>
-
-                    <hr style="margin:30px 0;border:none;border-top:1px solid #ececf0;">
-
-                    <p style="font-size:12px;color:#717182;text-align:center;margin:0;">
-                        © 2025 Calm Mind. Todos os direitos reservados.
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html = template_registry.render(
+            "first_access_password.html",
+            email=request.email,
+            password=password,
+            calm_mind_url=CALM_MIND_URL,
+        )
 
         return MessageSchema(
-            subject="Calm Mind | Primeiro Acesso",
+            subject=FIRST_ACCESS_SUBJECT,
             recipients=[request.email],
             body=html,
             subtype="html",  # type: ignore
         )
+
+    @staticmethod
+    def create_first_access_password_templates(
+        requests: Iterable[tuple[MailRequest, str]],
+    ) -> list[MessageSchema]:
+        """Batch version of ``create_first_access_password_template``."""
+        requests = list(requests)
+        bodies = template_registry.render_many(
+            "first_access_password.html",
+            (
+                {
+                    "email": request.email,
+                    "password": password,
+                    "calm_mind_url": CALM_MIND_URL,
+                }
+                for request, password in requests
+            ),
+        )
+
+        return [
+            MessageSchema(
+                subject=FIRST_ACCESS_SUBJECT,
+                recipients=[request.email],
+                body=body,
+                subtype="html",  # type: ignore
+            )
+            for (request, _), body in zip(requests, bodies)
+        ]
+
+    @staticmethod
+    def create_appointment_reminder_templates(
+        requests: Iterable[AppointmentReminderRequest],
+    ) -> list[MessageSchema]:
+        requests = list(requests)
+        bodies = template_registry.render_many(
+            "appointment_reminder.html",
+            (
+                {**request.model_dump(), "calm_mind_url": CALM_MIND_URL}
+                for request in requests
+            ),
+        )
+
+        return [
+            MessageSchema(
+                subject=APPOINTMENT_REMINDER_SUBJECT,
+                recipients=[request.email],
+                body=body,
+                subtype="html",  # type: ignore
+            )
+            for request, body in zip(requests, bodies)
+        ]
@@ -0,0 +1,93 @@
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+
+from ga_api.settings import TEMP_DIR
+
+TEMPLATES_DIR = Path(__file__).parent
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+_SPACE_BETWEEN_TAGS = re.compile(r">\s+<")
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def minify_html(source: str) -> str:
+    """Drops indentation and line breaks, which do not change how HTML renders."""
+    source = _SPACE_BETWEEN_TAGS.sub("><", source.strip())
+    return _WHITESPACE_RUN.sub(" ", source)
+
+
+class _MinifyingLoader(FileSystemLoader):
+    def get_source(
+        self,
+        environment: Environment,
+        template: str,
+    ) -> Tuple[str, str, Callable[[], bool]]:
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith(".html"):
+            source = minify_html(source)
+        return source, filename, uptodate
+
+
+class TemplateRegistry:
+    """
+    Email templates compiled once and reused for every message.
+
+    Every template in ``directory`` is loaded and compiled when the registry
+    is created, with HTML markup minified beforehand, so sending a message
+    only interpolates its fields. Compiled bytecode is cached on disk and
+    shared by the workers, which skips compiling on later startups.
+    """
+
+    def __init__(
+        self,
+        directory: Path = TEMPLATES_DIR,
+        bytecode_cache_dir: Optional[Path] = TEMP_DIR / "ga_api_mail_templates",
+    ) -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+        self.environment = Environment(
+            loader=_MinifyingLoader(directory),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+        )
+        self._templates = {
+            path.name: self.environment.get_template(path.name)
+            for path in sorted(directory.iterdir())
+            if path.suffix in TEMPLATE_SUFFIXES
+        }
+
+    def get(self, name: str) -> Template:
+        try:
+            return self._templates[name]
+        except KeyError as e:
+            raise ValueError(f"Unknown email template: {name}") from e
+
+    def render(self, name: str, /, **context: Any) -> str:
+        return self.get(name).render(context)
+
+    def render_many(self, name: str, contexts: Iterable[dict[str, Any]]) -> list[str]:
+        """
+        Renders one template for many messages, e.g. a batch of reminders.
+
+        :param name: template file name.
+        :param contexts: fields of each message.
+        :return: rendered bodies, in the order of ``contexts``.
+        """
+        template = self.get(name)
+        return [template.render(context) for context in contexts]
+
+
+template_registry = TemplateRegistry()
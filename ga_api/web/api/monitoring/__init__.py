@@ -1,5 +1,5 @@
 """API for checking project status."""
 
-from ga_api.web.api.monitoring.views import router
+from ga_api.web.api.monitoring.views import admin_router, metrics_router, router
 
-__all__ = ["router"]
+__all__ = ["admin_router", "metrics_router", "router"]
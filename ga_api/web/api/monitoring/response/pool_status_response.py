@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class PoolStatusResponse(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    mean_wait: float
+    max_wait: float
+    slow_checkouts: int
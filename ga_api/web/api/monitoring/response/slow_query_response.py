@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class SlowQueryResponse(BaseModel):
+    sql: str
+    parameters: str
+    caller: str
+    duration: float
+    logged_at: datetime
+    plan: Any
@@ -0,0 +1,8 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class StartupResponse(BaseModel):
+    ready_after: Optional[float] = None
+    steps: Dict[str, float] = {}
@@ -1,6 +1,23 @@
+from typing import List
+
 from fastapi import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ga_api.db.pool import InstrumentedPool
+from ga_api.metrics import metrics_registry
+from ga_api.web.api.monitoring.response.pool_status_response import (
+    PoolStatusResponse,
+)
+from ga_api.web.api.monitoring.response.slow_query_response import (
+    SlowQueryResponse,
+)
+from ga_api.web.api.monitoring.response.startup_response import StartupResponse
 
 router = APIRouter()
+admin_router = APIRouter()
+metrics_router = APIRouter()
 
 
 @router.get("/health")
@@ -10,3 +27,81 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """
+    Metrics in the Prometheus text format.
+
+    Under gunicorn they add up the samples of every worker.
+    """
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+@admin_router.get("/db-pool", response_model=List[PoolStatusResponse])
+def get_db_pool_status(request: Request) -> List[PoolStatusResponse]:
+    """
+    Usage of this worker's database connection pools.
+
+    Wait times are in seconds, counted since the worker started.
+    """
+    engines = {
+        "primary": getattr(request.app.state, "db_engine", None),
+        "replica": getattr(request.app.state, "db_replica_engine", None),
+    }
+    statuses = []
+    for name, engine in engines.items():
+        pool = engine.pool if engine is not None else None
+        if not isinstance(pool, InstrumentedPool):
+            continue
+        stats = pool.wait_stats
+        statuses.append(
+            PoolStatusResponse(
+                name=name,
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                checkouts=stats.checkouts,
+                mean_wait=stats.mean_wait,
+                max_wait=stats.max_wait,
+                slow_checkouts=stats.slow_checkouts,
+            ),
+        )
+    return statuses
+
+
+@admin_router.get("/startup", response_model=StartupResponse)
+def get_startup(request: Request) -> StartupResponse:
+    """
+    Time this worker took to become ready and each of its steps, in seconds.
+
+    Empty when the worker started without the lifespan, as in tests.
+    """
+    timer = getattr(request.app.state, "startup_timer", None)
+    if timer is None:
+        return StartupResponse()
+    return StartupResponse(ready_after=timer.ready_after, steps=timer.steps)
+
+
+@admin_router.get("/slow-queries", response_model=List[SlowQueryResponse])
+def get_slow_queries(request: Request) -> List[SlowQueryResponse]:
+    """
+    Plans captured for this worker's slow queries, newest first.
+
+    Durations are in seconds; plans are Postgres' ``EXPLAIN (FORMAT JSON)``.
+    """
+    slow_query_log = getattr(request.app.state, "slow_query_log", None)
+    if slow_query_log is None:
+        return []
+    return [
+        SlowQueryResponse(
+            sql=query.sql,
+            parameters=query.parameters,
+            caller=query.caller,
+            duration=query.duration,
+            logged_at=query.logged_at,
+            plan=query.plan,
+        )
+        for query in slow_query_log.latest()
+    ]
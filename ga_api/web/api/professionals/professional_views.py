@@ -1,13 +1,17 @@
 import uuid
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from ga_api.db.dependencies import use_read_replica
 from ga_api.db.models.users import User, current_active_user
 from ga_api.services.professional_service import ProfessionalService
 from ga_api.web.api.professionals.request.professional_create_request import (
     ProfessionalCreateRequest,
 )
+from ga_api.web.api.professionals.request.professional_enable_request import (
+    ProfessionalEnableRequest,
+)
 from ga_api.web.api.professionals.request.professional_update_request import (
     ProfessionalUpdateRequest,
 )
@@ -17,6 +21,10 @@ from ga_api.web.api.professionals.response.professional_block_response import (
 from ga_api.web.api.professionals.response.professional_create_response import (
     ProfessionalResponse,
 )
+from ga_api.web.api.professionals.response.professional_enable_response import (
+    ProfessionalEnableResponse,
+)
+from ga_api.web.json_response import ModelListResponse
 
 router = APIRouter()
 admin_router = APIRouter()
@@ -52,19 +60,42 @@ async def update_professional(
     )
 
 
-@admin_router.get("/", response_model=List[ProfessionalBlockResponse])
+@admin_router.patch("/", response_model=ProfessionalEnableResponse)
+async def set_professionals_enabled(
+    request: ProfessionalEnableRequest,
+    admin_user: Annotated[User, Depends(current_active_user)],
+    service: ProfessionalService = Depends(),
+) -> ProfessionalEnableResponse:
+    return await service.set_enabled(request, admin_user)
+
+
+@admin_router.get(
+    "/",
+    response_model=List[ProfessionalBlockResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_all_professionals(
     service: ProfessionalService = Depends(),
     limit: int | None = 50,
     offset: int | None = 0,
-) -> List[ProfessionalBlockResponse]:
-    return await service.get_all_professionals_admin(limit, offset)  # type: ignore
+) -> Response:
+    return ModelListResponse(
+        ProfessionalBlockResponse,
+        await service.get_all_professionals_admin(limit, offset),  # type: ignore
+    )
 
 
-@router.get("/", response_model=List[ProfessionalBlockResponse])
+@router.get(
+    "/",
+    response_model=List[ProfessionalBlockResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_all_professionals_public(
     service: ProfessionalService = Depends(),
     limit: int | None = 50,
     offset: int | None = 0,
-) -> List[ProfessionalBlockResponse]:
-    return await service.get_all_professionals(limit, offset)  # type: ignore
+) -> Response:
+    return ModelListResponse(
+        ProfessionalBlockResponse,
+        await service.get_all_professionals(limit, offset),  # type: ignore
+    )
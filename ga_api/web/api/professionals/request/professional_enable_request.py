@@ -0,0 +1,9 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ProfessionalEnableRequest(BaseModel):
+    ids: List[UUID] = Field(min_length=1, max_length=1000)
+    is_enabled: bool
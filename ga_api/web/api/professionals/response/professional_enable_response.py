@@ -0,0 +1,10 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ProfessionalEnableResponse(BaseModel):
+    updated: int
+    # requested ids matching no professional
+    not_found: List[UUID] = []
@@ -31,6 +31,12 @@ admin_router.include_router(
     prefix="/availability",
     tags=["admin", "availability"],
 )
+admin_router.include_router(
+    monitoring.admin_router,
+    prefix="/monitoring",
+    tags=["admin", "monitoring"],
+)
+
 admin_router.include_router(
     professionals.admin_router,
     prefix="/professionals",
@@ -1,7 +1,8 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from ga_api.db.dependencies import use_read_replica
 from ga_api.db.models.users import User, current_active_user
 from ga_api.services.schedule_service import SchedulingService
 from ga_api.web.api.availability.response.availability_response import (
@@ -12,6 +13,7 @@ from ga_api.web.api.schedule.request.patient_schedule_request import (
     PatientScheduleRequest,
 )
 from ga_api.web.api.schedule.response.schedule_response import SchedulingResponse
+from ga_api.web.json_response import ModelListResponse
 
 router = APIRouter()
 admin_router = APIRouter()
@@ -38,13 +40,17 @@ async def book_for_patient(
     )
 
 
-@router.get("/", response_model=List[AvailabilityResponse])
+@router.get(
+    "/",
+    response_model=List[AvailabilityResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_my_schedules(
     user: User = Depends(current_active_user),
     scheduling_service: SchedulingService = Depends(),
     limit: int = 50,
     offset: int = 0,
-) -> List[AvailabilityResponse]:
+) -> Response:
     """
     Retorna os agendamentos do usuário autenticado com paginação.
     """
@@ -53,4 +59,4 @@ async def get_my_schedules(
         limit=limit,
         offset=offset,
     )
-    return [AvailabilityResponse.model_validate(a) for a in availabilities]
+    return ModelListResponse(AvailabilityResponse, availabilities)
@@ -5,6 +5,7 @@ from fastapi import APIRouter
 from fastapi.param_functions import Depends
 
 from ga_api.db.dao.speciality_dao import SpecialityDAO
+from ga_api.db.dependencies import use_read_replica
 from ga_api.db.models.users import current_active_user
 from ga_api.services.speciality_service import SpecialityService
 from ga_api.web.api.speciality.request.speciality_request import SpecialityRequest
@@ -19,7 +20,11 @@ def get_speciality_service(
     return SpecialityService(speciality_dao)
 
 
-@admin_router.get("/", response_model=List[SpecialityResponse])
+@admin_router.get(
+    "/",
+    response_model=List[SpecialityResponse],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_speciality_models(
     speciality_service: Annotated[SpecialityService, Depends(get_speciality_service)],
     speciality_id: uuid.UUID | None = None,
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PatientImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+
+class PatientImportResponse(BaseModel):
+    imported: int = 0
+    errors: list[PatientImportError] = []
@@ -1,9 +1,15 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
 
+from ga_api.db.dao.email_outbox_dao import EmailOutboxDAO
 from ga_api.db.dao.user_dao import UserDAO
+from ga_api.db.dependencies import get_db_session, use_read_replica
 from ga_api.db.models.users import (
     UserCreate,
     UserManager,
@@ -13,17 +19,36 @@ from ga_api.db.models.users import (
     auth_jwt,
     get_user_manager,
 )
-from ga_api.services.mail_service import MailService
+from ga_api.enums.import_format import ImportFormat
+from ga_api.services.patient_import_service import PatientImportService
 from ga_api.services.user_service import UserService
+from ga_api.utils.stream_utils import StreamUtils
 from ga_api.web.api.users.request.user_patient_request import UserPatientRequest
+from ga_api.web.api.users.response.patient_import_response import (
+    PatientImportResponse,
+)
 
 
 async def get_user_service(
-    mail_service: MailService = Depends(),
+    email_outbox_dao: EmailOutboxDAO = Depends(),
     user_manager: UserManager = Depends(get_user_manager),
     user_dao: UserDAO = Depends(UserDAO),
 ) -> UserService:
-    return UserService(mail_service, user_manager, user_dao)
+    return UserService(email_outbox_dao, user_manager, user_dao)
+
+
+async def get_patient_import_service(
+    session: AsyncSession = Depends(get_db_session),
+    user_dao: UserDAO = Depends(),
+    email_outbox_dao: EmailOutboxDAO = Depends(),
+    user_manager: UserManager = Depends(get_user_manager),
+) -> PatientImportService:
+    return PatientImportService(
+        session,
+        user_dao,
+        email_outbox_dao,
+        user_manager.password_helper,
+    )
 
 
 router = APIRouter()
@@ -72,13 +97,66 @@ async def register_user(
     return UserRead.model_validate(user)
 
 
-@admin_router.get("/patients", response_model=list[UserRead])
+@admin_router.post(
+    "/import-patients",
+    response_model=PatientImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                import_format.value: {"schema": {"type": "string"}}
+                for import_format in ImportFormat
+            },
+        },
+    },
+)
+async def import_patients(
+    request: Request,
+    service: Annotated[PatientImportService, Depends(get_patient_import_service)],
+) -> PatientImportResponse:
+    """
+    Registers many patients from a CSV (with a header row) or NDJSON body.
+
+    The body is read as it is uploaded. Every imported patient gets a first
+    access email; rows that could not be imported are listed in the report.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        import_format = ImportFormat(content_type)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send the patients as text/csv or application/x-ndjson.",
+        ) from e
+
+    lines = StreamUtils.iter_lines(request.stream())
+    return await service.import_patients(lines, import_format)
+
+
+@admin_router.get(
+    "/patients",
+    response_model=list[UserRead],
+    dependencies=[Depends(use_read_replica)],
+)
 async def get_all_patients(
+    response: Response,
     service: Annotated[UserService, Depends(get_user_service)],
     skip: int = 0,
     limit: int = 100,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
 ) -> list[UserRead]:
-    return await service.get_all_patients(skip, limit)  # type: ignore
+    """
+    Lists patients ordered by name, optionally filtered by ``q``.
+
+    ``q`` matches part of the name or the start of the email or CPF. When
+    there may be more results, the ``X-Next-Cursor`` header holds the value
+    to pass as ``cursor`` to fetch the next page.
+    """
+    patients, next_cursor = await service.get_all_patients(skip, limit, q, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return patients  # type: ignore
 
 
 @admin_router.get("/", response_model=list[UserRead])
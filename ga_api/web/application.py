@@ -4,8 +4,13 @@ from fastapi import FastAPI
 from fastapi.responses import UJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from ga_api.db.replica import ReadYourWritesMiddleware
+from ga_api.settings import settings
+from ga_api.web.api.monitoring import metrics_router
 from ga_api.web.api.router import api_router
 from ga_api.web.lifespan import lifespan_setup
+from ga_api.web.metrics import MetricsMiddleware
+from ga_api.web.request_timing import RequestTimingMiddleware
 
 
 def get_app() -> FastAPI:
@@ -28,7 +33,12 @@ def get_app() -> FastAPI:
 
     # Main router for the API.
     app.include_router(router=api_router, prefix="/api")
+    if settings.metrics_enabled:
+        app.include_router(router=metrics_router)
 
+    app.add_middleware(ReadYourWritesMiddleware)
+    if settings.request_timing:
+        app.add_middleware(RequestTimingMiddleware)
     app.add_middleware(
         CORSMiddleware,  # type: ignore
         allow_origins=["*"],
@@ -36,5 +46,7 @@ def get_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
 
     return app
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, List, Mapping, Optional, Type
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from ga_api.db.base import Base
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter[List[Any]]:
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: Type[BaseModel]) -> Optional[FrozenSet[str]]:
+    fields = model.model_fields
+    if any(field.alias or field.validation_alias for field in fields.values()):
+        return None
+    return frozenset(fields)
+
+
+def _source(item: Any, fields: Optional[FrozenSet[str]]) -> Any:
+    # the loaded attributes of an ORM object are read from its __dict__,
+    # skipping the instrumented descriptors, which cost as much as the
+    # validation itself; objects missing a field go through them
+    if fields is not None and isinstance(item, Base):
+        values = item.__dict__
+        if fields <= values.keys():
+            return values
+    return item
+
+
+class ModelListResponse(Response):
+    """
+    JSON array of ``model`` items, read straight from ORM objects or rows.
+
+    Returned by a route, it bypasses FastAPI's ``response_model`` handling,
+    which validates the items, dumps them back to dicts, validates those
+    again and hands the result to the JSON encoder. Here pydantic validates
+    each item once, from its attributes or mapping keys, and writes the
+    JSON bytes in the same call; items already of ``model`` are not
+    validated again. Keep ``response_model`` on the route for the schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        items: Iterable[Any],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        adapter = _list_adapter(model)
+        fields = _field_names(model)
+        content = adapter.dump_json(
+            adapter.validate_python(
+                [_source(item, fields) for item in items],
+                from_attributes=True,
+            ),
+        )
+        super().__init__(content, status_code, headers, None, background)
@@ -1,19 +1,36 @@
 from contextlib import asynccontextmanager
-from logging import warning
+from datetime import datetime
+from logging import exception, warning
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import (
-    AsyncConnection,
-    async_sessionmaker,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
-from ga_api.db.meta import meta
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.dao.speciality_dao import SpecialityDAO
+from ga_api.db.entity_cache import NO_STORE, EntityCacheListener
+from ga_api.db.instrumentation import instrument_engine
 from ga_api.db.models import load_all_models
-from ga_api.db.sql_scripts import SqlScripts
-from ga_api.settings import settings
+from ga_api.db.pool import create_pooled_engine, warm_pool
+from ga_api.db.replica import ReplicaStatus
+from ga_api.db.slow_queries import SlowQueryLog
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.services.appointment_reminder_job import AppointmentReminderJob
+from ga_api.services.email_outbox_dispatcher import EmailOutboxDispatcher
+from ga_api.services.mail_service import MailService, create_smtp_pool
+from ga_api.services.partition_maintenance_job import PartitionMaintenanceJob
+from ga_api.services.rate_limiter import (
+    MemoryRateLimitStore,
+    PostgresRateLimitStore,
+    RateLimitStore,
+)
+from ga_api.services.reset_password_throttle import ResetPasswordThrottle
+from ga_api.services.retention_job import RetentionJob
+from ga_api.settings import RateLimitBackend, settings
+from ga_api.web.metrics import EventLoopMonitor
+from ga_api.web.startup_timer import StartupTimer
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -23,31 +40,201 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
     This function creates SQLAlchemy engine instance,
     session_factory for creating sessions
     and stores them in the application's state property.
+    Safe methods get sessions from a read-only factory. When a replica is
+    configured, it gets its own engine and session factory. Slow statements of
+    both are logged when a threshold is set. Behind PgBouncer,
+    the background jobs hold their advisory locks on direct connections.
 
     :param app: fastAPI application.
     """
-    engine = create_async_engine(str(settings.db_url), echo=settings.db_echo)
+    load_all_models()
+    engine = create_pooled_engine(settings.db_url, pool_logging_name="primary")
+    instrument_engine(engine)
     session_factory = async_sessionmaker(
         engine,
         expire_on_commit=False,
     )
     app.state.db_engine = engine
     app.state.db_session_factory = session_factory
+    # transactions of the safe methods start as READ ONLY
+    app.state.db_read_session_factory = async_sessionmaker(
+        engine.execution_options(postgresql_readonly=True),
+        expire_on_commit=False,
+    )
 
+    app.state.db_replica_engine = None
+    app.state.db_replica_session_factory = None
+    if settings.db_replica_url is not None:
+        replica_engine = create_pooled_engine(
+            settings.db_replica_url,
+            pool_logging_name="replica",
+        )
+        instrument_engine(replica_engine)
+        # the replica may be behind a write already published to the cache
+        replica_session_factory = async_sessionmaker(
+            replica_engine.execution_options(postgresql_readonly=True),
+            expire_on_commit=False,
+            info={NO_STORE: True},
+        )
+        app.state.db_replica_engine = replica_engine
+        app.state.db_replica_session_factory = replica_session_factory
+        app.state.db_replica_status = ReplicaStatus(replica_session_factory)
 
-async def _create_tables() -> None:  # pragma: no cover
-    """Populates tables in the database."""
-    load_all_models()
-    engine = create_async_engine(str(settings.db_url))
-    async with engine.begin() as connection:
-        await connection.run_sync(meta.create_all)
-        await _create_root_admin(connection)
-    await engine.dispose()
+    app.state.slow_query_log = None
+    if settings.db_slow_query_threshold:
+        app.state.slow_query_log = SlowQueryLog()
+        app.state.slow_query_log.install(engine)
+        if app.state.db_replica_engine is not None:
+            app.state.slow_query_log.install(app.state.db_replica_engine)
+
+    # session advisory locks outlive the transaction PgBouncer lends a server
+    # connection for, so leaders are elected on connections of their own
+    app.state.db_lock_engine = engine
+    if settings.db_pgbouncer:
+        if settings.db_direct_host is None and settings.db_direct_port is None:
+            warning(
+                "GA_API_DB_DIRECT_HOST is not set: background jobs elect "
+                "their leader through PgBouncer",
+            )
+        app.state.db_lock_engine = create_async_engine(
+            str(settings.db_direct_url),
+            poolclass=NullPool,
+        )
+
+
+def _setup_mail(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates the mail service and its throttle, shared by all requests of this worker.
+
+    :param app: fastAPI application.
+    """
+    app.state.mail_service = MailService(create_smtp_pool())
+
+    store: RateLimitStore = MemoryRateLimitStore()
+    if settings.mail_rate_limit_backend == RateLimitBackend.POSTGRES:
+        store = PostgresRateLimitStore(app.state.db_session_factory)
+    app.state.reset_password_throttle = ResetPasswordThrottle(
+        app.state.mail_service,
+        store,
+    )
+
+
+def _start_email_dispatcher(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts delivering the email outbox in the background.
+
+    :param app: fastAPI application.
+    """
+    app.state.email_dispatcher = None
+    if not settings.outbox_dispatcher_enabled:
+        return
+
+    dispatcher = EmailOutboxDispatcher(
+        app.state.db_lock_engine,
+        app.state.db_session_factory,
+        app.state.mail_service,
+    )
+    dispatcher.start()
+    app.state.email_dispatcher = dispatcher
+
+
+def _start_appointment_reminders(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts sending the next day's appointment reminders in the background.
+
+    :param app: fastAPI application.
+    """
+    app.state.appointment_reminder_job = None
+    if not settings.reminder_job_enabled:
+        return
+
+    job = AppointmentReminderJob(
+        app.state.db_lock_engine,
+        app.state.db_session_factory,
+        app.state.mail_service,
+    )
+    job.start()
+    app.state.appointment_reminder_job = job
 
 
-async def _create_root_admin(connection: AsyncConnection) -> None:
-    warning("CREATING ROOT ADMIN. !!! MUST BE USED FOR DEVELOPMENT ONLY !!!")
-    await connection.execute(text(SqlScripts.create_root_admin()))
+def _start_partition_maintenance(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts creating the monthly availability partitions ahead of time.
+
+    :param app: fastAPI application.
+    """
+    job = PartitionMaintenanceJob(app.state.db_engine)
+    job.start()
+    app.state.partition_maintenance_job = job
+
+
+def _start_retention(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts moving past availabilities and blocks to the history tables.
+
+    :param app: fastAPI application.
+    """
+    app.state.retention_job = None
+    if not settings.retention_job_enabled:
+        return
+
+    job = RetentionJob(app.state.db_lock_engine, app.state.db_session_factory)
+    job.start()
+    app.state.retention_job = job
+
+
+def _start_entity_cache(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts listening for the rows other workers write, serving cached rows meanwhile.
+
+    :param app: fastAPI application.
+    """
+    app.state.entity_cache_listener = None
+    if not settings.entity_cache_enabled:
+        return
+
+    listener = EntityCacheListener(app.state.db_lock_engine)
+    listener.start()
+    app.state.entity_cache_listener = listener
+
+
+async def _warm_pools(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Opens the configured number of connections of each pool before serving.
+
+    :param app: fastAPI application.
+    """
+    await warm_pool(app.state.db_engine, settings.db_pool_warm_connections)
+    if app.state.db_replica_engine is not None:
+        await warm_pool(app.state.db_replica_engine, settings.db_pool_warm_connections)
+
+
+async def _warm_caches(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Runs the queries of the busiest listings once before serving.
+
+    The first query configures the mappers and every statement is compiled
+    into the engine's cache, so first requests do not pay for either.
+
+    :param app: fastAPI application.
+    """
+    try:
+        async with app.state.db_read_session_factory() as session:
+            await ProfessionalDAO(session).find_all_with_specialities(
+                1,
+                0,
+                only_enabled=True,
+            )
+            await AvailabilityDAO(session).find_all_not_blocked(
+                limit=1,
+                offset=0,
+                professional_id=None,
+                status=AvailabilityStatus.AVAILABLE,
+                after=datetime.now(),
+            )
+            await SpecialityDAO(session).find_all(1, 0)
+    except Exception:
+        exception("Warming caches failed")
 
 
 @asynccontextmanager
@@ -58,16 +245,53 @@ async def lifespan_setup(
     Actions to run on application startup.
 
     This function uses fastAPI app to store data
-    in the state, such as db_engine.
+    in the state, such as db_engine. The schema is not created here but
+    once per deploy, see ``ga_api.db.bootstrap``.
 
     :param app: the fastAPI application.
     :return: function that actually performs actions.
     """
 
+    timer = StartupTimer()
     app.middleware_stack = None
-    _setup_db(app)
-    await _create_tables()
+    with timer.step("database"):
+        _setup_db(app)
+    with timer.step("pool"):
+        await _warm_pools(app)
+    if settings.warm_caches:
+        with timer.step("caches"):
+            await _warm_caches(app)
+    _setup_mail(app)
+    _start_email_dispatcher(app)
+    _start_appointment_reminders(app)
+    _start_partition_maintenance(app)
+    _start_retention(app)
+    _start_entity_cache(app)
+    app.state.event_loop_monitor = None
+    if settings.metrics_enabled:
+        app.state.event_loop_monitor = EventLoopMonitor(
+            settings.metrics_loop_lag_interval,
+        )
+        app.state.event_loop_monitor.start()
     app.middleware_stack = app.build_middleware_stack()
+    timer.ready()
+    app.state.startup_timer = timer
 
     yield
+    if app.state.event_loop_monitor is not None:
+        await app.state.event_loop_monitor.stop()
+    if app.state.email_dispatcher is not None:
+        await app.state.email_dispatcher.stop()
+    if app.state.appointment_reminder_job is not None:
+        await app.state.appointment_reminder_job.stop()
+    await app.state.partition_maintenance_job.stop()
+    if app.state.retention_job is not None:
+        await app.state.retention_job.stop()
+    if app.state.entity_cache_listener is not None:
+        await app.state.entity_cache_listener.stop()
+    await app.state.mail_service.smtp_pool.close()
     await app.state.db_engine.dispose()
+    if app.state.db_lock_engine is not app.state.db_engine:
+        await app.state.db_lock_engine.dispose()
+    if app.state.db_replica_engine is not None:
+        await app.state.db_replica_engine.dispose()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ga_api.metrics import (
+    EVENT_LOOP_LAG,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Counts requests and times them, by route template and status code.
+
+    Paths matching no route are counted together as ``unmatched``, so
+    scanners probing random paths do not add series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(method, route).observe(
+                time.perf_counter() - started,
+            )
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+
+class EventLoopMonitor:
+    """
+    Samples the event loop lag: how late a sleep of ``interval`` wakes up.
+
+    Lag means callbacks, such as blocking code, hold the loop and every
+    request of the worker waits for them.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - started - self.interval, 0.0))
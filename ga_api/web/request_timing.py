@@ -0,0 +1,94 @@
+import time
+from logging import getLogger
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ga_api.db.instrumentation import QueryStats, query_stats
+from ga_api.settings import settings
+
+# the server's access log is off while this middleware writes the lines;
+# uvicorn and gunicorn both set this one up at the configured level
+access_logger = getLogger("uvicorn.error")
+
+
+def server_timing(stats: QueryStats, total: float) -> str:
+    """
+    Formats a ``Server-Timing`` header value.
+
+    :param stats: statements of the request.
+    :param total: seconds the request took so far.
+    """
+    return (
+        f"db;dur={stats.duration * 1000:.1f}, "
+        f"db-count;desc={stats.count}, "
+        f"app;dur={max(total - stats.duration, 0.0) * 1000:.1f}"
+    )
+
+
+class RequestTimingMiddleware:
+    """
+    Times each request and the SQL it runs.
+
+    The totals go to the ``Server-Timing`` header and to the access log line
+    of the request. Requests running more statements than
+    ``n_plus_one_threshold`` are logged with their most repeated statement.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "server-timing",
+                    server_timing(stats, time.perf_counter() - started),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            self._log(scope, status, stats, time.perf_counter() - started)
+
+    def _log(self, scope: Scope, status: int, stats: QueryStats, total: float) -> None:
+        path = scope["path"]
+        if scope.get("query_string"):
+            path = f"{path}?{scope['query_string'].decode('latin-1')}"
+        client = scope.get("client")
+        access_logger.info(
+            '%s "%s %s HTTP/%s" %s %.1fms db=%.1fms queries=%s',
+            f"{client[0]}:{client[1]}" if client else "-",
+            scope["method"],
+            path,
+            scope.get("http_version", "1.1"),
+            status,
+            total * 1000,
+            stats.duration * 1000,
+            stats.count,
+        )
+        threshold = settings.n_plus_one_threshold
+        if threshold and stats.count > threshold:
+            repeated = stats.most_repeated()
+            access_logger.warning(
+                "Possible N+1: %s %s ran %s statements, this one %s times: %s",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.statements[repeated] if repeated else 0,
+                repeated,
+            )
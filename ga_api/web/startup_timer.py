@@ -0,0 +1,47 @@
+import os
+import time
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Dict, Iterator, Optional
+
+# next to the server's own startup lines
+logger = getLogger("uvicorn.error")
+
+
+class StartupTimer:
+    """
+    Times the steps a worker takes before it serves requests.
+
+    Time is counted from the start of the worker process when the gunicorn
+    worker marked it, otherwise from the creation of the timer.
+    """
+
+    process_started: Optional[float] = None
+
+    def __init__(self) -> None:
+        self.started = StartupTimer.process_started or time.perf_counter()
+        self.steps: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+
+    @classmethod
+    def mark_process_start(cls) -> None:
+        cls.process_started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - started
+
+    def ready(self) -> float:
+        """Records and logs the time the worker took to become ready."""
+        self.ready_after = time.perf_counter() - self.started
+        logger.info(
+            "Worker %s ready in %.3fs (%s)",
+            os.getpid(),
+            self.ready_after,
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.steps.items()),
+        )
+        return self.ready_after
@@ -0,0 +1,121 @@
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+import pytest
+from fastapi_mail import MessageSchema
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from zoneinfo import ZoneInfo
+
+from ga_api.db.models.appointment_reminder_model import AppointmentReminder
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.users import User
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.services.appointment_reminder_job import AppointmentReminderJob
+from ga_api.settings import settings
+from tests.utils import inject_default_professional
+
+DAY = date(2030, 5, 10)
+TIMEZONE = ZoneInfo(settings.reminder_timezone)
+
+
+class FakeMailService:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.sent: List[MessageSchema] = []
+
+    async def send_message(self, message: MessageSchema) -> None:
+        if self.fail:
+            raise ConnectionError("smtp is down")
+        self.sent.append(message)
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute), tzinfo=TIMEZONE)
+
+
+async def create_appointments(dbsession: AsyncSession) -> List[Availability]:
+    professional = await inject_default_professional(dbsession)
+    patient = User(
+        email="patient@mail.com",
+        hashed_password="x",  # noqa: S106
+        cpf="555.555.555-55",
+        full_name="Paula",
+    )
+    dbsession.add(patient)
+    await dbsession.flush()
+
+    slots = [
+        (at(DAY, 9), AvailabilityStatus.TAKEN),
+        (at(DAY, 23, 30), AvailabilityStatus.TAKEN),
+        (at(DAY, 10), AvailabilityStatus.AVAILABLE),
+        (at(DAY, 11), AvailabilityStatus.CANCELED),
+        (at(DAY + timedelta(days=1), 0, 30), AvailabilityStatus.TAKEN),
+    ]
+    availabilities = [
+        Availability(
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            status=status,
+            professional_id=professional.id,
+            patient_id=patient.id,
+        )
+        for start, status in slots
+    ]
+    dbsession.add_all(availabilities)
+    await dbsession.flush()
+    return availabilities
+
+
+def build_job(
+    dbsession: AsyncSession,
+    mail_service: FakeMailService,
+) -> AppointmentReminderJob:
+    return AppointmentReminderJob(
+        dbsession.bind,  # type: ignore
+        async_sessionmaker(dbsession.bind, expire_on_commit=False),
+        mail_service,  # type: ignore
+    )
+
+
+@pytest.mark.anyio
+async def test_reminders_are_sent_once(dbsession: AsyncSession) -> None:
+    availabilities = await create_appointments(dbsession)
+    mail_service = FakeMailService()
+    job = build_job(dbsession, mail_service)
+
+    assert await job.send_reminders(DAY) == 2
+    assert await job.send_reminders(DAY) == 0
+
+    assert [m.recipients for m in mail_service.sent] == [["patient@mail.com"]] * 2
+    assert "09:00" in mail_service.sent[0].body
+    assert "23:30" in mail_service.sent[1].body
+    assert "John" in mail_service.sent[0].body
+    reminded = (await dbsession.execute(select(AppointmentReminder))).scalars().all()
+    assert {r.availability_id for r in reminded} == {
+        availabilities[0].id,
+        availabilities[1].id,
+    }
+
+
+@pytest.mark.anyio
+async def test_reminders_in_batches(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "reminder_batch_size", 1)
+    await create_appointments(dbsession)
+    mail_service = FakeMailService()
+
+    assert await build_job(dbsession, mail_service).send_reminders(DAY) == 2
+
+
+@pytest.mark.anyio
+async def test_failed_reminders_are_retried(dbsession: AsyncSession) -> None:
+    await create_appointments(dbsession)
+    mail_service = FakeMailService(fail=True)
+    job = build_job(dbsession, mail_service)
+
+    assert await job.send_reminders(DAY) == 0
+    mail_service.fail = False
+    assert await job.send_reminders(DAY) == 2
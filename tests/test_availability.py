@@ -1253,3 +1253,74 @@ async def test_get_availabilities_patient_returns_only_available_future(
     assert datetime.fromisoformat(data[0]["start_time"]).replace(
         tzinfo=None
     ) > now.replace(tzinfo=None)
+
+
+@pytest.mark.anyio
+async def test_cancel_availabilities_of_a_range(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    admin_token: str = await login_user_admin(client)
+    professional: Professional = await inject_default_professional(dbsession)
+    dao = AvailabilityDAO(dbsession)
+    start = datetime(2099, 3, 2, 8, tzinfo=timezone.utc)
+    availabilities = [
+        AvailabilityFactory.create_availability_model(
+            professional.id,
+            start_time=start + timedelta(hours=hour),
+            end_time=start + timedelta(hours=hour + 1),
+            status=status_,
+        )
+        for hour, status_ in (
+            (0, AvailabilityStatus.AVAILABLE),
+            (1, AvailabilityStatus.TAKEN),
+            (2, AvailabilityStatus.COMPLETED),
+            (5, AvailabilityStatus.AVAILABLE),
+        )
+    ]
+    await save_and_expect(dao, availabilities, 4)
+
+    response: Response = await client.post(
+        f"{AVAILABILITY_URL}cancel",
+        json={
+            "professional_id": str(professional.id),
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=4)).isoformat(),
+        },
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["canceled"] == 2
+    assert set(body["ids"]) == {str(a.id) for a in availabilities[:2]}
+    # the loaded objects are refreshed by the update
+    assert [a.status for a in availabilities] == [
+        AvailabilityStatus.CANCELED,
+        AvailabilityStatus.CANCELED,
+        AvailabilityStatus.COMPLETED,
+        AvailabilityStatus.AVAILABLE,
+    ]
+
+
+@pytest.mark.anyio
+async def test_cancel_availabilities_with_inverted_range_returns_bad_request(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    admin_token: str = await login_user_admin(client)
+    start = datetime(2099, 3, 2, 8, tzinfo=timezone.utc)
+
+    response: Response = await client.post(
+        f"{AVAILABILITY_URL}cancel",
+        json={
+            "professional_id": str(uuid.uuid4()),
+            "start_time": start.isoformat(),
+            "end_time": (start - timedelta(hours=1)).isoformat(),
+        },
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
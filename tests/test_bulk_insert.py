@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.dao.dummy_dao import DummyDAO
+from ga_api.db.dao.speciality_dao import SpecialityDAO
+from ga_api.db.entity_cache import _was_written
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.dummy_model import DummyModel
+from ga_api.db.models.speciality_model import Speciality
+from ga_api.db.session import has_pending_writes
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.settings import settings
+from tests.utils import inject_default_professional
+
+START = datetime(2099, 6, 1, 8, tzinfo=timezone.utc)
+
+
+def slots(professional_id: object, count: int) -> list[dict[str, object]]:
+    return [
+        {
+            "professional_id": professional_id,
+            "start_time": START + timedelta(hours=hour),
+            "end_time": START + timedelta(hours=hour + 1),
+        }
+        for hour in range(count)
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("copy_threshold", [0, 1])
+async def test_bulk_insert_fills_defaults(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    copy_threshold: int,
+) -> None:
+    monkeypatch.setattr(settings, "db_bulk_insert_copy_threshold", copy_threshold)
+    professional = await inject_default_professional(dbsession)
+
+    result = await AvailabilityDAO(dbsession).bulk_insert(slots(professional.id, 3))
+
+    assert len(result.inserted) == 3
+    assert result.conflicts == []
+    rows = await dbsession.execute(
+        select(Availability.id, Availability.status, Availability.created_at)
+        .where(Availability.professional_id == professional.id)
+        .order_by(Availability.start_time),
+    )
+    assert [(row.id,) for row in rows] == result.inserted
+    statuses = await dbsession.execute(
+        select(func.count()).where(
+            Availability.professional_id == professional.id,
+            Availability.status == AvailabilityStatus.AVAILABLE,
+            Availability.created_at.is_not(None),
+        ),
+    )
+    assert statuses.scalar_one() == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("copy_threshold", [0, 1])
+async def test_bulk_insert_returns_generated_keys(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    copy_threshold: int,
+) -> None:
+    monkeypatch.setattr(settings, "db_bulk_insert_copy_threshold", copy_threshold)
+    names = ["c", "a", "b"]
+    dao = DummyDAO(dbsession)
+
+    result = await dao.bulk_insert([{"name": name, "age": 1} for name in names])
+
+    assert result.conflicts == []
+    rows = await dbsession.execute(select(DummyModel.id, DummyModel.name))
+    by_id = {row.id: row.name for row in rows}
+    assert [by_id[key] for (key,) in result.inserted] == names
+    with pytest.raises(ValueError):
+        await dao.bulk_insert([{"name": "d", "age": 1}], ignore_conflicts=True)
+
+
+@pytest.mark.anyio
+async def test_bulk_insert_reports_conflicts(dbsession: AsyncSession) -> None:
+    dao = SpecialityDAO(dbsession)
+    await dao.bulk_insert([{"title": "Cardiology"}])
+
+    result = await dao.bulk_insert(
+        [{"title": "Neurology"}, {"title": "Cardiology"}, {"title": "Oncology"}],
+        ignore_conflicts=True,
+    )
+
+    assert len(result.inserted) == 2
+    assert result.conflicts == [1]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("copy_threshold", [0, 1])
+async def test_bulk_insert_conflict_fails_the_batch(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+    copy_threshold: int,
+) -> None:
+    monkeypatch.setattr(settings, "db_bulk_insert_copy_threshold", copy_threshold)
+    dao = SpecialityDAO(dbsession)
+    await dao.bulk_insert([{"title": "Cardiology"}])
+
+    with pytest.raises(HTTPException) as error:
+        await dao.bulk_insert([{"title": "Neurology"}, {"title": "Cardiology"}])
+
+    assert error.value.status_code == 400
+    # rolled back with the transaction, COPY included
+    remaining = await dbsession.execute(select(func.count(Speciality.id)))
+    assert remaining.scalar_one() == 0
+
+
+@pytest.mark.anyio
+async def test_copied_rows_are_pending_writes(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "db_bulk_insert_copy_threshold", 1)
+    session = dbsession.sync_session
+    assert not has_pending_writes(session)
+
+    result = await SpecialityDAO(dbsession).bulk_insert([{"title": "Cardiology"}])
+
+    assert has_pending_writes(session)
+    [(speciality_id,)] = result.inserted
+    # invalidated in the entity cache on commit, as flushed rows are
+    assert _was_written(session, Speciality, speciality_id)
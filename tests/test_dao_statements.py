@@ -0,0 +1,149 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO, _not_blocked_statement
+from ga_api.db.dao.block_dao import BlockDAO
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.loader import _find_by_ids_statement
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.block_model import Block
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.users import User
+from ga_api.enums.availability_status import AvailabilityStatus
+from tests.factories.availability_factory import AvailabilityFactory
+from tests.utils import inject_default_professional
+
+START = datetime(2099, 1, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.anyio
+async def test_find_by_id_reuses_its_statement(dbsession: AsyncSession) -> None:
+    professional = await inject_default_professional(dbsession)
+    dao = ProfessionalDAO(dbsession)
+
+    assert await dao.find_by_id(professional.id) is professional
+    assert await dao.find_by_id(uuid.uuid4()) is None
+    assert _find_by_ids_statement(Professional) is _find_by_ids_statement(Professional)
+
+
+@pytest.mark.anyio
+async def test_exists_with_filters(dbsession: AsyncSession) -> None:
+    professional = await inject_default_professional(dbsession)
+    dao = ProfessionalDAO(dbsession)
+
+    assert await dao.exists(email=professional.email)
+    assert await dao.exists(email=professional.email, full_name="John")
+    assert not await dao.exists(email=professional.email, full_name="Jane")
+    assert not await dao.exists(email="nobody@mail.com")
+
+
+@pytest.mark.anyio
+async def test_check_double_appointment_and_overlaps(dbsession: AsyncSession) -> None:
+    professional = await inject_default_professional(dbsession)
+    admin = (
+        await dbsession.execute(select(User).where(User.is_superuser))
+    ).scalar_one()
+    availability = AvailabilityFactory.create_availability_model(
+        professional_id=professional.id,
+        start_time=START,
+        end_time=START + timedelta(hours=1),
+        status=AvailabilityStatus.TAKEN,
+    )
+    availability.patient_id = admin.id
+    dao = AvailabilityDAO(dbsession)
+    await dao.save(availability)
+
+    half_past = START + timedelta(minutes=30)
+    later = START + timedelta(hours=2)
+    assert await dao.check_double_appointment(admin.id, half_past, later)
+    assert not await dao.check_double_appointment(admin.id, later, later)
+    assert not await dao.check_double_appointment(uuid.uuid4(), half_past, later)
+
+    assert await dao.overlaps(half_past, later)
+    assert not await dao.overlaps(half_past, later, exclude_id=availability.id)
+
+
+@pytest.mark.anyio
+async def test_find_all_not_blocked_filters(dbsession: AsyncSession) -> None:
+    professional = await inject_default_professional(dbsession)
+    dao = AvailabilityDAO(dbsession)
+    free, blocked, taken = (
+        Availability(
+            professional_id=professional.id,
+            start_time=START + timedelta(hours=hour),
+            end_time=START + timedelta(hours=hour + 1),
+            status=status,
+        )
+        for hour, status in (
+            (0, AvailabilityStatus.AVAILABLE),
+            (2, AvailabilityStatus.AVAILABLE),
+            (4, AvailabilityStatus.TAKEN),
+        )
+    )
+    await dao.save_all([free, blocked, taken])
+    await BlockDAO(dbsession).save(
+        Block(
+            professional_id=professional.id,
+            start_time=blocked.start_time,
+            end_time=blocked.end_time,
+        ),
+    )
+
+    everything = await dao.find_all_not_blocked(limit=10, offset=0)
+    assert {availability.id for availability in everything} == {free.id, taken.id}
+    assert await dao.find_all_not_blocked(
+        limit=10,
+        offset=0,
+        professional_id=professional.id,
+        status=AvailabilityStatus.AVAILABLE,
+    ) == [free]
+    assert await dao.find_all_not_blocked(
+        limit=10,
+        offset=0,
+        after=START + timedelta(hours=3),
+    ) == [taken]
+    assert len(await dao.find_all_not_blocked(limit=1, offset=1)) == 1
+    assert _not_blocked_statement(True, True, False) is _not_blocked_statement(
+        True,
+        True,
+        False,
+    )
+
+
+@pytest.mark.anyio
+async def test_update_and_delete_where(dbsession: AsyncSession) -> None:
+    professional = await inject_default_professional(dbsession)
+    dao = BlockDAO(dbsession)
+    blocks = [
+        Block(
+            professional_id=professional.id,
+            start_time=START + timedelta(days=day),
+            end_time=START + timedelta(days=day, hours=1),
+            reason="course",
+        )
+        for day in range(3)
+    ]
+    await dao.save_all(blocks)
+
+    updated = await dao.update_where(
+        {"id": [blocks[0].id, blocks[1].id]},
+        {"reason": "vacation"},
+    )
+    assert set(updated) == {blocks[0].id, blocks[1].id}
+    # objects already in the session get the new values
+    assert [block.reason for block in blocks] == ["vacation", "vacation", "course"]
+
+    deleted = await dao.delete_where(
+        {"professional_id": professional.id},
+        Block.start_time > START,
+    )
+    assert set(deleted) == {blocks[1].id, blocks[2].id}
+    remaining = await dao.find_all_by_professional_id(professional.id)
+    assert remaining == [blocks[0]]
+
+    with pytest.raises(ValueError, match="filter"):
+        await dao.delete_where({})
@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import literal, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from ga_api.db.models.users import User
+from ga_api.db.pool import InstrumentedPool, create_pooled_engine, engine_options
+from ga_api.db.session import released_connection
+from ga_api.settings import settings
+from tests.utils import login_user_admin
+
+
+@pytest.fixture
+async def instrumented_engine(_engine: AsyncEngine) -> Any:
+    engine = create_async_engine(
+        str(settings.db_url),
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_released_connection_returns_it_to_the_pool(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    pool = instrumented_engine.pool
+    session_factory = async_sessionmaker(instrumented_engine, expire_on_commit=False)
+    async with session_factory() as session:
+        admin = (
+            await session.execute(select(User).where(User.is_superuser))
+        ).scalar_one()
+        assert pool.checkedout() == 1
+
+        async with released_connection(session):
+            assert pool.checkedout() == 0
+            assert not session.in_transaction()
+
+        # loaded objects stay usable and the next query reconnects
+        assert admin.email == "admin@admin.com"
+        assert (await session.execute(select(User.id))).first() is not None
+        assert pool.checkedout() == 1
+
+
+@pytest.mark.anyio
+async def test_released_connection_lets_others_use_the_pool(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    session_factory = async_sessionmaker(instrumented_engine)
+
+    async def slow_external_call() -> None:
+        async with session_factory() as session:
+            await session.execute(select(User.id))
+            async with released_connection(session):
+                await asyncio.sleep(0.5)
+
+    async def query() -> None:
+        async with session_factory() as session:
+            await session.execute(select(User.id))
+
+    slow = asyncio.create_task(slow_external_call())
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(query(), timeout=0.3)
+    await slow
+
+
+@pytest.mark.anyio
+async def test_pool_records_checkout_waits(
+    instrumented_engine: AsyncEngine,
+) -> None:
+    pool = instrumented_engine.pool
+    assert isinstance(pool, InstrumentedPool)
+
+    async def hold_connection() -> None:
+        async with instrumented_engine.connect():
+            await asyncio.sleep(0.2)
+
+    holder = asyncio.create_task(hold_connection())
+    await asyncio.sleep(0.05)
+    async with instrumented_engine.connect():
+        pass
+    await holder
+
+    assert pool.wait_stats.checkouts == 2
+    assert pool.wait_stats.max_wait >= 0.1
+    assert pool.wait_stats.slow_checkouts == 1
+
+
+@pytest.mark.anyio
+async def test_db_pool_status(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    instrumented_engine: AsyncEngine,
+) -> None:
+    fastapi_app.state.db_engine = instrumented_engine
+    token = await login_user_admin(client)
+
+    response = await client.get(
+        "/api/admin/monitoring/db-pool",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "name": "primary",
+            "size": 1,
+            "checked_out": 0,
+            "overflow": 0,
+            "checkouts": 0,
+            "mean_wait": 0.0,
+            "max_wait": 0.0,
+            "slow_checkouts": 0,
+        },
+    ]
+
+
+def test_engine_options_follow_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_pool_max_overflow", 0)
+    monkeypatch.setattr(settings, "db_pool_timeout", 2.5)
+    monkeypatch.setattr(settings, "db_pool_recycle", 600)
+    monkeypatch.setattr(settings, "db_pool_pre_ping", True)
+
+    options = engine_options()
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 0
+    assert options["pool_timeout"] == 2.5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    connect_args = engine_options()["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+@pytest.mark.anyio
+async def test_pgbouncer_mode_keeps_no_prepared_statements(
+    _engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    engine = create_pooled_engine(settings.db_url, pool_size=1, max_overflow=0)
+    try:
+        async with engine.connect() as connection:
+            for number in range(5):
+                result = await connection.execute(select(literal(number)))
+                assert result.scalar_one() == number
+            prepared = await connection.execute(
+                text("SELECT name FROM pg_prepared_statements"),
+            )
+            # only the statement just executed, under a name of its own
+            assert len(prepared.all()) <= 1
+    finally:
+        await engine.dispose()
+
+
+def test_direct_url_defaults_to_the_database(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert settings.db_direct_url == settings.db_url
+
+    monkeypatch.setattr(settings, "db_direct_host", "postgres.internal")
+    monkeypatch.setattr(settings, "db_direct_port", 5433)
+
+    assert settings.db_direct_url.host == "postgres.internal"
+    assert settings.db_direct_url.port == 5433
@@ -0,0 +1,156 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Dict
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import delete, event, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette import status
+from starlette.exceptions import HTTPException
+
+from ga_api.db.dependencies import get_db_session
+from ga_api.db.models.rate_limit_hit_model import RateLimitHit
+
+KEY = f"test:{uuid.uuid4()}"
+
+
+def build_app(engine: AsyncEngine) -> FastAPI:
+    app = FastAPI()
+    app.state.db_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.db_read_session_factory = async_sessionmaker(
+        engine.execution_options(postgresql_readonly=True),
+        expire_on_commit=False,
+    )
+
+    @app.get("/unused")
+    async def unused(session: AsyncSession = Depends(get_db_session)) -> None:
+        """Declares a session without querying it."""
+
+    @app.get("/read-only")
+    async def read_only(session: AsyncSession = Depends(get_db_session)) -> str:
+        return (await session.execute(text("SHOW transaction_read_only"))).scalar_one()
+
+    @app.get("/write")
+    @app.post("/write")
+    async def write(session: AsyncSession = Depends(get_db_session)) -> None:
+        session.add(RateLimitHit(key=KEY, hit_at=datetime.now(timezone.utc)))
+        await session.flush()
+
+    @app.post("/select")
+    async def select_only(session: AsyncSession = Depends(get_db_session)) -> int:
+        return (await session.execute(select(1))).scalar_one()
+
+    @app.post("/write-then-fail")
+    async def write_then_fail(session: AsyncSession = Depends(get_db_session)) -> None:
+        session.add(RateLimitHit(key=KEY, hit_at=datetime.now(timezone.utc)))
+        await session.flush()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    return app
+
+
+@pytest.fixture
+async def counters(_engine: AsyncEngine) -> AsyncGenerator[Dict[str, int], None]:
+    counts = {"checkout": 0, "commit": 0}
+
+    def on_checkout(*args: Any) -> None:
+        counts["checkout"] += 1
+
+    def on_commit(*args: Any) -> None:
+        counts["commit"] += 1
+
+    event.listen(_engine.sync_engine.pool, "checkout", on_checkout)
+    event.listen(_engine.sync_engine, "commit", on_commit)
+    try:
+        yield counts
+    finally:
+        event.remove(_engine.sync_engine.pool, "checkout", on_checkout)
+        event.remove(_engine.sync_engine, "commit", on_commit)
+        async with _engine.begin() as connection:
+            await connection.execute(
+                delete(RateLimitHit).where(RateLimitHit.key == KEY),
+            )
+
+
+@pytest.fixture
+async def session_client(
+    _engine: AsyncEngine,
+    anyio_backend: Any,
+) -> AsyncGenerator[AsyncClient, None]:
+    app = build_app(_engine)
+    async with AsyncClient(app=app, base_url="http://test", timeout=2.0) as ac:
+        yield ac
+
+
+async def count_hits(engine: AsyncEngine) -> int:
+    async with engine.connect() as connection:
+        query = select(func.count()).where(RateLimitHit.key == KEY)
+        return (await connection.execute(query)).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_unused_session_checks_out_no_connection(
+    session_client: AsyncClient,
+    counters: Dict[str, int],
+) -> None:
+    response = await session_client.get("/unused")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert counters == {"checkout": 0, "commit": 0}
+
+
+@pytest.mark.anyio
+async def test_safe_methods_are_read_only_and_not_committed(
+    session_client: AsyncClient,
+    counters: Dict[str, int],
+) -> None:
+    response = await session_client.get("/read-only")
+
+    assert response.json() == "on"
+    assert counters == {"checkout": 1, "commit": 0}
+
+
+@pytest.mark.anyio
+async def test_safe_methods_cannot_write(session_client: AsyncClient) -> None:
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        await session_client.get("/write")
+
+
+@pytest.mark.anyio
+async def test_requests_without_writes_are_not_committed(
+    session_client: AsyncClient,
+    counters: Dict[str, int],
+) -> None:
+    response = await session_client.post("/select")
+
+    assert response.json() == 1
+    assert counters["commit"] == 0
+
+
+@pytest.mark.anyio
+async def test_writes_are_committed(
+    session_client: AsyncClient,
+    counters: Dict[str, int],
+    _engine: AsyncEngine,
+) -> None:
+    response = await session_client.post("/write")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert counters["commit"] == 1
+    assert await count_hits(_engine) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_requests_are_rolled_back(
+    session_client: AsyncClient,
+    counters: Dict[str, int],
+    _engine: AsyncEngine,
+) -> None:
+    response = await session_client.post("/write-then-fail")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert counters["commit"] == 0
+    assert await count_hits(_engine) == 0
@@ -0,0 +1,223 @@
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette import status
+
+from ga_api.db.dao.email_outbox_dao import EmailOutboxDAO
+from ga_api.db.leader import EMAIL_OUTBOX_LOCK_KEY, AdvisoryLockLeader
+from ga_api.db.models.email_outbox_model import EmailOutbox
+from ga_api.enums.email_kind import EmailKind
+from ga_api.enums.email_status import EmailStatus
+from ga_api.services.email_outbox_dispatcher import EmailOutboxDispatcher
+from ga_api.settings import settings
+from tests.utils import CapturingMailService, login_user, login_user_admin
+
+REGISTER_PATIENT_URI = "/api/admin/users/register-patient"
+
+
+class FakeMailService:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.sent: List[str] = []
+
+    async def send_outbox_message(
+        self,
+        message: EmailOutbox,
+        session: AsyncSession,
+    ) -> None:
+        if self.fail:
+            raise ConnectionError("smtp is down")
+        self.sent.append(message.recipient)
+
+
+def build_dispatcher(engine: AsyncEngine, mail_service: FakeMailService):
+    return EmailOutboxDispatcher(
+        engine,
+        async_sessionmaker(engine),
+        mail_service,  # type: ignore
+    )
+
+
+async def get_outbox(dbsession: AsyncSession) -> List[EmailOutbox]:
+    result = await dbsession.execute(select(EmailOutbox))
+    return list(result.scalars().all())
+
+
+@pytest.mark.anyio
+async def test_register_patient_queues_first_access_email(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+
+    response = await client.post(
+        REGISTER_PATIENT_URI,
+        json={"email": "patient@mail.com", "cpf": "987.654.321-00", "full_name": "P"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    outbox = await get_outbox(dbsession)
+    assert len(outbox) == 1
+    assert outbox[0].recipient == "patient@mail.com"
+    assert outbox[0].kind == EmailKind.FIRST_ACCESS
+    assert outbox[0].status == EmailStatus.PENDING
+    assert outbox[0].payload == {}
+
+
+@pytest.mark.anyio
+async def test_register_existing_patient_does_not_queue_email(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+
+    response = await client.post(
+        REGISTER_PATIENT_URI,
+        json={"email": "admin@admin.com", "cpf": "987.654.321-00", "full_name": "P"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert await get_outbox(dbsession) == []
+
+
+@pytest.mark.anyio
+async def test_dispatch_batch_sends_and_marks_sent(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    dao = EmailOutboxDAO(dbsession)
+    await dao.enqueue(EmailKind.FIRST_ACCESS, "a@mail.com", {})
+    await dao.enqueue(EmailKind.FIRST_ACCESS, "b@mail.com", {})
+    mail_service = FakeMailService()
+
+    claimed = await build_dispatcher(_engine, mail_service).dispatch_batch(dbsession)
+
+    assert claimed == 2
+    assert sorted(mail_service.sent) == ["a@mail.com", "b@mail.com"]
+    for message in await get_outbox(dbsession):
+        assert message.status == EmailStatus.SENT
+        assert message.sent_at is not None
+        assert message.payload == {}
+
+
+@pytest.mark.anyio
+async def test_first_access_password_is_created_when_sent(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+    await client.post(
+        REGISTER_PATIENT_URI,
+        json={"email": "patient@mail.com", "cpf": "987.654.321-00", "full_name": "P"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    mail_service = CapturingMailService()
+
+    await build_dispatcher(_engine, mail_service).dispatch_batch(dbsession)  # type: ignore
+    await dbsession.flush()
+
+    assert list(mail_service.passwords) == ["patient@mail.com"]
+    password = mail_service.passwords["patient@mail.com"]
+    assert await login_user(client, "patient@mail.com", password)
+
+
+@pytest.mark.anyio
+async def test_first_access_email_fails_without_pending_user(
+    fastapi_app: FastAPI,
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    message = await EmailOutboxDAO(dbsession).enqueue(
+        EmailKind.FIRST_ACCESS,
+        "admin@admin.com",
+        {},
+    )
+    mail_service = CapturingMailService()
+
+    await build_dispatcher(_engine, mail_service).dispatch_batch(dbsession)  # type: ignore
+
+    assert mail_service.passwords == {}
+    assert message.attempts == 1
+    assert "No user awaiting first access" in (message.last_error or "")
+
+
+@pytest.mark.anyio
+async def test_dispatch_batch_schedules_retry_on_failure(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    dao = EmailOutboxDAO(dbsession)
+    message = await dao.enqueue(EmailKind.FIRST_ACCESS, "a@mail.com", {})
+
+    await build_dispatcher(_engine, FakeMailService(fail=True)).dispatch_batch(
+        dbsession,
+    )
+
+    assert message.status == EmailStatus.PENDING
+    assert message.attempts == 1
+    assert message.last_error is not None
+    assert message.next_attempt_at > datetime.now(timezone.utc)
+    assert await dao.claim_pending(10) == []
+
+
+@pytest.mark.anyio
+async def test_dispatch_batch_gives_up_after_max_attempts(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    dao = EmailOutboxDAO(dbsession)
+    message = await dao.enqueue(EmailKind.FIRST_ACCESS, "a@mail.com", {})
+    message.attempts = settings.outbox_max_attempts - 1
+    await dbsession.flush()
+
+    await build_dispatcher(_engine, FakeMailService(fail=True)).dispatch_batch(
+        dbsession,
+    )
+
+    assert message.status == EmailStatus.FAILED
+    assert message.payload == {}
+
+
+@pytest.mark.anyio
+async def test_dispatch_batch_stops_when_circuit_opens(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    dao = EmailOutboxDAO(dbsession)
+    for i in range(settings.outbox_breaker_threshold + 2):
+        await dao.enqueue(EmailKind.FIRST_ACCESS, f"{i}@mail.com", {})
+    dispatcher = build_dispatcher(_engine, FakeMailService(fail=True))
+
+    await dispatcher.dispatch_batch(dbsession)
+
+    attempted = [m for m in await get_outbox(dbsession) if m.attempts]
+    assert len(attempted) == settings.outbox_breaker_threshold
+    assert await dispatcher.dispatch_batch(dbsession) == 0
+
+
+@pytest.mark.anyio
+async def test_only_one_worker_becomes_outbox_leader(_engine: AsyncEngine) -> None:
+    first = AdvisoryLockLeader(_engine, EMAIL_OUTBOX_LOCK_KEY)
+    second = AdvisoryLockLeader(_engine, EMAIL_OUTBOX_LOCK_KEY)
+
+    try:
+        assert await first.try_acquire()
+        assert await first.try_acquire()
+        assert not await second.try_acquire()
+
+        await first.release()
+        assert await second.try_acquire()
+    finally:
+        await first.release()
+        await second.release()
@@ -0,0 +1,203 @@
+import asyncio
+import uuid
+from typing import Any, AsyncIterator, Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.entity_cache import EntityCache, EntityCacheListener, entity_cache
+from ga_api.db.models.professionals_model import Professional
+from ga_api.db.models.speciality_model import Speciality
+from ga_api.settings import settings
+
+
+@pytest.fixture
+def cache() -> Iterator[EntityCache]:
+    entity_cache.activate()
+    yield entity_cache
+    entity_cache.deactivate()
+
+
+@pytest.fixture
+def statements(_engine: AsyncEngine) -> Iterator[List[str]]:
+    executed: List[str] = []
+
+    def record(*args: Any) -> None:
+        executed.append(args[2])
+
+    event.listen(_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(_engine.sync_engine, "before_cursor_execute", record)
+
+
+async def inject_professional(dbsession: AsyncSession) -> uuid.UUID:
+    professional = Professional(
+        full_name="John",
+        email="john@mail.com",
+        specialities=[Speciality(title="Cardiology")],
+    )
+    dbsession.add(professional)
+    await dbsession.commit()
+    dbsession.expunge_all()
+    return professional.id
+
+
+async def cached_professional(dbsession: AsyncSession) -> uuid.UUID:
+    professional_id = await inject_professional(dbsession)
+    await ProfessionalDAO(dbsession).find_by_id(professional_id)
+    dbsession.expunge_all()
+    return professional_id
+
+
+@pytest.mark.anyio
+async def test_hits_are_rebuilt_without_a_query(
+    dbsession: AsyncSession,
+    cache: EntityCache,
+    statements: List[str],
+) -> None:
+    professional_id = await cached_professional(dbsession)
+    statements.clear()
+
+    professional = await ProfessionalDAO(dbsession).find_by_id(professional_id)
+
+    assert statements == []
+    assert professional is not None
+    assert professional.full_name == "John"
+    assert [speciality.title for speciality in professional.specialities] == [
+        "Cardiology",
+    ]
+    assert professional in dbsession
+    assert cache.hits == 1
+
+
+@pytest.mark.anyio
+async def test_inactive_cache_is_not_used(
+    dbsession: AsyncSession,
+    statements: List[str],
+) -> None:
+    professional_id = await cached_professional(dbsession)
+    statements.clear()
+
+    assert await ProfessionalDAO(dbsession).find_by_id(professional_id) is not None
+    assert statements != []
+    assert len(entity_cache) == 0
+
+
+@pytest.mark.anyio
+async def test_committed_changes_invalidate_the_row(
+    dbsession: AsyncSession,
+    cache: EntityCache,
+) -> None:
+    professional_id = await cached_professional(dbsession)
+    dao = ProfessionalDAO(dbsession)
+    professional = await dao.find_by_id(professional_id)
+    professional.full_name = "Jane"  # type: ignore[union-attr]
+    await dbsession.commit()
+    dbsession.expunge_all()
+
+    reloaded = await dao.find_by_id(professional_id)
+
+    assert reloaded.full_name == "Jane"  # type: ignore[union-attr]
+
+
+@pytest.mark.anyio
+async def test_set_based_writes_are_not_served(
+    dbsession: AsyncSession,
+    cache: EntityCache,
+    statements: List[str],
+) -> None:
+    professional_id = await cached_professional(dbsession)
+    dao = ProfessionalDAO(dbsession)
+
+    await dao.update_where({"id": professional_id}, {"full_name": "Jane"})
+    dbsession.expunge_all()
+    statements.clear()
+    # not committed: the transaction sees its own write, not the cached row
+    professional = await dao.find_by_id(professional_id)
+
+    assert statements != []
+    assert professional.full_name == "Jane"  # type: ignore[union-attr]
+    await dbsession.commit()
+    assert cache.get(dbsession.sync_session, Professional, professional_id) is None
+    # the professional's speciality was not written
+    assert len(cache) == 1
+
+
+@pytest.mark.anyio
+async def test_rows_expire_and_are_evicted(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [0.0]
+    cache = EntityCache(clock=lambda: now[0])
+    cache.activate()
+    monkeypatch.setattr(settings, "entity_cache_ttl", 10.0)
+    monkeypatch.setattr(settings, "entity_cache_max_size", 2)
+    specialities = [Speciality(title=title) for title in ["A", "B", "C"]]
+    dbsession.add_all(specialities)
+    await dbsession.commit()
+    session = dbsession.sync_session
+
+    for speciality in specialities:
+        cache.put(session, speciality, cache.generation)
+
+    assert len(cache) == 2
+    assert cache.get(session, Speciality, specialities[0].id) is None
+    assert cache.get(session, Speciality, specialities[2].id).title == "C"  # type: ignore
+    now[0] = 10.0
+    assert cache.get(session, Speciality, specialities[2].id) is None
+    assert len(cache) == 1
+
+
+@pytest.mark.anyio
+async def test_rows_read_before_a_write_are_not_stored(
+    dbsession: AsyncSession,
+) -> None:
+    cache = EntityCache()
+    cache.activate()
+    speciality = Speciality(title="A")
+    dbsession.add(speciality)
+    await dbsession.commit()
+
+    generation = cache.generation
+    cache.invalidate(Speciality, [uuid.uuid4()])
+    cache.put(dbsession.sync_session, speciality, generation)
+
+    assert len(cache) == 0
+
+
+@pytest.fixture
+async def listeners(
+    _engine: AsyncEngine,
+) -> AsyncIterator[List[EntityCacheListener]]:
+    started = [EntityCacheListener(_engine, EntityCache()) for _ in range(2)]
+    for listener in started:
+        listener.start()
+    await asyncio.gather(*(listener.connected.wait() for listener in started))
+    yield started
+    for listener in started:
+        await listener.stop()
+
+
+@pytest.mark.anyio
+async def test_writes_reach_the_other_workers(
+    dbsession: AsyncSession,
+    listeners: List[EntityCacheListener],
+) -> None:
+    caches = [listener._cache for listener in listeners]  # noqa: SLF001
+    speciality = Speciality(title="A")
+    dbsession.add(speciality)
+    await dbsession.commit()
+    for cache in caches:
+        cache.put(dbsession.sync_session, speciality, cache.generation)
+
+    caches[0].publish(Speciality, {speciality.id})
+
+    assert len(caches[0]) == 0
+    for _ in range(100):
+        if not len(caches[1]):
+            break
+        await asyncio.sleep(0.01)
+    assert len(caches[1]) == 0
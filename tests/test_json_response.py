@@ -0,0 +1,92 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi.responses import UJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ga_api.db.models.availability_model import Availability
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.web.api.availability.response.availability_response import (
+    AvailabilityResponse,
+)
+from ga_api.web.json_response import ModelListResponse
+from tests.utils import inject_default_professional
+
+START = datetime(2099, 1, 1, 10, tzinfo=timezone.utc)
+
+
+async def inject_availabilities(dbsession: AsyncSession) -> List[Availability]:
+    professional = await inject_default_professional(dbsession)
+    availabilities = [
+        Availability(
+            professional_id=professional.id,
+            start_time=START + timedelta(hours=hour),
+            end_time=START + timedelta(hours=hour, minutes=50),
+        )
+        for hour in range(3)
+    ]
+    dbsession.add_all(availabilities)
+    await dbsession.flush()
+    return availabilities
+
+
+@pytest.mark.anyio
+async def test_orm_objects_match_the_response_model_path(
+    dbsession: AsyncSession,
+) -> None:
+    availabilities = await inject_availabilities(dbsession)
+    field = create_model_field("Response", List[AvailabilityResponse])
+    content = await serialize_response(field=field, response_content=availabilities)
+
+    response = ModelListResponse(AvailabilityResponse, availabilities)
+
+    assert response.body == UJSONResponse(content).body
+    assert response.media_type == "application/json"
+
+
+@pytest.mark.anyio
+async def test_row_mappings_and_models_are_serialized(
+    dbsession: AsyncSession,
+) -> None:
+    availabilities = await inject_availabilities(dbsession)
+    rows = await dbsession.execute(
+        select(
+            Availability.id,
+            Availability.status,
+            Availability.start_time,
+            Availability.end_time,
+            Availability.professional_id,
+            Availability.patient_id,
+        ).order_by(Availability.start_time),
+    )
+    models = [AvailabilityResponse.model_validate(a) for a in availabilities]
+
+    from_rows = ModelListResponse(AvailabilityResponse, rows.mappings())
+    from_models = ModelListResponse(AvailabilityResponse, models)
+
+    assert json.loads(from_rows.body) == json.loads(from_models.body)
+    assert [item["id"] for item in json.loads(from_rows.body)] == [
+        str(a.id) for a in availabilities
+    ]
+
+
+def test_objects_missing_a_field_are_read_through_their_attributes() -> None:
+    availability = Availability(
+        id=uuid.uuid4(),
+        status=AvailabilityStatus.AVAILABLE,
+        start_time=START,
+        end_time=START + timedelta(hours=1),
+        professional_id=uuid.uuid4(),
+    )
+    assert "patient_id" not in availability.__dict__
+
+    [item] = json.loads(ModelListResponse(AvailabilityResponse, [availability]).body)
+
+    assert item["patient_id"] is None
+    assert item["status"] == "available"
@@ -0,0 +1,110 @@
+import asyncio
+import uuid
+from typing import Any, Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.models.professionals_model import Professional
+
+
+@pytest.fixture
+def statements(_engine: AsyncEngine) -> Iterator[List[str]]:
+    executed: List[str] = []
+
+    def record(*args: Any) -> None:
+        # leaves out the selectin loads of relationships
+        if "= ANY" in args[2]:
+            executed.append(args[2])
+
+    event.listen(_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(_engine.sync_engine, "before_cursor_execute", record)
+
+
+async def inject_professionals(dbsession: AsyncSession, count: int) -> List[uuid.UUID]:
+    professionals = [
+        Professional(full_name=f"Dr. {index}", email=f"dr{index}@mail.com")
+        for index in range(count)
+    ]
+    dbsession.add_all(professionals)
+    await dbsession.flush()
+    ids = [professional.id for professional in professionals]
+    dbsession.expunge_all()
+    return ids
+
+
+@pytest.mark.anyio
+async def test_gathered_lookups_share_one_query(
+    dbsession: AsyncSession,
+    statements: List[str],
+) -> None:
+    ids = await inject_professionals(dbsession, 3)
+    dao = ProfessionalDAO(dbsession)
+    missing = uuid.uuid4()
+
+    found = await asyncio.gather(
+        *(dao.find_by_id(obj_id) for obj_id in [*ids, ids[0], missing]),
+    )
+
+    assert [professional.id for professional in found[:3]] == ids  # type: ignore
+    assert found[3] is found[0]
+    assert found[4] is None
+    assert len(statements) == 1
+
+
+@pytest.mark.anyio
+async def test_loaded_objects_need_no_query(
+    dbsession: AsyncSession,
+    statements: List[str],
+) -> None:
+    ids = await inject_professionals(dbsession, 2)
+    dao = ProfessionalDAO(dbsession)
+    first = await dao.find_by_id(ids[0])
+    statements.clear()
+
+    assert await dao.find_by_id(ids[0]) is first
+    assert [p.id for p in await dao.find_all_by_ids([ids[0], ids[1], ids[0]])] == ids
+    assert len(statements) == 1
+
+
+@pytest.mark.anyio
+async def test_missing_ids_are_looked_up_again(dbsession: AsyncSession) -> None:
+    dao = ProfessionalDAO(dbsession)
+    obj_id = uuid.uuid4()
+    assert await dao.find_by_id(obj_id) is None
+
+    dbsession.add(Professional(id=obj_id, full_name="Late", email="late@mail.com"))
+    await dbsession.flush()
+    dbsession.expunge_all()
+
+    professional = await dao.find_by_id(obj_id)
+    assert professional is not None
+    assert professional.full_name == "Late"
+
+
+@pytest.mark.anyio
+async def test_deleted_objects_are_not_returned(dbsession: AsyncSession) -> None:
+    ids = await inject_professionals(dbsession, 1)
+    dao = ProfessionalDAO(dbsession)
+    professional = await dao.find_by_id(ids[0])
+
+    await dbsession.delete(professional)
+
+    assert await dao.find_by_id(ids[0]) is None
+
+
+@pytest.mark.anyio
+async def test_expired_objects_are_refreshed(dbsession: AsyncSession) -> None:
+    ids = await inject_professionals(dbsession, 1)
+    dao = ProfessionalDAO(dbsession)
+    professional = await dao.find_by_id(ids[0])
+    await dao.update_where({"id": ids[0]}, {"full_name": "Renamed"})
+    dbsession.expire(professional)  # type: ignore[arg-type]
+
+    reloaded = await dao.find_by_id(ids[0])
+
+    assert reloaded is professional
+    assert reloaded.full_name == "Renamed"  # type: ignore[union-attr]
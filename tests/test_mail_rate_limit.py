@@ -0,0 +1,181 @@
+import asyncio
+import uuid
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from starlette import status
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from ga_api.db.dao.rate_limit_hit_dao import RateLimitRule
+from ga_api.db.models.rate_limit_hit_model import RateLimitHit
+from ga_api.services.rate_limiter import MemoryRateLimitStore, PostgresRateLimitStore
+from ga_api.services.reset_password_throttle import ResetPasswordThrottle
+from ga_api.settings import settings
+from ga_api.web.api.mail.request.mail_request import MailRequest
+
+SEND_EMAIL_URI = "/api/mail/email"
+
+
+class FakeMailService:
+    def __init__(self, delay: float = 0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.sent: List[str] = []
+
+    async def send_email_reset_password(self, request: MailRequest) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("smtp is down")
+        self.sent.append(str(request.email))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def mail_service(fastapi_app: FastAPI) -> FakeMailService:
+    service = FakeMailService()
+    fastapi_app.state.mail_service = service
+    return service
+
+
+@pytest.mark.anyio
+async def test_memory_store_sliding_window() -> None:
+    clock = FakeClock()
+    store = MemoryRateLimitStore(clock=clock)
+    rule = RateLimitRule("key", limit=2, window=10)
+
+    assert await store.hit([rule]) is None
+    clock.now = 4
+    assert await store.hit([rule]) is None
+    clock.now = 6
+    assert await store.hit([rule]) == (rule, 4)
+    clock.now = 10
+    assert await store.hit([rule]) is None
+
+
+@pytest.mark.anyio
+async def test_memory_store_counts_all_rules_or_none() -> None:
+    store = MemoryRateLimitStore(clock=FakeClock())
+    loose = RateLimitRule("loose", limit=5, window=10)
+    strict = RateLimitRule("strict", limit=1, window=10)
+
+    assert await store.hit([loose, strict]) is None
+    assert await store.hit([loose, strict]) == (strict, 10)
+    for _ in range(4):
+        assert await store.hit([loose]) is None
+    assert await store.hit([loose]) == (loose, 10)
+
+
+@pytest.mark.anyio
+async def test_postgres_store_sliding_window(_engine: AsyncEngine) -> None:
+    store = PostgresRateLimitStore(async_sessionmaker(_engine))
+    key = f"test:{uuid.uuid4()}"
+    rule = RateLimitRule(key, limit=2, window=60)
+
+    try:
+        assert await store.hit([rule]) is None
+        assert await store.hit([rule]) is None
+        rejected = await store.hit([rule])
+        assert rejected is not None
+        assert rejected[0] == rule
+        assert 59 < rejected[1] <= 60
+
+        await store.forget_last(key)
+        assert await store.hit([rule]) is None
+    finally:
+        async with _engine.begin() as connection:
+            await connection.execute(
+                delete(RateLimitHit).where(RateLimitHit.key == key),
+            )
+
+
+@pytest.mark.anyio
+async def test_repeated_reset_requests_are_coalesced(
+    client: AsyncClient,
+    mail_service: FakeMailService,
+) -> None:
+    for _ in range(3):
+        response = await client.post(SEND_EMAIL_URI, json={"email": "a@mail.com"})
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert mail_service.sent == ["a@mail.com"]
+
+
+@pytest.mark.anyio
+async def test_reset_requests_over_ip_limit_get_429(
+    client: AsyncClient,
+    mail_service: FakeMailService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "mail_rate_limit_per_ip", 2)
+
+    responses = [
+        await client.post(SEND_EMAIL_URI, json={"email": f"u{i}@mail.com"})
+        for i in range(3)
+    ]
+
+    assert [r.status_code for r in responses] == [204, 204, 429]
+    assert int(responses[2].headers["Retry-After"]) > 0
+    assert mail_service.sent == ["u0@mail.com", "u1@mail.com"]
+
+
+@pytest.mark.anyio
+async def test_ip_limit_keys_on_the_forwarded_client(
+    fastapi_app: FastAPI,
+    mail_service: FakeMailService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "mail_rate_limit_per_ip", 2)
+    # as uvicorn serves the app; the test client connects from 127.0.0.1
+    app = ProxyHeadersMiddleware(fastapi_app, settings.forwarded_allow_ips)
+
+    async with AsyncClient(app=app, base_url="http://test", timeout=2.0) as proxy:
+        codes = [
+            (
+                await proxy.post(
+                    SEND_EMAIL_URI,
+                    json={"email": f"u{i}@mail.com"},
+                    headers={"X-Forwarded-For": client_ip},
+                )
+            ).status_code
+            for i, client_ip in enumerate(["1.1.1.1"] * 3 + ["2.2.2.2"])
+        ]
+
+    assert codes == [204, 204, 429, 204]
+
+
+@pytest.mark.anyio
+async def test_concurrent_reset_requests_share_one_send() -> None:
+    mail_service = FakeMailService(delay=0.05)
+    throttle = ResetPasswordThrottle(mail_service, MemoryRateLimitStore())  # type: ignore
+    request = MailRequest(email="a@mail.com")
+
+    await asyncio.gather(
+        *(throttle.send_email_reset_password(request, "1.2.3.4") for _ in range(5)),
+    )
+
+    assert mail_service.sent == ["a@mail.com"]
+
+
+@pytest.mark.anyio
+async def test_failed_reset_email_can_be_retried() -> None:
+    mail_service = FakeMailService(fail=True)
+    throttle = ResetPasswordThrottle(mail_service, MemoryRateLimitStore())  # type: ignore
+    request = MailRequest(email="a@mail.com")
+
+    with pytest.raises(ConnectionError):
+        await throttle.send_email_reset_password(request, "1.2.3.4")
+    mail_service.fail = False
+    await throttle.send_email_reset_password(request, "1.2.3.4")
+
+    assert mail_service.sent == ["a@mail.com"]
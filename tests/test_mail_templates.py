@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from ga_api.web.api.mail.request.mail_request import MailRequest
+from ga_api.web.api.mail.templates.template_factory import TemplateFactory
+from ga_api.web.api.mail.templates.template_registry import (
+    TemplateRegistry,
+    minify_html,
+)
+
+
+def test_minify_html_drops_indentation() -> None:
+    source = """
+    <div>
+        <p>Olá,   <strong>{{ name }}</strong></p>
+    </div>
+    """
+
+    assert minify_html(source) == "<div><p>Olá, <strong>{{ name }}</strong></p></div>"
+
+
+def test_registry_compiles_templates_once(tmp_path: Path) -> None:
+    (tmp_path / "hello.html").write_text("<p>\n    Olá {{ name }}\n</p>\n")
+    (tmp_path / "notes.md").write_text("not a template")
+
+    registry = TemplateRegistry(tmp_path, bytecode_cache_dir=tmp_path / "cache")
+
+    assert registry.get("hello.html") is registry.get("hello.html")
+    assert registry.render("hello.html", name="<Ana>") == "<p> Olá &lt;Ana&gt; </p>"
+    assert list((tmp_path / "cache").iterdir())
+    with pytest.raises(ValueError):
+        registry.get("notes.md")
+
+
+def test_render_many_matches_render(tmp_path: Path) -> None:
+    (tmp_path / "hello.txt").write_text("Olá {{ name }}")
+    registry = TemplateRegistry(tmp_path, bytecode_cache_dir=None)
+
+    bodies = registry.render_many("hello.txt", [{"name": "Ana"}, {"name": "<Bia>"}])
+
+    assert bodies == ["Olá Ana", "Olá <Bia>"]
+
+
+def test_first_access_templates() -> None:
+    request = MailRequest(email="p@mail.com")
+
+    single = TemplateFactory.create_first_access_password_template(request, "a&b<c")
+    batch = TemplateFactory.create_first_access_password_templates(
+        [(request, "a&b<c"), (MailRequest(email="q@mail.com"), "other")],
+    )
+
+    assert "a&amp;b&lt;c" in single.body
+    assert "p@mail.com" in single.body
+    assert "\n" not in single.body
+    assert batch[0].body == single.body
+    assert batch[1].recipients == ["q@mail.com"]
+
+
+def test_reset_password_template() -> None:
+    message = TemplateFactory.create_reset_password_template(
+        MailRequest(email="p@mail.com"),
+        "012345",
+    )
+
+    assert message.body == "Olá! O código para recuperar a senha é 012345"
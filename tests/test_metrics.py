@@ -0,0 +1,111 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ga_api.db.pool import create_pooled_engine
+from ga_api.settings import settings
+from ga_api.web.metrics import EventLoopMonitor
+
+
+def sample(name: str, labels: Optional[Dict[str, str]] = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+@pytest.mark.anyio
+async def test_requests_are_counted_by_route(client: AsyncClient) -> None:
+    health = {"method": "GET", "route": "/api/health", "status": "200"}
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("ga_api_http_requests_total", health)
+    before_unmatched = sample("ga_api_http_requests_total", unmatched)
+
+    await client.get("/api/health")
+    await client.get("/no/such/page")
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert sample("ga_api_http_requests_total", health) == before + 1
+    assert sample("ga_api_http_requests_total", unmatched) == before_unmatched + 1
+    assert (
+        'ga_api_http_request_duration_seconds_count{method="GET",route="/api/health"}'
+        in response.text
+    )
+
+
+@pytest.mark.anyio
+async def test_pool_usage_and_waits(_engine: AsyncEngine) -> None:
+    engine = create_pooled_engine(
+        settings.db_url,
+        pool_logging_name="metrics-test",
+        pool_size=1,
+        max_overflow=0,
+    )
+    labels = {"pool": "metrics-test"}
+    try:
+        async with engine.connect():
+            assert sample("ga_api_db_pool_checked_out", labels) == 1
+        assert sample("ga_api_db_pool_checked_out", labels) == 0
+        assert sample("ga_api_db_pool_wait_seconds_count", labels) == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_event_loop_lag() -> None:
+    monitor = EventLoopMonitor(interval=0.01)
+    before = sample("ga_api_event_loop_lag_seconds_sum")
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # blocks the loop
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert sample("ga_api_event_loop_lag_seconds_sum") - before >= 0.05
+
+
+WORKER = """
+from ga_api.metrics import HTTP_REQUESTS
+HTTP_REQUESTS.labels("GET", "/api/health", "200").inc()
+"""
+
+SCRAPE = """
+from prometheus_client import generate_latest
+from ga_api.metrics import metrics_registry
+print(generate_latest(metrics_registry()).decode())
+"""
+
+
+def test_workers_are_aggregated(tmp_path: Path) -> None:
+    env = {
+        **os.environ,
+        "GA_API_WORKERS_COUNT": "2",
+        "GA_API_METRICS_DIR": str(tmp_path),
+    }
+    for _ in range(2):
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", WORKER],
+            env=env,
+            check=True,
+        )
+
+    scrape = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", SCRAPE],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert (
+        'ga_api_http_requests_total{method="GET",route="/api/health",status="200"} 2.0'
+        in scrape.stdout
+    )
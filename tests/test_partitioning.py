@@ -0,0 +1,195 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO, _overlapping_statement
+from ga_api.db.meta import meta
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.partitioning import (
+    ensure_partitions,
+    is_partitioned,
+    migrate_to_partitioned,
+)
+from ga_api.db.utils import create_database, drop_database
+from ga_api.settings import settings
+from tests.factories.availability_factory import AvailabilityFactory
+from tests.utils import inject_default_professional
+
+MONTH = date(2099, 3, 1)
+START = datetime(2099, 3, 10, 10, tzinfo=timezone.utc)
+
+
+async def partition_of(dbsession: AsyncSession, availability_id: uuid.UUID) -> str:
+    result = await dbsession.execute(
+        text("SELECT tableoid::regclass::text FROM availabilities WHERE id = :id"),
+        {"id": availability_id},
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.anyio
+async def test_ensure_partitions_moves_rows_out_of_default(
+    dbsession: AsyncSession,
+) -> None:
+    professional = await inject_default_professional(dbsession)
+    availability = AvailabilityFactory.create_availability_model(
+        professional_id=professional.id,
+        start_time=START,
+        end_time=START + timedelta(hours=1),
+    )
+    await AvailabilityDAO(dbsession).save(availability)
+    assert await partition_of(dbsession, availability.id) == "availabilities_default"
+
+    connection = await dbsession.connection()
+    created = await ensure_partitions(connection, MONTH, date(2099, 4, 1))
+
+    assert created == ["availabilities_p2099_03", "availabilities_p2099_04"]
+    assert await partition_of(dbsession, availability.id) == "availabilities_p2099_03"
+    assert await ensure_partitions(connection, MONTH, MONTH) == []
+
+
+@pytest.mark.anyio
+async def test_overlap_check_reads_one_partition(dbsession: AsyncSession) -> None:
+    connection = await dbsession.connection()
+    await ensure_partitions(connection, date(2099, 2, 1), date(2099, 4, 1))
+    compiled = _overlapping_statement(False).compile(dialect=connection.dialect)
+    params = compiled.construct_params(
+        {
+            "start_time": START,
+            "end_time": START + timedelta(hours=1),
+            "earliest_start": START - timedelta(hours=2),
+        },
+    )
+    plan = await connection.exec_driver_sql(
+        f"EXPLAIN {compiled}",
+        tuple(params[name] for name in compiled.positiontup or ()),
+    )
+    lines = "\n".join(row[0] for row in plan)
+
+    assert "availabilities_p2099_03" in lines
+    assert "availabilities_p2099_02" not in lines
+    assert "availabilities_p2099_04" not in lines
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE availabilities (
+    id uuid PRIMARY KEY,
+    start_time timestamptz NOT NULL,
+    end_time timestamptz NOT NULL,
+    status availabilitystatus NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    professional_id uuid NOT NULL REFERENCES professionals (id),
+    patient_id uuid REFERENCES users (id),
+    created_by_admin_id uuid REFERENCES users (id),
+    updated_by_admin_id uuid REFERENCES users (id)
+);
+CREATE INDEX ix_availabilities_status_start_time
+    ON availabilities (status, start_time);
+CREATE TABLE appointment_reminders (
+    availability_id uuid PRIMARY KEY
+        REFERENCES availabilities (id) ON DELETE CASCADE,
+    sent_at timestamptz DEFAULT now()
+);
+"""
+
+
+@pytest.fixture
+async def legacy_engine(
+    _engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Any:
+    """Database whose availabilities table predates the partitioning."""
+    monkeypatch.setattr(settings, "db_base", f"{settings.db_base}_legacy")
+    await create_database()
+    engine = create_async_engine(str(settings.db_url))
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(meta.create_all)
+            await connection.execute(text("DROP TABLE appointment_reminders"))
+            await connection.execute(text("DROP TABLE availabilities CASCADE"))
+            for statement in LEGACY_SCHEMA.split(";"):
+                if statement.strip():
+                    await connection.execute(text(statement))
+        yield engine
+    finally:
+        await engine.dispose()
+        await drop_database()
+
+
+@pytest.mark.anyio
+async def test_migrate_to_partitioned(legacy_engine: AsyncEngine) -> None:
+    async with legacy_engine.begin() as connection:
+        professional_id = uuid.uuid4()
+        await connection.execute(
+            text(
+                "INSERT INTO professionals (id, full_name, email, is_enabled) "
+                "VALUES (:id, 'Dr. Legacy', 'legacy@example.com', true)",
+            ),
+            {"id": professional_id},
+        )
+        ids = [uuid.uuid4() for _ in range(5)]
+        for month, availability_id in enumerate(ids):
+            start = datetime(2024, month + 1, 5, 10, tzinfo=timezone.utc)
+            await connection.execute(
+                text(
+                    "INSERT INTO availabilities "
+                    "(id, start_time, end_time, status, professional_id) "
+                    "VALUES (:id, :start, :end, 'AVAILABLE', :professional)",
+                ),
+                {
+                    "id": availability_id,
+                    "start": start,
+                    "end": start + timedelta(hours=1),
+                    "professional": professional_id,
+                },
+            )
+        await connection.execute(
+            text("INSERT INTO appointment_reminders (availability_id) VALUES (:id)"),
+            {"id": ids[0]},
+        )
+
+    assert await migrate_to_partitioned(legacy_engine, batch_size=2)
+    assert not await migrate_to_partitioned(legacy_engine, batch_size=2)
+
+    async with legacy_engine.connect() as connection:
+        assert await is_partitioned(connection, "availabilities")
+        partitions = await connection.execute(
+            text(
+                "SELECT tableoid::regclass::text FROM availabilities "
+                "ORDER BY start_time",
+            ),
+        )
+        assert list(partitions.scalars()) == [
+            f"availabilities_p2024_{month:02d}" for month in range(1, 6)
+        ]
+        reminder = await connection.execute(
+            text("SELECT availability_start_time FROM appointment_reminders"),
+        )
+        assert reminder.scalar_one() == datetime(2024, 1, 5, 10, tzinfo=timezone.utc)
+        index = await connection.execute(
+            text(
+                "SELECT count(*) FROM pg_indexes WHERE tablename = 'availabilities' "
+                "AND indexname IN ('ix_availabilities_status_start_time', "
+                "'ix_availabilities_professional_id_start_time')",
+            ),
+        )
+        assert index.scalar_one() == 2
+
+        # the ORM model works on the migrated table
+        result = await connection.execute(
+            select(Availability).where(Availability.id == ids[2]),
+        )
+        assert result.one().start_time.month == 3
+        await connection.execute(
+            text("DELETE FROM availabilities WHERE id = :id"),
+            {"id": ids[0]},
+        )
+        remaining = await connection.execute(
+            text("SELECT count(*) FROM appointment_reminders"),
+        )
+        assert remaining.scalar_one() == 0
@@ -77,3 +77,86 @@ async def test_get_all_patients_pagination(
     )
     assert response2.status_code == status.HTTP_200_OK
     assert len(response2.json()) == 1
+
+
+async def create_patients(client: AsyncClient, token: str, names: list[str]) -> None:
+    for i, name in enumerate(names):
+        response = await client.post(
+            "/api/admin/users/register-patient",
+            json={
+                "email": f"{name.split()[0].lower()}@clinic.com",
+                "cpf": f"321.000.000-{i:02}",
+                "full_name": name,
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.anyio
+async def test_search_patients(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+    await create_patients(client, token, ["Maria Silva", "Joao Souza", "Ana Silveira"])
+    headers = {"Authorization": f"Bearer {token}"}
+
+    by_name = await client.get(GET_PATIENTS_URI, params={"q": "silv"}, headers=headers)
+    by_email = await client.get(
+        GET_PATIENTS_URI,
+        params={"q": "JOAO@"},
+        headers=headers,
+    )
+    by_cpf = await client.get(
+        GET_PATIENTS_URI,
+        params={"q": "321.000.000-02"},
+        headers=headers,
+    )
+    wildcard = await client.get(GET_PATIENTS_URI, params={"q": "%"}, headers=headers)
+
+    assert [p["full_name"] for p in by_name.json()] == ["Ana Silveira", "Maria Silva"]
+    assert [p["full_name"] for p in by_email.json()] == ["Joao Souza"]
+    assert [p["full_name"] for p in by_cpf.json()] == ["Ana Silveira"]
+    assert wildcard.json() == []
+
+
+@pytest.mark.anyio
+async def test_get_all_patients_cursor_pagination(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+    await create_patients(client, token, ["Carla", "Bruno", "Ana"])
+    headers = {"Authorization": f"Bearer {token}"}
+
+    page1 = await client.get(GET_PATIENTS_URI, params={"limit": 2}, headers=headers)
+    cursor = page1.headers["X-Next-Cursor"]
+    page2 = await client.get(
+        GET_PATIENTS_URI,
+        params={"limit": 2, "cursor": cursor},
+        headers=headers,
+    )
+
+    assert [p["full_name"] for p in page1.json()] == ["Ana", "Bruno"]
+    assert [p["full_name"] for p in page2.json()] == ["Carla"]
+    assert "X-Next-Cursor" not in page2.headers
+
+
+@pytest.mark.anyio
+async def test_get_all_patients_invalid_cursor(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+
+    response = await client.get(
+        GET_PATIENTS_URI,
+        params={"cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
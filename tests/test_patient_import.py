@@ -0,0 +1,190 @@
+import json
+from typing import AsyncIterator, List
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette import status
+
+from ga_api.db.models.email_outbox_model import EmailOutbox
+from ga_api.db.models.users import User
+from ga_api.services.email_outbox_dispatcher import EmailOutboxDispatcher
+from ga_api.settings import settings
+from ga_api.utils.stream_utils import StreamUtils
+from tests.utils import (
+    CapturingMailService,
+    login_user,
+    login_user_admin,
+    register_and_login_default_user,
+)
+
+IMPORT_PATIENTS_URI = "/api/admin/users/import-patients"
+
+
+async def import_patients(
+    client: AsyncClient,
+    body: str,
+    content_type: str = "text/csv",
+) -> dict:
+    token = await login_user_admin(client)
+    response = await client.post(
+        IMPORT_PATIENTS_URI,
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": content_type},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+async def get_outbox(dbsession: AsyncSession) -> List[EmailOutbox]:
+    result = await dbsession.execute(select(EmailOutbox))
+    return list(result.scalars().all())
+
+
+async def chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+@pytest.mark.anyio
+async def test_iter_lines_joins_lines_split_across_chunks() -> None:
+    stream = chunks(b"\xef\xbb\xbfemail,cpf\r\na@m", b"ail.com,1\n\xc3", b"\xa1,2")
+
+    lines = [line async for line in StreamUtils.iter_lines(stream)]
+
+    assert lines == ["email,cpf", "a@mail.com,1", "á,2"]
+
+
+@pytest.mark.anyio
+async def test_iter_lines_rejects_long_lines() -> None:
+    stream = chunks(b"x" * 20)
+
+    with pytest.raises(ValueError):
+        _ = [line async for line in StreamUtils.iter_lines(stream, max_line_length=10)]
+
+
+@pytest.mark.anyio
+async def test_import_patients_from_csv(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    body = (
+        "email,cpf,full_name,phone,frequency\n"
+        "ana@mail.com,111.111.111-11,Ana,51999999999,weekly\n"
+        "bia@mail.com,222.222.222-22,Bia,,\n"
+    )
+
+    report = await import_patients(client, body)
+
+    assert report == {"imported": 2, "errors": []}
+    users = (
+        (await dbsession.execute(select(User).where(User.email.like("%@mail.com"))))
+        .scalars()
+        .all()
+    )
+    assert {user.full_name for user in users} == {"Ana", "Bia"}
+    assert all(user.is_first_access for user in users)
+
+    outbox = await get_outbox(dbsession)
+    assert {message.recipient for message in outbox} == {"ana@mail.com", "bia@mail.com"}
+    assert all(message.payload == {} for message in outbox)
+
+    mail_service = CapturingMailService()
+    dispatcher = EmailOutboxDispatcher(
+        _engine,
+        async_sessionmaker(_engine),
+        mail_service,
+    )
+    await dispatcher.dispatch_batch(dbsession)
+    await dbsession.flush()
+    password = mail_service.passwords["ana@mail.com"]
+    assert await login_user(client, "ana@mail.com", password)
+
+
+@pytest.mark.anyio
+async def test_import_patients_from_ndjson_in_batches(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "patient_import_batch_size", 2)
+    body = "\n".join(
+        json.dumps(
+            {
+                "email": f"patient{i}@mail.com",
+                "cpf": f"900.000.000-0{i}",
+                "full_name": f"P{i}",
+            },
+        )
+        for i in range(5)
+    )
+
+    report = await import_patients(client, body, "application/x-ndjson")
+
+    assert report == {"imported": 5, "errors": []}
+    assert len(await get_outbox(dbsession)) == 5
+
+
+@pytest.mark.anyio
+async def test_import_patients_reports_rejected_rows(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    body = (
+        "email,cpf,full_name\n"
+        "ok@mail.com,333.333.333-33,Ok\n"
+        "ADMIN@admin.com,444.444.444-44,Admin\n"
+        "not-an-email,555.555.555-55,Bad\n"
+        "other@mail.com,333.333.333-33,Same CPF\n"
+        "short@mail.com,666.666.666-66\n"
+    )
+
+    report = await import_patients(client, body)
+
+    assert report["imported"] == 1
+    errors = {error["row"]: error for error in report["errors"]}
+    assert set(errors) == {3, 4, 5, 6}
+    assert errors[3]["detail"] == "User already exists."
+    assert "email" in errors[4]["detail"]
+    assert errors[5]["detail"] == "Duplicated email or CPF in the file."
+    assert len(await get_outbox(dbsession)) == 1
+
+
+@pytest.mark.anyio
+async def test_import_patients_rejects_unknown_format(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await login_user_admin(client)
+
+    response = await client.post(
+        IMPORT_PATIENTS_URI,
+        json=[{"email": "a@mail.com"}],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.anyio
+async def test_import_patients_as_non_admin(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    token = await register_and_login_default_user(client)
+
+    response = await client.post(
+        IMPORT_PATIENTS_URI,
+        content=b"email,cpf,full_name\n",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
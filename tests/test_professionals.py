@@ -388,6 +388,66 @@ async def test_update_professional_with_invalid_speciality_returns_not_found(
     )
 
 
+# ==================== BULK ENABLE PROFESSIONALS TESTS ====================
+
+
+@pytest.mark.anyio
+async def test_disable_many_professionals_as_admin(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    admin_token = await login_user_admin(client)
+    ids = []
+    for index in range(3):
+        response = await client.post(
+            ADMIN_PROFESSIONAL_URL,
+            json=ProfessionalFactory.create_custom_request(
+                email=f"bulk{index}@example.com",
+                phone=f"+555199999000{index}",
+                is_enabled=True,
+            ).model_dump(mode="json"),
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        ids.append(response.json()["id"])
+    missing = str(uuid.uuid4())
+
+    response = await client.patch(
+        ADMIN_PROFESSIONAL_URL,
+        json={"ids": [*ids[:2], missing], "is_enabled": False},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"updated": 2, "not_found": [missing]}
+    listed = await client.get(
+        ADMIN_PROFESSIONAL_URL,
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    enabled = {
+        item["professional"]["id"]: item["professional"]["is_enabled"]
+        for item in listed.json()
+    }
+    assert [enabled[id_] for id_ in ids] == [False, False, True]
+
+
+@pytest.mark.anyio
+async def test_disable_many_professionals_as_patient_returns_forbidden(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    user_token = await register_and_login_default_user(client)
+
+    response = await client.patch(
+        ADMIN_PROFESSIONAL_URL,
+        json={"ids": [str(uuid.uuid4())], "is_enabled": False},
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 # ==================== GET ALL PROFESSIONALS (ADMIN) TESTS ====================
 
 
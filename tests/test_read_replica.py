@@ -0,0 +1,172 @@
+import asyncio
+import uuid
+from contextlib import suppress
+from typing import Any, AsyncGenerator, Callable
+
+import pytest
+from asyncpg import InvalidCatalogNameError
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import delete, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from ga_api.db.models.users import User
+from ga_api.db.replica import PRIMARY_LSN_COOKIE, ReplicaStatus, parse_lsn
+from ga_api.settings import settings
+from ga_api.web.application import get_app
+from tests.factories.user_factory import UserFactory
+
+requires_replica = pytest.mark.skipif(
+    settings.db_replica_url is None,
+    reason="needs a streaming replica (GA_API_DB_REPLICA_HOST)",
+)
+
+
+class CountingFactory:
+    def __init__(self, factory: Callable[[], AsyncSession]) -> None:
+        self.factory = factory
+        self.calls = 0
+
+    def __call__(self) -> AsyncSession:
+        self.calls += 1
+        return self.factory()
+
+
+async def primary_lsn(engine: AsyncEngine) -> int:
+    async with engine.connect() as connection:
+        lsn = await connection.scalar(text("SELECT pg_current_wal_lsn()::text"))
+    return parse_lsn(lsn)
+
+
+async def wait_for_replica(status: ReplicaStatus, lsn: int) -> None:
+    for _ in range(100):
+        # the test database itself may not be replayed yet
+        with suppress(DBAPIError, InvalidCatalogNameError):
+            if await status.has_replayed(lsn):
+                return
+        await asyncio.sleep(0.05)
+    raise AssertionError("replica did not catch up")
+
+
+@pytest.fixture
+async def replica_app(_engine: AsyncEngine) -> AsyncGenerator[FastAPI, None]:
+    replica_engine = create_async_engine(str(settings.db_replica_url))
+    replica_factory = async_sessionmaker(replica_engine, expire_on_commit=False)
+    status = ReplicaStatus(replica_factory)
+    # the test database and its tables are created on the primary
+    await wait_for_replica(status, await primary_lsn(_engine))
+
+    app = get_app()
+    app.state.db_engine = _engine
+    app.state.db_session_factory = CountingFactory(
+        async_sessionmaker(_engine, expire_on_commit=False),
+    )
+    app.state.db_read_session_factory = CountingFactory(
+        async_sessionmaker(
+            _engine.execution_options(postgresql_readonly=True),
+            expire_on_commit=False,
+        ),
+    )
+    app.state.db_replica_session_factory = CountingFactory(replica_factory)
+    app.state.db_replica_status = status
+    try:
+        yield app
+    finally:
+        await replica_engine.dispose()
+
+
+@pytest.fixture
+async def replica_client(
+    replica_app: FastAPI,
+    anyio_backend: Any,
+) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(app=replica_app, base_url="http://test", timeout=5.0) as ac:
+        yield ac
+
+
+def test_parse_lsn() -> None:
+    assert parse_lsn("0/0") == 0
+    assert parse_lsn("16/B374D848") == (0x16 << 32) | 0xB374D848
+    assert parse_lsn("1/0") > parse_lsn("0/FFFFFFFF")
+    with pytest.raises(ValueError):
+        parse_lsn("garbage")
+
+
+@requires_replica
+@pytest.mark.anyio
+async def test_read_only_route_reads_from_replica(
+    replica_app: FastAPI,
+    replica_client: AsyncClient,
+) -> None:
+    response = await replica_client.get("/api/professionals/")
+
+    assert response.status_code == 200
+    assert replica_app.state.db_replica_session_factory.calls == 1
+    assert replica_app.state.db_read_session_factory.calls == 0
+    assert PRIMARY_LSN_COOKIE not in response.cookies
+
+
+@requires_replica
+@pytest.mark.anyio
+async def test_unmarked_route_reads_from_primary(
+    replica_app: FastAPI,
+    replica_client: AsyncClient,
+) -> None:
+    login = await replica_client.post(
+        "/api/auth/jwt/login",
+        data={"username": "admin@admin.com", "password": "admin"},
+    )
+    token = login.json()["access_token"]
+
+    response = await replica_client.get(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert replica_app.state.db_replica_session_factory.calls == 0
+    assert replica_app.state.db_read_session_factory.calls == 1
+
+
+@requires_replica
+@pytest.mark.anyio
+async def test_reads_after_a_write_wait_for_the_replica(
+    replica_app: FastAPI,
+    replica_client: AsyncClient,
+    _engine: AsyncEngine,
+) -> None:
+    user_request = UserFactory.create_default_user_request()
+    user_request.email = f"{uuid.uuid4().hex}@mail.com"
+    user_request.cpf = "987.654.321-00"
+    try:
+        response = await replica_client.post(
+            "/api/auth/register",
+            json=user_request.model_dump(mode="json"),
+        )
+        assert response.status_code == 201
+        written = parse_lsn(response.cookies[PRIMARY_LSN_COOKIE])
+        assert written > 0
+
+        # the replica is treated as behind the client's last write
+        replica_client.cookies.clear()
+        replica_client.cookies.set(PRIMARY_LSN_COOKIE, "FFFFFFFF/FFFFFFFF")
+        await replica_client.get("/api/professionals/")
+        assert replica_app.state.db_read_session_factory.calls == 1
+        assert replica_app.state.db_replica_session_factory.calls == 0
+
+        await wait_for_replica(replica_app.state.db_replica_status, written)
+        replica_client.cookies.clear()
+        replica_client.cookies.set(PRIMARY_LSN_COOKIE, f"{written >> 32:X}/0")
+        await replica_client.get("/api/professionals/")
+        assert replica_app.state.db_replica_session_factory.calls == 1
+    finally:
+        async with _engine.begin() as connection:
+            await connection.execute(
+                delete(User).where(User.email == user_request.email),  # type: ignore
+            )
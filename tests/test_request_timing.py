@@ -0,0 +1,93 @@
+import logging
+import re
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from ga_api.db.instrumentation import QueryStats, instrument_engine, query_stats
+from ga_api.db.models.users import User
+from ga_api.settings import settings
+from tests.utils import inject_default_professional, server_logging
+
+SERVER_TIMING = re.compile(
+    r"^db;dur=(?P<db>[\d.]+), db-count;desc=(?P<count>\d+), app;dur=[\d.]+$",
+)
+
+
+@pytest.mark.anyio
+async def test_engine_counts_statements_of_the_current_stats(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    instrument_engine(_engine)
+    instrument_engine(_engine)
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        await dbsession.execute(select(User.id))
+        await dbsession.execute(select(User.id))
+    finally:
+        query_stats.reset(token)
+    await dbsession.execute(select(User.id))
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert "FROM users" in (stats.most_repeated() or "")
+
+
+@pytest.mark.anyio
+async def test_server_timing_header(
+    client: AsyncClient,
+    _engine: AsyncEngine,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    instrument_engine(_engine)
+
+    with server_logging():
+        response = await client.get("/api/professionals/")
+
+    assert response.status_code == 200
+    timing = SERVER_TIMING.match(response.headers["server-timing"])
+    assert timing is not None
+    assert int(timing["count"]) >= 1
+    assert any(
+        '"GET /api/professionals/ HTTP/1.1" 200' in line
+        and f"queries={timing['count']}" in line
+        for line in capsys.readouterr().err.splitlines()
+    )
+
+
+@pytest.mark.anyio
+async def test_request_without_queries(client: AsyncClient) -> None:
+    response = await client.get("/api/health")
+
+    timing = SERVER_TIMING.match(response.headers["server-timing"])
+    assert timing is not None
+    assert timing["count"] == "0"
+    assert timing["db"] == "0.0"
+
+
+@pytest.mark.anyio
+async def test_n_plus_one_suspects_are_logged(
+    client: AsyncClient,
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    instrument_engine(_engine)
+    # the listing loads the specialities of the professionals it found
+    await inject_default_professional(dbsession)
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 0)
+    await client.get("/api/professionals/")
+    assert not any("Possible N+1" in line for line in caplog.messages)
+
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 1)
+    await client.get("/api/professionals/")
+    assert any(
+        record.levelno == logging.WARNING
+        and record.getMessage().startswith("Possible N+1: GET /api/professionals/")
+        for record in caplog.records
+    )
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ga_api.db.dao.availability_dao import AvailabilityDAO
+from ga_api.db.models.availability_history_model import AvailabilityHistory
+from ga_api.db.models.availability_model import Availability
+from ga_api.db.models.block_history_model import BlockHistory
+from ga_api.db.models.block_model import Block
+from ga_api.db.models.users import User
+from ga_api.enums.availability_status import AvailabilityStatus
+from ga_api.services.retention_job import RetentionJob
+from ga_api.settings import settings
+from tests.utils import inject_default_professional
+
+HORIZON = datetime(2031, 1, 1, tzinfo=timezone.utc)
+
+
+async def count(dbsession: AsyncSession, model: type) -> int:
+    result = await dbsession.execute(select(func.count()).select_from(model))
+    return result.scalar_one()
+
+
+@pytest.mark.anyio
+async def test_archive_moves_past_rows_to_history(
+    dbsession: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "retention_batch_size", 2)
+    monkeypatch.setattr(settings, "retention_batch_pause", 0)
+    professional = await inject_default_professional(dbsession)
+    patient = User(
+        email="history@mail.com",
+        hashed_password="x",  # noqa: S106
+        cpf="777.777.777-77",
+        full_name="Helena",
+    )
+    dbsession.add(patient)
+    await dbsession.flush()
+
+    slots = [
+        (HORIZON - timedelta(days=40), AvailabilityStatus.COMPLETED),
+        (HORIZON - timedelta(days=30), AvailabilityStatus.CANCELED),
+        (HORIZON - timedelta(days=20), AvailabilityStatus.AVAILABLE),
+        # not completed yet, stays where it is
+        (HORIZON - timedelta(days=10), AvailabilityStatus.TAKEN),
+        (HORIZON + timedelta(days=1), AvailabilityStatus.COMPLETED),
+    ]
+    dbsession.add_all(
+        Availability(
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            status=status,
+            professional_id=professional.id,
+            patient_id=patient.id,
+        )
+        for start, status in slots
+    )
+    dbsession.add_all(
+        Block(
+            start_time=start,
+            end_time=start + timedelta(days=1),
+            professional_id=professional.id,
+        )
+        for start in (HORIZON - timedelta(days=5), HORIZON)
+    )
+    await dbsession.flush()
+    hot_before = await count(dbsession, Availability)
+
+    job = RetentionJob(
+        dbsession.bind,  # type: ignore
+        async_sessionmaker(dbsession.bind, expire_on_commit=False),
+    )
+    moved = await job.archive(HORIZON)
+
+    assert moved == {"availabilities": 3, "blocks": 1}
+    assert await count(dbsession, Availability) == hot_before - 3
+    assert await count(dbsession, AvailabilityHistory) == 3
+    assert await count(dbsession, BlockHistory) == 1
+    remaining = await dbsession.execute(select(Block.start_time))
+    assert remaining.scalars().all() == [HORIZON]
+
+    # the patient's history still lists the archived appointments
+    dbsession.expunge_all()
+    history = await AvailabilityDAO(dbsession).find_by_patient_id(patient.id)
+    assert sorted(a.start_time for a in history) == [start for start, _ in slots]
+    assert await job.archive(HORIZON) == {"availabilities": 0, "blocks": 0}
@@ -0,0 +1,118 @@
+import uuid
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from ga_api.db import slow_queries
+from ga_api.db.dao.professional_dao import ProfessionalDAO
+from ga_api.db.slow_queries import SlowQueryLog, normalize_sql, parameter_shapes
+from ga_api.settings import settings
+from tests.utils import login_user_admin
+
+
+@pytest.fixture
+async def slow_engine(_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> Any:
+    # every statement counts as slow and gets its plan captured
+    monkeypatch.setattr(settings, "db_slow_query_threshold", 1e-9)
+    monkeypatch.setattr(settings, "db_slow_query_explain_rate", 1.0)
+    engine = create_async_engine(str(settings.db_url))
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+def test_normalize_sql() -> None:
+    statement = """
+        SELECT users.id FROM users
+        WHERE users.email = 'a@b.com' AND users.age > 30 AND users.id = $1
+    """
+
+    assert normalize_sql(statement) == (
+        "SELECT users.id FROM users "
+        "WHERE users.email = ? AND users.age > ? AND users.id = $1"
+    )
+
+
+def test_parameter_shapes() -> None:
+    assert parameter_shapes((uuid.uuid4(), 3, ["a", "b"])) == "(UUID, int, list[2])"
+    assert parameter_shapes([("a", 1), ("b", 2)], executemany=True) == (
+        "2 x (str, int)"
+    )
+
+
+@pytest.mark.anyio
+async def test_slow_queries_are_explained(slow_engine: AsyncEngine) -> None:
+    slow_query_log = SlowQueryLog()
+    slow_query_log.install(slow_engine)
+
+    async with async_sessionmaker(slow_engine)() as session:
+        assert await ProfessionalDAO(session).find_by_id(uuid.uuid4()) is None
+    await slow_query_log.wait_explained()
+
+    query = slow_query_log.latest()[0]
+    assert query.caller == "AbstractDAO.find_by_id"
+    assert query.sql.startswith("SELECT professionals.id")
+    assert query.parameters == "(list[1])"
+    assert query.plan[0]["Plan"]["Node Type"]
+
+
+@pytest.mark.anyio
+async def test_caller_lookup_errors_do_not_fail_the_query(
+    slow_engine: AsyncEngine,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def calling_dao() -> str:
+        raise RuntimeError("no frames")
+
+    monkeypatch.setattr(slow_queries, "calling_dao", calling_dao)
+    slow_query_log = SlowQueryLog()
+    slow_query_log.install(slow_engine)
+
+    async with async_sessionmaker(slow_engine)() as session:
+        assert await ProfessionalDAO(session).find_by_id(uuid.uuid4()) is None
+    await slow_query_log.wait_explained()
+
+    assert slow_query_log.latest()[0].caller == "unknown"
+
+
+@pytest.mark.anyio
+async def test_only_one_plan_is_captured_at_a_time(slow_engine: AsyncEngine) -> None:
+    slow_query_log = SlowQueryLog()
+    slow_query_log.install(slow_engine)
+
+    async with async_sessionmaker(slow_engine)() as session:
+        dao = ProfessionalDAO(session)
+        await dao.find_by_id(uuid.uuid4())
+        await dao.find_by_id(uuid.uuid4())
+    await slow_query_log.wait_explained()
+
+    assert len(slow_query_log.latest()) == 1
+
+
+@pytest.mark.anyio
+async def test_slow_queries_endpoint(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    slow_engine: AsyncEngine,
+) -> None:
+    token = await login_user_admin(client)
+    slow_query_log = SlowQueryLog()
+    slow_query_log.install(slow_engine)
+    async with async_sessionmaker(slow_engine)() as session:
+        await ProfessionalDAO(session).find_by_id(uuid.uuid4())
+    await slow_query_log.wait_explained()
+    fastapi_app.state.slow_query_log = slow_query_log
+
+    response = await client.get(
+        "/api/admin/monitoring/slow-queries",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    [query] = response.json()
+    assert query["caller"] == "AbstractDAO.find_by_id"
+    assert query["plan"][0]["Plan"]
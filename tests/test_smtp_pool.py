@@ -0,0 +1,153 @@
+import socket
+from email import message_from_bytes
+from email.message import EmailMessage
+from typing import Any, AsyncGenerator, List
+
+import pytest
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig
+from prometheus_client import REGISTRY
+
+from ga_api.services.mail_service import MailService
+from ga_api.services.smtp_pool import SMTPConnectionPool
+from ga_api.web.api.mail.request.mail_request import MailRequest
+
+
+class RecordingHandler:
+    def __init__(self) -> None:
+        self.messages: List[Any] = []
+        self.sessions: set[int] = set()
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_handler() -> RecordingHandler:
+    return RecordingHandler()
+
+
+@pytest.fixture
+def smtp_config(smtp_handler: RecordingHandler):
+    port = get_free_port()
+    controller = Controller(smtp_handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield ConnectionConfig(
+            MAIL_USERNAME="",
+            MAIL_PASSWORD="",
+            MAIL_FROM="noreply@example.com",
+            MAIL_PORT=port,
+            MAIL_SERVER="127.0.0.1",
+            MAIL_STARTTLS=False,
+            MAIL_SSL_TLS=False,
+            USE_CREDENTIALS=False,
+            VALIDATE_CERTS=False,
+        )
+    finally:
+        controller.stop()
+
+
+@pytest.fixture
+async def smtp_pool(
+    smtp_config: ConnectionConfig,
+) -> AsyncGenerator[SMTPConnectionPool, None]:
+    pool = SMTPConnectionPool(smtp_config, size=1, max_messages=100, idle_timeout=60)
+    try:
+        yield pool
+    finally:
+        await pool.close()
+
+
+def build_message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = recipient
+    message["Subject"] = "test"
+    message.set_content("hello")
+    return message
+
+
+@pytest.mark.anyio
+async def test_pool_reuses_connection(
+    smtp_pool: SMTPConnectionPool,
+    smtp_handler: RecordingHandler,
+) -> None:
+    for i in range(5):
+        await smtp_pool.send(build_message(f"user{i}@mail.com"))
+
+    assert len(smtp_handler.messages) == 5
+    assert len(smtp_handler.sessions) == 1
+    assert smtp_pool.connections_opened == 1
+
+
+@pytest.mark.anyio
+async def test_pool_recycles_connection_after_max_messages(
+    smtp_pool: SMTPConnectionPool,
+    smtp_handler: RecordingHandler,
+) -> None:
+    smtp_pool.max_messages = 2
+
+    for i in range(5):
+        await smtp_pool.send(build_message(f"user{i}@mail.com"))
+
+    assert len(smtp_handler.messages) == 5
+    assert smtp_pool.connections_opened == 3
+
+
+@pytest.mark.anyio
+async def test_pool_reconnects_dropped_connection(
+    smtp_pool: SMTPConnectionPool,
+    smtp_handler: RecordingHandler,
+) -> None:
+    await smtp_pool.send(build_message("first@mail.com"))
+    smtp_pool._idle[0].smtp.close()
+
+    await smtp_pool.send(build_message("second@mail.com"))
+
+    assert len(smtp_handler.messages) == 2
+    assert smtp_pool.connections_opened == 2
+
+
+@pytest.mark.anyio
+async def test_mail_service_sends_first_access_email(
+    smtp_pool: SMTPConnectionPool,
+    smtp_handler: RecordingHandler,
+) -> None:
+    service = MailService(smtp_pool)
+
+    await service.send_email_first_access(MailRequest(email="p@mail.com"), "s3cret!")
+
+    assert len(smtp_handler.messages) == 1
+    envelope = smtp_handler.messages[0]
+    assert envelope.rcpt_tos == ["p@mail.com"]
+    message = message_from_bytes(envelope.content)
+    html = next(
+        part for part in message.walk() if part.get_content_type() == "text/html"
+    )
+    assert "s3cret!" in html.get_payload(decode=True).decode()
+
+
+@pytest.mark.anyio
+async def test_pool_times_sends(smtp_pool: SMTPConnectionPool) -> None:
+    def sent() -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "ga_api_smtp_send_duration_seconds_count",
+                {"result": "sent"},
+            )
+            or 0.0
+        )
+
+    before = sent()
+    await smtp_pool.send(build_message("a@example.com"))
+
+    assert sent() == before + 1
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ga_api.db.bootstrap import bootstrap_database
+from ga_api.db.models.users import User
+from ga_api.db.pool import InstrumentedPool, warm_pool
+from ga_api.settings import settings
+from ga_api.web.startup_timer import StartupTimer
+from tests.utils import login_user_admin, server_logging
+
+
+@pytest.mark.anyio
+async def test_bootstrap_can_run_again(_engine: AsyncEngine) -> None:
+    await bootstrap_database()
+    await bootstrap_database()
+
+    async with _engine.connect() as connection:
+        admins = await connection.scalar(
+            select(func.count()).where(User.email == "admin@admin.com"),  # type: ignore
+        )
+    assert admins == 1
+
+
+@pytest.mark.anyio
+async def test_warm_pool_opens_connections_up_to_pool_size(
+    _engine: AsyncEngine,
+) -> None:
+    engine = create_async_engine(
+        str(settings.db_url),
+        poolclass=InstrumentedPool,
+        pool_size=3,
+    )
+    try:
+        assert await warm_pool(engine, 5) == 3
+        assert engine.pool.checkedin() == 3  # type: ignore
+    finally:
+        await engine.dispose()
+
+
+def test_startup_timer_times_steps(capsys: pytest.CaptureFixture[str]) -> None:
+    timer = StartupTimer()
+    with timer.step("pool"):
+        time.sleep(0.01)
+
+    with server_logging():
+        ready_after = timer.ready()
+
+    assert timer.steps["pool"] >= 0.01
+    assert ready_after >= timer.steps["pool"]
+    assert timer.ready_after == ready_after
+    assert f"Worker {os.getpid()} ready in" in capsys.readouterr().err
+
+
+@pytest.mark.anyio
+async def test_startup_report(client: AsyncClient, fastapi_app: FastAPI) -> None:
+    timer = StartupTimer()
+    with timer.step("pool"):
+        pass
+    timer.ready()
+    fastapi_app.state.startup_timer = timer
+    token = await login_user_admin(client)
+
+    response = await client.get(
+        "/api/admin/monitoring/startup",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "ready_after": timer.ready_after,
+        "steps": {"pool": timer.steps["pool"]},
+    }
@@ -1,15 +1,37 @@
-from typing import Any, List
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
 
 from httpx import AsyncClient, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from uvicorn.config import Config
 
 from ga_api.db.base import Base
 from ga_api.db.dao.abstract_dao import AbstractDAO
 from ga_api.db.models.professionals_model import Professional
 from ga_api.db.models.users import UserCreate
+from ga_api.services.mail_service import MailService, create_smtp_pool
+from ga_api.settings import settings
+from ga_api.web.api.mail.request.mail_request import MailRequest
 from tests.factories.user_factory import UserFactory
 
 
+class CapturingMailService(MailService):
+    """Handles outbox emails like the real service but keeps them unsent."""
+
+    def __init__(self) -> None:
+        super().__init__(create_smtp_pool())
+        self.passwords: Dict[str, str] = {}
+
+    async def send_email_first_access(
+        self,
+        request: MailRequest,
+        password: str,
+    ) -> None:
+        self.passwords[request.email] = password
+
+
 async def register_user(client: AsyncClient, request: UserCreate) -> None:
     print(request.model_dump(mode="json"))
     await client.post(
@@ -62,3 +84,27 @@ async def inject_default_professional(dbsession: AsyncSession) -> Professional:
     dbsession.add(professional)
     await dbsession.flush()
     return professional
+
+
+@contextmanager
+def server_logging() -> Iterator[None]:
+    """Sets up logging as ``uvicorn.run`` does, writing to the current stderr."""
+    loggers = [
+        logging.getLogger(name)
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access")
+    ]
+    saved = [(logger.handlers[:], logger.level, logger.propagate) for logger in loggers]
+    # dictConfig would close the handlers of pytest
+    with patch.object(logging, "shutdown"):
+        Config(
+            "ga_api.web.application:get_app",
+            log_level=settings.log_level.value.lower(),
+            access_log=not settings.request_timing,
+        )
+    try:
+        yield
+    finally:
+        for logger, (handlers, level, propagate) in zip(loggers, saved):
+            logger.handlers = handlers
+            logger.setLevel(level)
+            logger.propagate = propagate